@@ -1,27 +1,46 @@
 import asyncio
-import json
 import re
 import time
 from json import JSONEncoder, JSONDecoder
-import os
-from time import sleep
 
-from discord.ext import tasks
 import websockets
 
-is_websocket_connected = False
-auto_reconnect = False
-packet_queue = asyncio.Queue()
-
-# One-shot data-collection progress for a get_server_data run. The bot only needs to
-# stay connected long enough to receive the slot info (the "Connected" packet) and a
-# data package for every game in the room; once it has those it disconnects (per the
-# README: "get the packets it needs, and disconnect"). These reset at the start of main().
-room_info_received = False
-connected_received = False
-expected_data_packages = 0
-received_data_packages = 0
-intentional_close = False
+import state_service
+import state_store
+
+# Each Archipelago room the bot talks to is a RoomConnection: it owns its socket, packet
+# queue, data-collection progress and slot mapping, so several rooms can be connected at
+# once on the same event loop. `manager` (a RoomManager) keeps one connection per room
+# address; main() is the get_server_data entry point.
+#
+# A get_server_data run only needs to stay connected long enough to receive the slot info
+# (the "Connected" packet) and a data package for every game in the room; once it has those
+# it disconnects (per the README: "get the packets it needs, and disconnect").
+#
+# Live mode (get_server_data with live=True): instead of disconnecting once the data is
+# collected, stay connected as a TextOnly client, reconnect with backoff when the socket
+# drops, and stream ItemSend / Goal events to the bot as they happen.
+on_live_items = None        # async callback(diff, room), diff in tracker_download's format; set by the bot
+on_live_connected = None    # async callback(room) on every live (re)connect, to catch up on what
+                            #   was sent while the feed was down; set by the bot
+LIVE_FLUSH_SECONDS = 0.25   # events arriving within this window are delivered as one diff
+LIVE_MAX_BACKOFF = 60       # seconds between reconnect attempts, at most
+
+# Packets go from the socket reader (handle_messages) to a single consumer task per room
+# through a bounded queue. When it is full, packets the bot ignores anyway (chat and other
+# PrintJSON noise) are dropped; anything else makes the reader wait, which stops reading the
+# socket and pushes back on the server instead of growing memory without limit.
+PACKET_QUEUE_SIZE = 2000
+PACKET_BATCH_SIZE = 100     # packets handled per wake-up of the consumer, at most
+
+# ItemSend log rows are group-committed: they wait here and are written in one transaction
+# at most ITEM_LOG_FLUSH_SECONDS after the first one, so a release burst of hundreds of
+# packets is one write instead of one per packet. Shared by every room (one state store).
+ITEM_LOG_FLUSH_SECONDS = 0.3
+# The table itself is the journal: SQLite's WAL checkpoints fold it into the database file,
+# so there is no separate snapshot to compact it into.
+_item_log_buffer = []
+_item_log_task = None
 
 def encode(data):
     return JSONEncoder(
@@ -35,55 +54,46 @@ def decode(data):
     return JSONDecoder().decode(data)
 
 
-# Send the initial connection to the server
-async def send_connect_packet(websocket, slot_name, password):
-    global auto_reconnect
-    auto_reconnect = True
-
-    payload = [{
-        'cmd': 'Connect',
-        'password': password,
-        'name': slot_name,
-        "version": {"build": 0, "class": "Version", "major": 0, "minor": 5},
-        'tags': ["TextOnly"],
-        'items_handling': 0b000,
-        'uuid': "",
-        'game': "",
-        "slot_data": False,
-    }]
-    await send(websocket, payload)
-
-
-# Disconnect from the server
-async def disconnect(websocket):
-    await websocket.close()
-    global is_websocket_connected, auto_reconnect
-    is_websocket_connected = False
-    print("Disconnected from the server.")
-    auto_reconnect = False
-
-async def check_connection(websocket, slot_name, password):
-    global is_websocket_connected, auto_reconnect
-    while True:
-        await asyncio.sleep(10)
-        if not is_websocket_connected:
-            if auto_reconnect:
-                print("Attempting to reconnect...")
-                await send_connect_packet(websocket, slot_name, password)
-            else:
-                print("Auto-reconnect is disabled. Exiting.")
-                break
+def normalize_address(address):
+    # Trim whitespace and strip any scheme the user pasted (e.g. "https://host:port" ->
+    # "host:port") so we don't build "ws://https://...", which would make the resolver try
+    # to look up a host literally named "https".
+    return re.sub(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://", "", address.strip())
+
+
+async def _report(discord_ack, content):
+    # A live session outlives the interaction token (15 minutes), after which editing the
+    # original response fails; that must never take the packet loop down with it.
+    try:
+        await discord_ack.edit_original_response(content=content)
+    except Exception as e:
+        print(f"Could not update the Discord response ({e}): {content}")
+
 
+def _log_item(receiver, item, flag, location, sending_player):
+    global _item_log_task
+    _item_log_buffer.append((receiver, item, flag, location, sending_player))
+    if _item_log_task is None or _item_log_task.done():
+        _item_log_task = asyncio.create_task(_flush_item_log_later())
 
-# Test hello package
-async def send_hello(websocket):
 
-    payload = [{
-        'cmd': 'Say',
-        'text': "Don't worry, I'm just grabbing some data."
-    }]
-    print("Sending hello message")
-    await send(websocket, payload)
+async def _flush_item_log_later():
+    await asyncio.sleep(ITEM_LOG_FLUSH_SECONDS)
+    await flush_item_log()
+
+
+async def flush_item_log():
+    """Write every buffered item-log row now, in one transaction."""
+    global _item_log_buffer
+    rows, _item_log_buffer = _item_log_buffer, []
+    if not rows:
+        return
+    try:
+        await asyncio.to_thread(state_store.append_item_logs, rows)
+    except Exception as e:
+        # Keep the rows (ahead of any that arrived meanwhile); the next packet retries them.
+        print(f"Could not write {len(rows)} item log row(s), will retry: {e}")
+        _item_log_buffer = rows + _item_log_buffer
 
 
 # Send a packet to the server containing the payload
@@ -94,118 +104,245 @@ async def send(websocket, payload):
     await websocket.send(payload)
 
 
-# Get the items for the given slot
-async def get_data_package(websocket, game):
-    payload = [{
-        'cmd': 'GetDataPackage',
-        'games': [game]
-    }]
-    await send(websocket, payload)
-
-
 # Process data packages
 async def process_data_package(data_package):
+    """Store every game in the packet that the state store doesn't have yet (or has under a
+    different checksum); returns the names of the games that were added."""
     # Extract the games dictionary; if missing, use an empty dict.
     new_games = data_package.get('games', {})
     if not new_games:
         return []
 
-    # Define the path for our data file
-    os.makedirs("data", exist_ok=True)
-    data_package_json = os.path.join("data", "data_package.json")
-
-    # Load existing data if it exists
-    if os.path.exists(data_package_json):
-        with open(data_package_json, "r") as f:
-            try:
-                existing_data = json.load(f)
-            except json.JSONDecodeError:
-                existing_data = []
-    else:
-        existing_data = []
-
-    # Convert existing data to a dictionary for easy access
-    existing_games_dict = {entry["game"]: entry for entry in existing_data}
-
-    # Process new games
+    stored = state_store.data_package_checksums()
+    added = []
     for game_name, game_data in new_games.items():
-        if game_name in existing_games_dict:
+        if game_name in stored and stored[game_name] == game_data.get("checksum"):
             continue  # Skip if the game already exists
 
         # Get items and locations; default to empty dicts if keys are missing.
-        items = game_data.get("item_name_to_id", {})
-        locations = game_data.get("location_name_to_id", {})
-
-        # Sort the inner dictionaries by key (optional)
-        sorted_items = dict(sorted(items.items()))
-        sorted_locations = dict(sorted(locations.items()))
-
-        # Add new game entry to the dictionary
-        existing_games_dict[game_name] = {
-            "game": game_name,
-            "item_name_to_id": sorted_items,
-            "location_name_to_id": sorted_locations
+        item_name_to_id = game_data.get("item_name_to_id", {})
+        location_name_to_id = game_data.get("location_name_to_id", {})
+        # Also refreshes the store's in-memory id -> name tables for this game (ItemSend
+        # decoding reads those, so a changed package is picked up at once).
+        state_store.save_data_package_game(
+            game_name, item_name_to_id, location_name_to_id, game_data.get("checksum"))
+        added.append(game_name)
+
+    return added
+
+
+def _droppable(packet):
+    """Packets read_response would only print: safe to shed when the queue is full."""
+    if packet.get("cmd") == "PrintJSON":
+        return packet.get("type") not in ("ItemSend", "Goal")
+    return packet.get("cmd") == "Bounced"
+
+
+class RoomConnection:
+    """One connection to one Archipelago room and everything its session needs."""
+
+    def __init__(self, discord_ack, address, slot_name="island_bot", password="", live=False,
+                 on_live_items=None, on_live_connected=None):
+        self.discord_ack = discord_ack
+        self.address = normalize_address(address)
+        self.slot_name = slot_name
+        self.password = password
+        self.live_mode = live
+        self.on_live_items = on_live_items
+        self.on_live_connected = on_live_connected
+
+        self.is_websocket_connected = False
+        self.auto_reconnect = False
+        self.live_active = False    # connected and streaming; the bot's tracker scrape stands down
+        self.websocket = None
+
+        # One-shot data-collection progress.
+        self.room_info_received = False
+        self.connected_received = False
+        self.expected_data_packages = 0
+        self.received_data_packages = 0
+        self.cached_games = 0       # games in the room whose stored package was already current
+        self.intentional_close = False
+        self.data_collected = False
+
+        self.slot_mapping = {}      # {slot number (str): {"slot_name", "game"}} from Connected
+        self.data_package_games = []  # games whose package this session stored
+
+        self.packet_queue = asyncio.Queue(maxsize=PACKET_QUEUE_SIZE)
+        self._consumer_task = None
+        # Queue metrics for this connection; see packet_stats().
+        self._stats = {"queued": 0, "processed": 0, "dropped": 0, "max_depth": 0,
+                       "latency_total": 0.0, "latency_max": 0.0}
+
+        self._live_pending = {}     # {slot_number: {slot_name: {"Game Name", "New Items"?, "Goal Completed"?}}}
+        self._live_flush_task = None
+        self._live_catch_up_task = None
+
+    def __repr__(self):
+        return f"<RoomConnection {self.address} as {self.slot_name}{' live' if self.live_mode else ''}>"
+
+    # --- live events -------------------------------------------------------------
+    def _queue_live_event(self, slot_id, slot_name, game, item_name=None, goal=False):
+        """Buffer one live event; a short-lived task delivers everything buffered in the next
+        LIVE_FLUSH_SECONDS as a single diff, so a release burst becomes one announcement."""
+        if not self.live_mode or self.on_live_items is None:
+            return
+        entry = self._live_pending.setdefault(str(slot_id), {}).setdefault(slot_name, {"Game Name": game})
+        if item_name is not None:
+            new_items = entry.setdefault("New Items", {})
+            new_items[item_name] = new_items.get(item_name, 0) + 1
+        if goal:
+            entry["Goal Completed"] = "Goal Completed"
+        if self._live_flush_task is None or self._live_flush_task.done():
+            self._live_flush_task = asyncio.create_task(self._flush_live_events())
+
+    async def _flush_live_events(self):
+        await asyncio.sleep(LIVE_FLUSH_SECONDS)
+        diff, self._live_pending = self._live_pending, {}
+        if not diff:
+            return
+        try:
+            await self.on_live_items(diff, self)
+        except Exception as e:
+            print(f"[live] delivering {len(diff)} slot update(s) failed: {e}")
+
+    # --- outgoing packets ----------------------------------------------------------
+    # Send the initial connection to the server
+    async def send_connect_packet(self, websocket):
+        self.auto_reconnect = True
+
+        payload = [{
+            'cmd': 'Connect',
+            'password': self.password,
+            'name': self.slot_name,
+            "version": {"build": 0, "class": "Version", "major": 0, "minor": 5},
+            'tags': ["TextOnly"],
+            'items_handling': 0b000,
+            'uuid': "",
+            'game': "",
+            "slot_data": False,
+        }]
+        await send(websocket, payload)
+
+    # Disconnect from the server
+    async def disconnect(self, websocket):
+        await websocket.close()
+        self.is_websocket_connected = False
+        self.live_active = False
+        print(f"Disconnected from {self.address}.")
+        self.auto_reconnect = False
+
+    async def close(self):
+        """Leave the room on purpose: no reconnect, even in live mode."""
+        self.intentional_close = True
+        self.auto_reconnect = False
+        if self.websocket is not None:
+            await self.disconnect(self.websocket)
+
+    async def check_connection(self, websocket):
+        while True:
+            await asyncio.sleep(10)
+            if not self.is_websocket_connected:
+                if self.auto_reconnect:
+                    print("Attempting to reconnect...")
+                    await self.send_connect_packet(websocket)
+                else:
+                    print("Auto-reconnect is disabled. Exiting.")
+                    break
+
+    # Test hello package
+    async def send_hello(self, websocket):
+
+        payload = [{
+            'cmd': 'Say',
+            'text': "Don't worry, I'm just grabbing some data."
+        }]
+        print("Sending hello message")
+        await send(websocket, payload)
+
+    # Get the data packages for the given games, in one request
+    async def get_data_package(self, websocket, games):
+        payload = [{
+            'cmd': 'GetDataPackage',
+            'games': list(games)
+        }]
+        await send(websocket, payload)
+
+    # --- incoming packets ----------------------------------------------------------
+    # Listen for packets being sent to us and send them to the read_response function
+    async def handle_messages(self, websocket):
+        try:
+            while websocket.state == websockets.protocol.State.OPEN:
+                self.is_websocket_connected = True
+                response = await websocket.recv()
+                # Process response (assuming response is a JSON-encoded list of messages)
+                for msg in decode(response):
+                    await self.add_packet_to_queue(websocket, msg)
+        except websockets.exceptions.ConnectionClosed:
+            self.is_websocket_connected = False
+            self.live_active = False
+            # Don't clobber the success/refusal message when we closed on purpose.
+            if not self.intentional_close:
+                await _report(self.discord_ack,
+                              "Connection was closed." + (" Reconnecting..." if self.live_mode else ""))
+            print(f"Connection to {self.address} was closed.")
+
+    async def add_packet_to_queue(self, websocket, packet):
+        entry = (time.monotonic(), websocket, packet)
+        if self.packet_queue.full():
+            if _droppable(packet):
+                self._stats["dropped"] += 1
+                return
+            print(f"Packet queue for {self.address} is full ({PACKET_QUEUE_SIZE}); "
+                  f"waiting for the consumer to catch up.")
+        await self.packet_queue.put(entry)
+        self._stats["queued"] += 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], self.packet_queue.qsize())
+
+    def packet_stats(self):
+        """Queue depth and processing metrics: packets queued / processed / dropped, the deepest
+        the queue has been, and the mean and worst time (ms) from arrival to handled."""
+        stats = self._stats
+        processed = stats["processed"]
+        return {
+            "depth": self.packet_queue.qsize(),
+            "max_depth": stats["max_depth"],
+            "queued": stats["queued"],
+            "processed": processed,
+            "dropped": stats["dropped"],
+            "latency_mean_ms": stats["latency_total"] / processed * 1000 if processed else 0.0,
+            "latency_max_ms": stats["latency_max"] * 1000,
         }
 
-    # Convert back to a list for JSON output
-    updated_data = list(existing_games_dict.values())
-
-    # Save the updated data back atomically: write a temp file then os.replace, so a reader
-    # (e.g. an autocomplete) can never observe a half-written data_package.json.
-    tmp_path = data_package_json + ".tmp"
-    with open(tmp_path, "w") as outfile:
-        json.dump(updated_data, outfile, indent=4)
-    os.replace(tmp_path, data_package_json)
-
-    return updated_data
-
-
-async def build_reverse_data_package_mapping(data_package):
-    reverse_item = {}
-    reverse_location = {}
-
-    for game in data_package:
-        for name, id_val in game.get("item_name_to_id", {}).items():
-            reverse_item[id_val] = name
-        for name, id_val in game.get("location_name_to_id", {}).items():
-            reverse_location[id_val] = name
-    return reverse_item, reverse_location
-
-
-# Listen for packets being sent to us and send them to the read_response function
-async def handle_messages(discord_ack, websocket):
-    global is_websocket_connected
-    try:
-        while websocket.state == websockets.protocol.State.OPEN:
-            is_websocket_connected = True
-            response = await websocket.recv()
-            # Process response (assuming response is a JSON-encoded list of messages)
-            for msg in decode(response):
-                await add_packet_to_queue(discord_ack, websocket, msg)
-    except websockets.exceptions.ConnectionClosed:
-        is_websocket_connected = False
-        # Don't clobber the success/refusal message when we closed on purpose.
-        if not intentional_close:
-            await discord_ack.edit_original_response(content="Connection was closed.")
-        print("Connection was closed.")
-
-async def add_packet_to_queue(discord_ack, websocket, packet):
-    await packet_queue.put((discord_ack, websocket, packet))
-    print(f"Added a packet to the queue. Queue size: {packet_queue.qsize()}")
-
-
-# Read the provided packet and process it by type
-@tasks.loop(seconds=1)
-async def read_response():
-    global is_websocket_connected, auto_reconnect
-    global room_info_received, connected_received, expected_data_packages, received_data_packages, intentional_close
-    try:
-        if not packet_queue.empty():
-            discord_ack, websocket, msg = await packet_queue.get()
+    async def _consume_packets(self):
+        """Handle packets as soon as they arrive: wait for one, then take whatever else is
+        already queued (up to PACKET_BATCH_SIZE) and handle the batch before waiting again."""
+        queue, stats = self.packet_queue, self._stats
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < PACKET_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            started = time.monotonic()
+            for enqueued, websocket, msg in batch:
+                await self.read_response(websocket, msg)
+                latency = time.monotonic() - enqueued
+                stats["processed"] += 1
+                stats["latency_total"] += latency
+                stats["latency_max"] = max(stats["latency_max"], latency)
+                queue.task_done()
+            if len(batch) > 1 or queue.qsize():
+                print(f"[{self.address}] handled {len(batch)} packet(s) in "
+                      f"{(time.monotonic() - started) * 1000:.1f} ms; queue depth {queue.qsize()}, "
+                      f"latency up to {latency * 1000:.1f} ms.")
+
+    # Read the provided packet and process it by type
+    async def read_response(self, websocket, msg):
+        discord_ack = self.discord_ack
+        try:
             if msg.get("cmd") == "Connected":
-                connected_received = True
+                self.connected_received = True
                 print(msg)
-                print("Connected to the server")
+                print(f"Connected to {self.address}")
 
                 slot_info = msg.get("slot_info", {})
                 slot_mapping = {}
@@ -215,16 +352,20 @@ async def read_response():
                         "slot_name": info.get("name", "Unknown"),
                         "game": info.get("game", "Unknown")
                     }
-                main.slot_mapping = slot_mapping
-
-                os.makedirs("data", exist_ok=True)
-                slot_info_json = os.path.join("data", "slot_info.json")
-                with open (slot_info_json, "w") as f:
-                    json.dump(slot_mapping, f, indent=4)
-
-                is_websocket_connected = True
-                auto_reconnect = True
-                await discord_ack.edit_original_response(content="Connected to the server")
+                self.slot_mapping = slot_mapping
+                state_store.replace_slot_info(slot_mapping)
+                await state_service.reload_slot_info()
+
+                self.is_websocket_connected = True
+                self.auto_reconnect = True
+                self.live_active = self.live_mode
+                if not self.data_collected:
+                    await _report(discord_ack, "Connected to the server")
+                else:
+                    print("Reconnected; live item updates resumed.")
+                if self.live_mode and self.on_live_connected is not None:
+                    # In the background: the reader must keep consuming packets meanwhile.
+                    self._live_catch_up_task = asyncio.create_task(self.on_live_connected(self))
 
 
 
@@ -232,19 +373,32 @@ async def read_response():
             elif msg.get("cmd") == "RoomInfo":
                 print("Got room info packet")
                 print(msg)
-                games_in_server = msg.get("games", {})
-                room_info_received = True
-                # We request one data package per game, so expect one response each.
-                expected_data_packages = len(games_in_server)
-                for game in games_in_server:
-                    print(f"Getting data package for {game}")
-                    await get_data_package(websocket, game)
+                games_in_server = msg.get("games", [])
+                # RoomInfo advertises a checksum per game's data package. Only games we don't
+                # have, or have under another checksum, are requested -- all in one
+                # GetDataPackage, answered by one DataPackage. A server that sends no checksums
+                # gets the old behaviour: games already stored are kept as they are.
+                advertised = msg.get("datapackage_checksums") or {}
+                stored = state_store.data_package_checksums()
+                missing = [game for game in games_in_server
+                           if game not in stored
+                           or (advertised.get(game) is not None and advertised[game] != stored[game])]
+                self.cached_games = len(games_in_server) - len(missing)
+                self.room_info_received = True
+                if missing:
+                    print(f"Getting data packages for {', '.join(missing)} "
+                          f"({self.cached_games} game(s) already cached)")
+                    self.expected_data_packages = 1
+                    await self.get_data_package(websocket, missing)
+                else:
+                    print(f"All {self.cached_games} game data package(s) are cached")
+                    self.expected_data_packages = 0
 
             elif msg.get("cmd") == "DataPackage":
                 print("Got a data package")
-                received_data_packages += 1
+                self.received_data_packages += 1
 
-                main.data_package_mapping = await process_data_package(msg["data"])
+                self.data_package_games += await process_data_package(msg["data"])
 
             elif msg.get("cmd") == "PrintJSON":
                 if msg.get("type") == "ItemSend":
@@ -256,9 +410,18 @@ async def read_response():
                         print("No data array found in the message.")
                         return
 
-                    # Extract player IDs from the data array.
-                    # (We assume elements with type "player_id" have the slot number in their "text".)
-                    player_ids = [element.get("text") for element in data_array if element.get("type") == "player_id"]
+                    # One pass over the data array: the player ids (elements with type "player_id"
+                    # carry the slot number in their "text") and the first item / location element.
+                    player_ids = []
+                    item_element = location_element = None
+                    for element in data_array:
+                        element_type = element.get("type")
+                        if element_type == "player_id":
+                            player_ids.append(element.get("text"))
+                        elif element_type == "item_id" and item_element is None:
+                            item_element = element
+                        elif element_type == "location_id" and location_element is None:
+                            location_element = element
                     # Check how many player ids were found
                     if len(player_ids) == 2:
                         sender_slot_id = player_ids[0]
@@ -270,88 +433,43 @@ async def read_response():
                         print("Unexpected number of player IDs found:", player_ids)
                         return
 
-                    sender_name = main.slot_mapping.get(sender_slot_id, {}).get("slot_name", "Unknown")
-                    sender_game = main.slot_mapping.get(sender_slot_id, {}).get("game", "Unknown")
-
-                    receiver_name = main.slot_mapping.get(receiver_slot_id, {}).get("slot_name", "Unknown")
-                    receiver_game = main.slot_mapping.get(receiver_slot_id, {}).get("game", "Unknown")
-
-                    item_id = [element.get("text") for element in data_array if element.get("type") == "item_id"]
-                    item_flag = [element.get("flags") for element in data_array if element.get("type") == "item_id"]
-                    item_flag = int(item_flag[0] if item_flag else "None")
-                    item_player = [element.get("player") for element in data_array if element.get("type") == "item_id"]
-
-                    location_id = [element.get("text") for element in data_array if element.get("type") == "location_id"]
-                    location_player = [element.get("player") for element in data_array if element.get("type") == "location_id"]
+                    sender_name = self.slot_mapping.get(sender_slot_id, {}).get("slot_name", "Unknown")
+                    sender_game = self.slot_mapping.get(sender_slot_id, {}).get("game", "Unknown")
 
-                    os.makedirs("data", exist_ok=True)
-                    data_package_json = os.path.join("data", "data_package.json")
+                    receiver_name = self.slot_mapping.get(receiver_slot_id, {}).get("slot_name", "Unknown")
+                    receiver_game = self.slot_mapping.get(receiver_slot_id, {}).get("game", "Unknown")
 
-                    with open(data_package_json, "r") as f:
-                        data_package = json.load(f)
-
-                    receiver_game_data = next((item for item in data_package if item["game"] == receiver_game), None)
-                    sender_game_data = next((item for item in data_package if item["game"] == sender_game), None)
-
-                    if receiver_game_data:
-                        # Reverse the mapping: {id: name}
-                        reverse_item_mapping = {v: k for k, v in receiver_game_data["item_name_to_id"].items()}
-                        # Convert item_id[0] to an integer if it's not already
-                        try:
-                            item_id_value = int(item_id[0])
-                        except ValueError:
-                            item_id_value = item_id[0]
-                        item_name = reverse_item_mapping.get(item_id_value, "Unknown")
-                    else:
-                        item_name = "Unknown"
-
-                    if sender_game_data:
-                        # Reverse the mapping for locations
-                        reverse_location_mapping = {v: k for k, v in sender_game_data["location_name_to_id"].items()}
-                        try:
-                            location_id_value = int(location_id[0])
-                        except ValueError:
-                            location_id_value = location_id[0]
-                        location_name = reverse_location_mapping.get(location_id_value, "Unknown")
-                    else:
-                        location_name = "Unknown"
+                    if item_element is None:
+                        print("No item found in the message.")
+                        return
+                    item_flag = int(item_element.get("flags") or 0)
+
+                    # Convert the ids to integers if they aren't already.
+                    try:
+                        item_id_value = int(item_element.get("text"))
+                    except (TypeError, ValueError):
+                        item_id_value = item_element.get("text")
+                    try:
+                        location_id_value = int(location_element.get("text")) if location_element else None
+                    except (TypeError, ValueError):
+                        location_id_value = location_element.get("text")
+
+                    # Look the names up by id in the receiver's / sender's data package.
+                    item_name = state_store.item_name(receiver_game, item_id_value) or "Unknown"
+                    location_name = state_store.location_name(sender_game, location_id_value) or "Unknown"
 
                     print(f"Sender: {sender_name}, Receiver: {receiver_name}, Item: {item_name}, Location: {location_name}, Flag: {item_flag}")
 
-                    # Store the packet data
-                    os.makedirs("data", exist_ok=True)
-                    items_received_json = os.path.join("data", "items_received.json")
-
-                    # Load existing data, or initialize if file doesn't exist
-                    if os.path.exists(items_received_json):
-                        with open(items_received_json, "r") as f:
-                            try:
-                                data = json.load(f)
-                            except json.JSONDecodeError:
-                                data = {}
-                    else:
-                        data = {}
-
-                    # If sender key doesn't exist, create it as an empty dict
-                    if receiver_name not in data:
-                        data[receiver_name] = {}
-
-                    # Determine next index as a string (e.g., "0", "1", ...)
-                    next_index = str(len(data[receiver_name]))
-
-                    # Append the new entry
-                    data[receiver_name][next_index] = {
-                        "item": item_name,
-                        "flag": str(item_flag),
-                        "location": location_name,
-                        "sending_player": sender_name
-                    }
-
-                    # Write the updated data back to the JSON file
-                    with open(items_received_json, "w") as f:
-                        json.dump(data, f, indent=4)
-
+                    # Store the packet data (buffered; see _log_item)
+                    _log_item(receiver_name, item_name, str(item_flag), location_name, sender_name)
+                    self._queue_live_event(receiver_slot_id, receiver_name, receiver_game, item_name=item_name)
 
+                elif msg.get("type") == "Goal":
+                    goal_slot = str(msg.get("slot"))
+                    goal_info = self.slot_mapping.get(goal_slot, {})
+                    print(f"{goal_info.get('slot_name', 'Unknown')} reached their goal.")
+                    self._queue_live_event(goal_slot, goal_info.get("slot_name", "Unknown"),
+                                           goal_info.get("game", "Unknown"), goal=True)
 
             elif msg.get("cmd") == "ConnectionRefused":
                 # AP sends a list of error strings (e.g. ["InvalidSlot"]); fall back
@@ -362,124 +480,182 @@ async def read_response():
                 else:
                     reason = str(errors)
                 print("Connection refused. Reason:", reason)
-                intentional_close = True
-                await discord_ack.edit_original_response(
-                    content=f"The server refused the connection: {reason}. Check the slot name and password."
+                self.intentional_close = True
+                await _report(
+                    discord_ack,
+                    f"The server refused the connection: {reason}. Check the slot name and password."
                 )
-                await disconnect(websocket)
-                is_websocket_connected = False
+                await self.disconnect(websocket)
             elif msg.get("cmd") == "Bounced":
                 print("Boing!")
             else:
                 print(f"Received unknown packet: {msg}")
 
             # Once we have the slot info and every game's data package, we're done.
-            await finish_data_collection_if_complete(discord_ack, websocket)
-            print(f"Queue size: {packet_queue.qsize()}")
-    except Exception as e:
-        print(f"An error occurred while processing the packet: {e}")
-        await discord_ack.edit_original_response(content=f"An error occurred while processing the packet: {e}")
-
-
-async def finish_data_collection_if_complete(discord_ack, websocket):
-    """Disconnect once the bot has everything a get_server_data run needs: the slot
-    info from the Connected packet and a data package for every game in the room."""
-    global intentional_close
-    if intentional_close:
-        return
-    if not (room_info_received and connected_received):
-        return
-    if received_data_packages < expected_data_packages:
-        return
-
-    intentional_close = True
-    await discord_ack.edit_original_response(
-        content=f"Collected all server data ({received_data_packages} game data package(s)). "
-                f"Disconnecting -- you can now use the other commands."
-    )
-    await disconnect(websocket)
+            await self.finish_data_collection_if_complete(websocket)
+        except Exception as e:
+            print(f"An error occurred while processing the packet: {e}")
+            await _report(discord_ack, f"An error occurred while processing the packet: {e}")
+
+    async def finish_data_collection_if_complete(self, websocket):
+        """Disconnect once the bot has everything a get_server_data run needs: the slot
+        info from the Connected packet and a data package for every game in the room. In live
+        mode the connection stays open for item updates instead."""
+        if self.intentional_close or self.data_collected:
+            return
+        if not (self.room_info_received and self.connected_received):
+            return
+        if self.received_data_packages < self.expected_data_packages:
+            return
+
+        self.data_collected = True
+        summary = (f"{len(self.data_package_games)} game data package(s) downloaded, "
+                   f"{self.cached_games} already cached")
+        if self.live_mode:
+            await _report(
+                self.discord_ack,
+                f"Collected all server data ({summary}). "
+                f"Staying connected for live item updates -- you can now use the other commands."
+            )
+            return
+        self.intentional_close = True
+        await _report(
+            self.discord_ack,
+            f"Collected all server data ({summary}). "
+            f"Disconnecting -- you can now use the other commands."
+        )
+        await self.disconnect(websocket)
+
+    # --- session -------------------------------------------------------------------
+    async def run(self):
+        """Connect and run the session until it ends (collection finished, refused, closed,
+        or -- in live mode -- closed on purpose)."""
+        self._consumer_task = asyncio.create_task(self._consume_packets())
+        try:
+            await self._run_session()
+        finally:
+            # Let the consumer finish what already arrived, then stop it.
+            try:
+                await asyncio.wait_for(self.packet_queue.join(), timeout=10)
+            except asyncio.TimeoutError:
+                print(f"[{self.address}] dropping {self.packet_queue.qsize()} unprocessed packet(s).")
+            self._consumer_task.cancel()
+            await flush_item_log()
+
+    async def _run_session(self):
+        discord_ack = self.discord_ack
+
+        # Prefer a plaintext (ws://) connection, but fall back to TLS (wss://) when the
+        # server speaks TLS to our handshake (raising InvalidMessage: "did not receive a
+        # valid HTTP response"). Servers behind a reverse proxy commonly require wss://.
+        schemes = ["ws", "wss"]
+        backoff = 5
+
+        while True:
+            connection_error = None
+
+            for scheme in schemes:
+                uri = f"{scheme}://{self.address}"
+                try:
+                    async with websockets.connect(uri) as websocket:
+                        print(f"Connected to {uri}")
+                        schemes = [scheme]  # pin the working scheme for any reconnects
+                        self.websocket = websocket
+                        self.is_websocket_connected = True
+                        backoff = 5
+                        # Send initial connection payload
+                        await self.send_connect_packet(websocket)
+
+                        # Run tasks concurrently; these stop when the connection closes. A live
+                        # session stays in the room, so it doesn't announce a quick visit.
+                        await asyncio.gather(
+                            self.handle_messages(websocket),
+                            self.send_hello(websocket) if not self.live_mode else asyncio.sleep(0),
+                            self.check_connection(websocket)
+                        )
+                    # The session ended (socket closed); stop trying other schemes.
+                    connection_error = None
+                    break
+                except websockets.InvalidMessage:
+                    # Handshake wasn't valid HTTP -- usually a scheme mismatch, e.g. a
+                    # plaintext ws:// handshake against a TLS-only endpoint. Try the next.
+                    print(f"{scheme}:// handshake failed; trying the next scheme.")
+                    connection_error = "handshake failed"
+                    continue
+                except websockets.ConnectionClosed:
+                    print("Websocket connection closed.")
+                    self.is_websocket_connected = False
+                    connection_error = None
+                    break
+                except Exception as e:
+                    print(f"Failed to connect via {scheme}://: {e}")
+                    connection_error = e
+                    continue
+
+            self.websocket = None
+            self.is_websocket_connected = False
+            self.live_active = False
+            await flush_item_log()
+
+            if connection_error is not None and not (self.live_mode and self.data_collected):
+                # Every scheme failed to establish a connection (a live session that was already
+                # up keeps retrying below instead: the server may just be restarting).
+                await _report(
+                    discord_ack,
+                    "Could not connect to the server. Double-check the address and port, then try again."
+                )
+                break
 
+            # The connection closed. Reconnect only if it was requested, or if a live session
+            # dropped without being closed on purpose.
+            if not (self.auto_reconnect or (self.live_mode and not self.intentional_close)):
+                break
 
+            print(f"Attempting to reconnect to {self.address} in {backoff} seconds...")
+            await asyncio.sleep(backoff)
+            if self.live_mode:
+                backoff = min(backoff * 2, LIVE_MAX_BACKOFF)
 
-async def main(discord_ack, address="archipelago.gg:38281", slot_name="island_bot", password=""):
 
-    global is_websocket_connected, auto_reconnect
-    global room_info_received, connected_received, expected_data_packages, received_data_packages, intentional_close
-    auto_reconnect = False
+class RoomManager:
+    """The bot's room connections, one per room address, all on the same event loop."""
 
-    # Reset one-shot data-collection progress for this run.
-    room_info_received = False
-    connected_received = False
-    expected_data_packages = 0
-    received_data_packages = 0
-    intentional_close = False
+    def __init__(self):
+        self.rooms = {}     # {address: RoomConnection}
 
-    # Normalize the address: trim whitespace and strip any scheme the user pasted
-    # (e.g. "https://host:port" -> "host:port") so we don't build "ws://https://...",
-    # which would make the resolver try to look up a host literally named "https".
-    cleaned = re.sub(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://", "", address.strip())
+    def get(self, address):
+        return self.rooms.get(normalize_address(address))
 
-    # read_response is a persistent tasks.loop that drains the shared packet queue.
-    # Start it once -- starting an already-running loop raises RuntimeError, which
-    # would otherwise blow up the second time get_server_data is invoked.
-    if not read_response.is_running():
-        read_response.start()
+    def live_rooms(self):
+        """The rooms that are connected and streaming live items."""
+        return [room for room in self.rooms.values() if room.live_active]
 
-    # Prefer a plaintext (ws://) connection, but fall back to TLS (wss://) when the
-    # server speaks TLS to our handshake (raising InvalidMessage: "did not receive a
-    # valid HTTP response"). Servers behind a reverse proxy commonly require wss://.
-    schemes = ["ws", "wss"]
+    async def run(self, discord_ack, address, slot_name="island_bot", password="", live=False):
+        """Connect to a room and run its session until it ends. A new run for a room that is
+        already connected replaces the old connection; other rooms are left alone."""
+        room = RoomConnection(discord_ack, address, slot_name, password, live=live,
+                              on_live_items=on_live_items, on_live_connected=on_live_connected)
+        previous = self.rooms.get(room.address)
+        if previous is not None:
+            await previous.close()
+        self.rooms[room.address] = room
+        try:
+            await room.run()
+        finally:
+            if self.rooms.get(room.address) is room:
+                del self.rooms[room.address]
 
-    while True:
-        connection_error = None
+    async def close(self, address):
+        room = self.rooms.get(normalize_address(address))
+        if room is not None:
+            await room.close()
 
-        for scheme in schemes:
-            uri = f"{scheme}://{cleaned}"
-            try:
-                async with websockets.connect(uri) as websocket:
-                    print(f"Connected to {uri}")
-                    schemes = [scheme]  # pin the working scheme for any reconnects
-                    is_websocket_connected = True
-                    # Send initial connection payload
-                    await send_connect_packet(websocket, slot_name, password)
-
-                    # Run tasks concurrently; these stop when the connection closes.
-                    await asyncio.gather(
-                        handle_messages(discord_ack, websocket),
-                        send_hello(websocket),
-                        check_connection(websocket, slot_name, password)
-                    )
-                # The session ended (socket closed); stop trying other schemes.
-                connection_error = None
-                break
-            except websockets.InvalidMessage:
-                # Handshake wasn't valid HTTP -- usually a scheme mismatch, e.g. a
-                # plaintext ws:// handshake against a TLS-only endpoint. Try the next.
-                print(f"{scheme}:// handshake failed; trying the next scheme.")
-                connection_error = "handshake failed"
-                continue
-            except websockets.ConnectionClosed:
-                print("Websocket connection closed.")
-                is_websocket_connected = False
-                connection_error = None
-                break
-            except Exception as e:
-                print(f"Failed to connect via {scheme}://: {e}")
-                connection_error = e
-                continue
+    async def close_all(self):
+        await asyncio.gather(*(room.close() for room in list(self.rooms.values())))
 
-        is_websocket_connected = False
 
-        if connection_error is not None:
-            # Every scheme failed to establish a connection.
-            await discord_ack.edit_original_response(
-                content="Could not connect to the server. Double-check the address and port, then try again."
-            )
-            break
+manager = RoomManager()
 
-        # The connection closed cleanly. Reconnect only if it was requested.
-        if not auto_reconnect:
-            break
 
-        print("Attempting to reconnect in 5 seconds...")
-        await asyncio.sleep(5)
\ No newline at end of file
+async def main(discord_ack, address="archipelago.gg:38281", slot_name="island_bot", password="", live=False):
+    await manager.run(discord_ack, address, slot_name, password, live=live)
@@ -0,0 +1,113 @@
+"""Latency benchmark for the item autocomplete (search_index.SearchIndex).
+
+Picks the game with the most items, then replays typing: every prefix of a sample of its
+item names, plus a few word-only and mid-word queries, one `search()` per keystroke. It
+prints the mean / p99 / worst latency and fails (exit status 1) if the p99 is over the
+per-keystroke budget.
+
+Examples:
+  # the data packages already in the bot's state store (data/state.db)
+  python autocomplete_bench.py
+
+  # a saved data package: the legacy data/data_package.json, or an AP server's
+  # DataPackage JSON ({"games": {game: {"item_name_to_id": ...}}})
+  python autocomplete_bench.py --data-package data_package.json
+
+  # nothing at hand: a synthetic 6000-item game
+  python autocomplete_bench.py --synthetic 6000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import search_index
+import state_store
+
+
+def _games_from_file(path: str) -> dict:
+    with open(path, "r") as fh:
+        data = json.load(fh)
+    if isinstance(data, dict):
+        data = data.get("data", data)
+        games = data.get("games", data)
+        return {game: list(pkg.get("item_name_to_id", {})) for game, pkg in games.items() if isinstance(pkg, dict)}
+    return {entry["game"]: list(entry.get("item_name_to_id", {})) for entry in data if entry.get("game")}
+
+
+def _games_from_store(db: str | None) -> dict:
+    state_store.connect(db)
+    return {game: state_store.get_item_names(game) for game in state_store.data_package_games()}
+
+
+def _synthetic_game(count: int) -> dict:
+    rng = random.Random(0)
+    words = ["Progressive", "Sword", "Shield", "Bow", "Arrow", "Key", "Small", "Big", "Boss", "Heart",
+             "Container", "Piece", "Bottle", "Magic", "Upgrade", "Map", "Compass", "Bomb", "Rupee",
+             "Fire", "Ice", "Light", "Dark", "Palace", "Tower", "Temple", "Ocarina", "Song", "Crystal"]
+    names = {f"{' '.join(rng.sample(words, rng.randint(1, 4)))} {i}" for i in range(count)}
+    return {"Synthetic": sorted(names)}
+
+
+def _queries(names: list, samples: int) -> list:
+    rng = random.Random(1)
+    queries = []
+    for name in rng.sample(names, min(samples, len(names))):
+        queries += [name[:n] for n in range(1, len(name) + 1)]  # typing the full name
+        words = name.split()
+        if len(words) > 1:
+            last = words[-1]
+            queries += [last[:n] for n in range(1, len(last) + 1)]  # typing a later word only
+            queries.append(" ".join(w[:2] for w in words))          # "pr sw"
+        if len(name) > 6:
+            queries.append(name[3:7])                                # a mid-word substring
+    queries += ["", "zzzz", "xq"]                                    # empty and no-match
+    return queries
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark the item autocomplete search")
+    p.add_argument("--data-package", help="a data package JSON file (else the state store)")
+    p.add_argument("--db", help="state store path (default data/state.db)")
+    p.add_argument("--synthetic", type=int, metavar="N", help="benchmark a generated N-item game")
+    p.add_argument("--samples", type=int, default=40, help="item names to 'type' in full")
+    p.add_argument("--budget-ms", type=float, default=2.0, help="p99 latency budget per keystroke")
+    args = p.parse_args(argv)
+
+    if args.synthetic:
+        games = _synthetic_game(args.synthetic)
+    elif args.data_package:
+        games = _games_from_file(args.data_package)
+    else:
+        games = _games_from_store(args.db)
+    if not games:
+        print("No data packages found (use --data-package FILE or --synthetic N).", file=sys.stderr)
+        return 2
+
+    game, names = max(games.items(), key=lambda kv: len(kv[1]))
+    start = time.perf_counter()
+    index = search_index.SearchIndex(names)
+    build_ms = (time.perf_counter() - start) * 1000
+    queries = _queries(index.names, args.samples)
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+    print(f"game: {game} ({len(index)} items), index built in {build_ms:.1f} ms")
+    print(f"{len(queries)} keystrokes: mean {sum(timings) / len(timings):.3f} ms, "
+          f"p99 {p99:.3f} ms, worst {timings[-1]:.3f} ms (budget {args.budget_ms} ms)")
+    for query in ("prog", "sword", "pr sw", "ey"):
+        print(f"  {query!r:>8} -> {index.search(query)[:5]}")
+    return 0 if p99 <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
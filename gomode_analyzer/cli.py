@@ -1,7 +1,8 @@
 """Command-line / JSON entrypoint for the go-mode analyzer.
 
-Runs inside the version-pinned AP environment (the bot invokes it as a subprocess,
-one fork per request). Reads a seed + slot + inventory, prints a JSON result.
+Runs inside the version-pinned AP environment. Reads a seed + slot + inventory, prints a
+JSON result. The bot doesn't fork this per request: it keeps a worker.py process up, which
+answers the same requests through go_mode_batch() / analyze_one() below.
 
 Examples:
   # analyze one slot for a given inventory
@@ -55,6 +56,56 @@ def _resolve_slot(seed, selector: str):
     return seed.find_slot(selector)
 
 
+def _load_json_arg(spec: str):
+    """A JSON argument given inline, or as @path to a JSON file."""
+    if spec.startswith("@"):
+        with open(spec[1:], "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    return json.loads(spec)
+
+
+def go_mode_batch(seed, requested: dict, *, use_cache: bool = False) -> dict:
+    """Fast go-mode check for many slots at once: {slot: inventory} -> {go_mode: {slot:
+    {status, in_go_mode, reason}}}. `use_cache` keeps the built worlds (worker.py)."""
+    import engine
+
+    go_mode = {}
+    for selector, inv in requested.items():
+        sd = _resolve_slot(seed, selector)
+        if sd is None:
+            go_mode[selector] = {"status": "error", "reason": "slot not found"}
+            continue
+        try:
+            res = engine.analyze_slot(sd.game, sd.options, inv or {}, slot=sd.slot,
+                                      name=sd.name, spoiler_settings=sd.spoiler_settings,
+                                      precollected=sd.precollected, fast=True,
+                                      use_cache=use_cache)
+            go_mode[selector] = {"status": res.status, "in_go_mode": res.in_go_mode,
+                                 "reason": res.reason}
+        except Exception as exc:  # noqa: BLE001 -- one bad slot must not abort the batch
+            go_mode[selector] = {"status": "error", "reason": f"{type(exc).__name__}: {exc}"}
+    return {"go_mode": go_mode}
+
+
+def analyze_one(seed, selector: str, inventory: dict, *, use_cache: bool = False) -> tuple[dict, int]:
+    """Full analysis of one slot for an inventory; returns (result dict, exit status)."""
+    import engine
+
+    sd = _resolve_slot(seed, selector)
+    if sd is None:
+        return {"status": "error", "reason": f"Slot {selector!r} not found in seed"}, 2
+    res = engine.analyze_slot(sd.game, sd.options, inventory, slot=sd.slot, name=sd.name,
+                              spoiler_settings=sd.spoiler_settings,
+                              precollected=sd.precollected, use_cache=use_cache)
+    output = res.to_dict()
+    output["seed"] = seed.seed_name
+    output["version"] = seed.version_str
+    if res.status == "ok" and not res.in_go_mode:
+        import requirements
+        output["requirements_text"] = requirements.render_requirements(res.requirements)
+    return output, 0
+
+
 def main(argv=None) -> int:
     parser = argparse.ArgumentParser(description="Archipelago go-mode analyzer")
     parser.add_argument("--ap-path", required=True, help="Path to the version-matched AP source tree")
@@ -79,27 +130,7 @@ def main(argv=None) -> int:
         seed = seed_data.load_seed(args.seed_zip)
 
         if args.go_mode_batch:
-            spec = args.go_mode_batch
-            if spec.startswith("@"):
-                with open(spec[1:], "r", encoding="utf-8") as fh:
-                    requested = json.load(fh)
-            else:
-                requested = json.loads(spec)
-            go_mode = {}
-            for selector, inv in requested.items():
-                sd = _resolve_slot(seed, selector)
-                if sd is None:
-                    go_mode[selector] = {"status": "error", "reason": "slot not found"}
-                    continue
-                try:
-                    res = engine.analyze_slot(sd.game, sd.options, inv or {}, slot=sd.slot,
-                                              name=sd.name, spoiler_settings=sd.spoiler_settings,
-                                              precollected=sd.precollected, fast=True)
-                    go_mode[selector] = {"status": res.status, "in_go_mode": res.in_go_mode,
-                                         "reason": res.reason}
-                except Exception as exc:  # noqa: BLE001 -- one bad slot must not abort the batch
-                    go_mode[selector] = {"status": "error", "reason": f"{type(exc).__name__}: {exc}"}
-            output = {"go_mode": go_mode}
+            output = go_mode_batch(seed, _load_json_arg(args.go_mode_batch))
         elif args.survey:
             rows = []
             for sid, sd in seed.slots.items():
@@ -115,26 +146,7 @@ def main(argv=None) -> int:
             output = {"seed": seed.seed_name, "version": seed.version_str,
                       "slots": len(rows), "analyzable": ok, "results": rows}
         else:
-            sd = _resolve_slot(seed, args.slot)
-            if sd is None:
-                output = {"status": "error", "reason": f"Slot {args.slot!r} not found in seed"}
-                rc = 2
-            else:
-                inv_arg = args.inventory
-                if inv_arg.startswith("@"):
-                    with open(inv_arg[1:], "r", encoding="utf-8") as fh:
-                        inventory = json.load(fh)
-                else:
-                    inventory = json.loads(inv_arg)
-                res = engine.analyze_slot(sd.game, sd.options, inventory, slot=sd.slot, name=sd.name,
-                                          spoiler_settings=sd.spoiler_settings,
-                                          precollected=sd.precollected)
-                output = res.to_dict()
-                output["seed"] = seed.seed_name
-                output["version"] = seed.version_str
-                if res.status == "ok" and not res.in_go_mode:
-                    import requirements
-                    output["requirements_text"] = requirements.render_requirements(res.requirements)
+            output, rc = analyze_one(seed, args.slot, _load_json_arg(args.inventory))
 
     print(json.dumps(output, indent=2))
     return rc
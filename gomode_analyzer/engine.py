@@ -16,7 +16,10 @@ the caller controls sys.path first.
 """
 from __future__ import annotations
 
-from collections import Counter
+import gc
+import json
+import os
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -39,6 +42,19 @@ MAX_MINIMIZATION_ITEMS = 600
 # pools; this is just a backstop against a pathological case.
 MAX_CLASSIFY_ITEMS = 600
 
+# Built worlds kept by a long-lived analyzer (worker.py) between requests, least recently used
+# first out: at most WORLD_CACHE_SIZE of them, and at most WORLD_CACHE_MB of them by estimated
+# size (0 = no cap, for either). RSS can't measure one world (it doesn't shrink on eviction and
+# freed memory is reused), so each world's size is estimated from what it holds: a fixed cost
+# per region, entrance, location and pool item, plus a base for the world and its options.
+WORLD_CACHE_SIZE = int(os.getenv("GOMODE_WORLD_CACHE_SIZE", "8"))
+WORLD_CACHE_MB = float(os.getenv("GOMODE_WORLD_CACHE_MB", "1024"))
+_WORLD_BASE_BYTES = 1 << 20
+_WORLD_OBJECT_BYTES = 2048
+# A multiworld is full of reference cycles, so evicted worlds are only freed by a collection;
+# one is run after this many evictions rather than after each.
+_GC_EVERY_EVICTIONS = 4
+
 
 @dataclass
 class SlotResult:
@@ -84,9 +100,78 @@ def _describe_source(slot_data_opts: dict, spoiler_opts: dict) -> str:
     return "+".join(parts)
 
 
+@dataclass
+class _Built:
+    """A slot's world, built and checked once, before any inventory is applied: what
+    analyze_slot keeps in the world cache. `status` is "ok" or the terminal outcome
+    ("unsupported" / "error", with `reason`), in which case there is nothing else to keep."""
+    status: str
+    reason: str = ""
+    options_source: str = ""
+    multiworld: object = None
+    prog_pool: list = field(default_factory=list)
+    base_state: object = None        # CollectionState holding the start inventory
+    size_mb: float = 0.0             # rough estimate, see _estimate_mb
+
+
+_world_cache: "OrderedDict[str, _Built]" = OrderedDict()
+_world_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_evicted_since_gc = 0
+
+
+def _world_cache_key(game: str, options: dict, spoiler_settings: Optional[dict],
+                     precollected: Optional[list]) -> str:
+    # Everything the build depends on. The seed itself isn't part of it: two slots (of any
+    # seed) with the same game, options and start inventory build the same world.
+    return json.dumps([game, options or {}, spoiler_settings or {}, list(precollected or [])],
+                      sort_keys=True, default=repr)
+
+
+def _estimate_mb(multiworld) -> float:
+    """A rough size for a built world: it counts objects, it doesn't measure them."""
+    if multiworld is None:
+        return 0.0
+    objects = len(getattr(multiworld, "itempool", ()))
+    for getter in ("get_regions", "get_entrances", "get_locations"):
+        try:
+            objects += len(list(getattr(multiworld, getter)()))
+        except Exception:  # noqa: BLE001 -- a count we can't take just leaves the estimate lower
+            pass
+    return (_WORLD_BASE_BYTES + objects * _WORLD_OBJECT_BYTES) / (1 << 20)
+
+
+def _world_cache_mb() -> float:
+    return sum(built.size_mb for built in _world_cache.values())
+
+
+def _world_cache_put(key: str, built: _Built) -> None:
+    global _evicted_since_gc
+    built.size_mb = _estimate_mb(built.multiworld)
+    _world_cache[key] = built
+    total_mb = _world_cache_mb()
+    # The newest world always stays, even if it alone is over the budget.
+    while len(_world_cache) > 1 and (
+            (WORLD_CACHE_SIZE and len(_world_cache) > WORLD_CACHE_SIZE)
+            or (WORLD_CACHE_MB and total_mb > WORLD_CACHE_MB)):
+        _, old = _world_cache.popitem(last=False)
+        total_mb -= old.size_mb
+        _world_cache_stats["evictions"] += 1
+        _evicted_since_gc += 1
+    if _evicted_since_gc >= _GC_EVERY_EVICTIONS:
+        _evicted_since_gc = 0
+        gc.collect()
+
+
+def world_cache_stats() -> dict:
+    """Hits / misses / evictions of the built-world cache, and what it holds now."""
+    return {**_world_cache_stats, "entries": len(_world_cache), "max_entries": WORLD_CACHE_SIZE,
+            "size_mb": round(_world_cache_mb(), 1), "max_mb": WORLD_CACHE_MB}
+
+
 def analyze_slot(game: str, options: dict, inventory: dict, *, slot: Optional[int] = None,
                  name: str = "", spoiler_settings: Optional[dict] = None,
-                 precollected: Optional[list] = None, fast: bool = False) -> SlotResult:
+                 precollected: Optional[list] = None, fast: bool = False,
+                 use_cache: bool = False) -> SlotResult:
     """Analyze one slot.
 
     `options` is the slot's resolved slot_data options (may be empty). `spoiler_settings`
@@ -97,13 +182,14 @@ def analyze_slot(game: str, options: dict, inventory: dict, *, slot: Optional[in
     `fast=True` returns as soon as the go-mode boolean is known, skipping the expensive
     minimization + requirement decomposition. Used by the go-mode notification loop, which
     only needs `in_go_mode` (the same build + guardrails still run, so the answer is exact).
+
+    `use_cache=True` keeps the built world (see WORLD_CACHE_SIZE), so the next request for the
+    same slot only copies its start state and collects the inventory. Only worth it in a
+    long-lived process; one-shot runs (cli.py, precompute.py) leave it off.
     """
     # Lazy AP imports -- the caller is responsible for putting the (version-pinned) AP
     # source on sys.path before calling this.
-    from BaseClasses import CollectionState
     from worlds.AutoWorld import AutoWorldRegister
-    from test.general import setup_multiworld
-    import spoiler_options
 
     result = SlotResult(slot=slot, name=name or "", game=game, status="error")
 
@@ -114,93 +200,31 @@ def analyze_slot(game: str, options: dict, inventory: dict, *, slot: Optional[in
                          f"built for a different Archipelago version.")
         return result
 
-    # Resolve options: spoiler-recovered as a base, slot_data overriding it (slot_data is
-    # exact/typed; the spoiler is parsed from text). Anything still missing -> world default.
-    slot_data_opts = dict(options or {})
-    spoiler_opts = spoiler_options.resolve_options(world_type, spoiler_settings or {})
-    merged = {**spoiler_opts, **slot_data_opts}
-
-    # A spoiler-recovered value can occasionally break the build (a mis-converted option).
-    # Try the richest option set first, then fall back to slot_data-only, then defaults,
-    # so Phase 2 never regresses below "the world at least builds".
-    attempts = [(merged, _describe_source(slot_data_opts, spoiler_opts))]
-    if slot_data_opts and slot_data_opts != merged:
-        attempts.append((slot_data_opts, "slot_data only (spoiler dropped: build failed)"))
-    attempts.append(({}, "defaults (recovered options dropped: build failed)"))
+    if use_cache:
+        key = _world_cache_key(game, options, spoiler_settings, precollected)
+        built = _world_cache.get(key)
+        if built is not None:
+            _world_cache.move_to_end(key)
+            _world_cache_stats["hits"] += 1
+        else:
+            _world_cache_stats["misses"] += 1
+            built = _build(world_type, options, spoiler_settings, precollected)
+            _world_cache_put(key, built)
+    else:
+        built = _build(world_type, options, spoiler_settings, precollected)
 
-    multiworld = None
-    last_exc = None
-    for opts, source in attempts:
-        try:
-            multiworld = setup_multiworld(world_type, steps=BUILD_STEPS, seed=0, options=opts)
-            result.options_source = source
-            break
-        except Exception as exc:  # noqa: BLE001 -- try the next, less-faithful option set
-            last_exc = exc
-    if multiworld is None:
-        result.status = "error"
-        result.reason = f"Failed to build logic: {type(last_exc).__name__}: {last_exc}"
+    result.options_source = built.options_source
+    result.progression_pool = len(built.prog_pool)
+    if built.status != "ok":
+        result.status = built.status
+        result.reason = built.reason
         return result
-
+    multiworld, prog_pool = built.multiworld, built.prog_pool
     player = 1  # solo multiworld
 
-    # Guardrail 1: the world must define a real goal. The default completion_condition
-    # is `lambda state: True`; if an empty state already "beats" the game, the goal was
-    # never set (or this world needs setup we skipped), so we must not claim go-mode.
-    # NOTE: run this BEFORE crediting start inventory, so a slot with a generous start
-    # inventory can't be misread as having no gating goal.
-    try:
-        if multiworld.can_beat_game(CollectionState(multiworld)):
-            result.status = "unsupported"
-            result.reason = "World has no gating goal in logic (cannot determine go-mode reliably)."
-            return result
-    except Exception as exc:  # noqa: BLE001
-        result.status = "error"
-        result.reason = f"Goal check failed: {type(exc).__name__}: {exc}"
-        return result
-
-    prog_pool = [item for item in multiworld.itempool if item.advancement]
-    result.progression_pool = len(prog_pool)
-
-    # Guardrail 2: collecting the entire progression pool must beat the game. If it
-    # doesn't, our reconstruction is missing something (classically: entrance
-    # randomization whose real connections we don't have). Don't guess.
-    full_state = CollectionState(multiworld)
-    for item in prog_pool:
-        full_state.collect(item, prevent_sweep=True)
-    if not multiworld.can_beat_game(full_state):
-        result.status = "unsupported"
-        result.reason = ("Goal is unreachable even with every progression item -- the "
-                         "logic reconstruction is incomplete (often entrance randomization). "
-                         "Faithful support needs the seed's entrance data.")
-        return result
-
-    # Credit the slot's ACTUAL start inventory (after the guardrails). setup_multiworld runs
-    # the world stages but NOT core generation's start-inventory step, so a world's own
-    # push_precollected is included, yet yaml start_inventory / start_inventory_from_pool (and
-    # randomized start inventory) are not. Inject the multidata's ground-truth precollected for
-    # anything the rebuild didn't already credit, so go-mode + requirements account for items
-    # the player holds from the start.
-    if precollected:
-        world = multiworld.worlds[player]
-        id_to_name = getattr(world_type, "item_id_to_name", {}) or {}
-        already = Counter(getattr(it, "code", None) for it in multiworld.precollected_items[player])
-        for code in precollected:
-            code_i = int(code) if str(code).lstrip("-").isdigit() else code
-            if already.get(code_i, 0) > 0:
-                already[code_i] -= 1   # the world already granted this start item
-                continue
-            item_name = id_to_name.get(code_i)
-            if not item_name:
-                continue
-            try:
-                multiworld.push_precollected(world.create_item(item_name))
-            except Exception:  # noqa: BLE001 -- a start item we can't reconstruct is simply skipped
-                pass
-
-    # Seed the player's current inventory directly into a fresh state (now also carrying the
-    # injected start inventory via CollectionState's precollected auto-collect).
-    current = CollectionState(multiworld)
+    # Seed the player's current inventory into a copy of the start state (which already
+    # carries the start inventory via CollectionState's precollected auto-collect).
+    current = built.base_state.copy()
     unknown = []
     for item_name, count in inventory.items():
         try:
@@ -269,6 +293,97 @@ def analyze_slot(game: str, options: dict, inventory: dict, *, slot: Optional[in
     return result
 
 
+def _build(world_type, options: dict, spoiler_settings: Optional[dict],
+           precollected: Optional[list]) -> _Built:
+    """Build a slot's logic (no fill), run the guardrails and credit its start inventory."""
+    from BaseClasses import CollectionState
+    from test.general import setup_multiworld
+    import spoiler_options
+
+    # Resolve options: spoiler-recovered as a base, slot_data overriding it (slot_data is
+    # exact/typed; the spoiler is parsed from text). Anything still missing -> world default.
+    slot_data_opts = dict(options or {})
+    spoiler_opts = spoiler_options.resolve_options(world_type, spoiler_settings or {})
+    merged = {**spoiler_opts, **slot_data_opts}
+
+    # A spoiler-recovered value can occasionally break the build (a mis-converted option).
+    # Try the richest option set first, then fall back to slot_data-only, then defaults,
+    # so Phase 2 never regresses below "the world at least builds".
+    attempts = [(merged, _describe_source(slot_data_opts, spoiler_opts))]
+    if slot_data_opts and slot_data_opts != merged:
+        attempts.append((slot_data_opts, "slot_data only (spoiler dropped: build failed)"))
+    attempts.append(({}, "defaults (recovered options dropped: build failed)"))
+
+    multiworld = None
+    last_exc = None
+    options_source = ""
+    for opts, source in attempts:
+        try:
+            multiworld = setup_multiworld(world_type, steps=BUILD_STEPS, seed=0, options=opts)
+            options_source = source
+            break
+        except Exception as exc:  # noqa: BLE001 -- try the next, less-faithful option set
+            last_exc = exc
+    if multiworld is None:
+        return _Built("error", f"Failed to build logic: {type(last_exc).__name__}: {last_exc}")
+
+    player = 1  # solo multiworld
+
+    # Guardrail 1: the world must define a real goal. The default completion_condition
+    # is `lambda state: True`; if an empty state already "beats" the game, the goal was
+    # never set (or this world needs setup we skipped), so we must not claim go-mode.
+    # NOTE: run this BEFORE crediting start inventory, so a slot with a generous start
+    # inventory can't be misread as having no gating goal.
+    try:
+        if multiworld.can_beat_game(CollectionState(multiworld)):
+            return _Built("unsupported", "World has no gating goal in logic (cannot determine go-mode reliably).",
+                          options_source)
+    except Exception as exc:  # noqa: BLE001
+        return _Built("error", f"Goal check failed: {type(exc).__name__}: {exc}", options_source)
+
+    prog_pool = [item for item in multiworld.itempool if item.advancement]
+
+    # Guardrail 2: collecting the entire progression pool must beat the game. If it
+    # doesn't, our reconstruction is missing something (classically: entrance
+    # randomization whose real connections we don't have). Don't guess.
+    full_state = CollectionState(multiworld)
+    for item in prog_pool:
+        full_state.collect(item, prevent_sweep=True)
+    if not multiworld.can_beat_game(full_state):
+        return _Built("unsupported",
+                      "Goal is unreachable even with every progression item -- the "
+                      "logic reconstruction is incomplete (often entrance randomization). "
+                      "Faithful support needs the seed's entrance data.",
+                      options_source, prog_pool=prog_pool)
+
+    # Credit the slot's ACTUAL start inventory (after the guardrails). setup_multiworld runs
+    # the world stages but NOT core generation's start-inventory step, so a world's own
+    # push_precollected is included, yet yaml start_inventory / start_inventory_from_pool (and
+    # randomized start inventory) are not. Inject the multidata's ground-truth precollected for
+    # anything the rebuild didn't already credit, so go-mode + requirements account for items
+    # the player holds from the start.
+    if precollected:
+        world = multiworld.worlds[player]
+        id_to_name = getattr(world_type, "item_id_to_name", {}) or {}
+        already = Counter(getattr(it, "code", None) for it in multiworld.precollected_items[player])
+        for code in precollected:
+            code_i = int(code) if str(code).lstrip("-").isdigit() else code
+            if already.get(code_i, 0) > 0:
+                already[code_i] -= 1   # the world already granted this start item
+                continue
+            item_name = id_to_name.get(code_i)
+            if not item_name:
+                continue
+            try:
+                multiworld.push_precollected(world.create_item(item_name))
+            except Exception:  # noqa: BLE001 -- a start item we can't reconstruct is simply skipped
+                pass
+
+    # A fresh state now carries the injected start inventory (CollectionState collects the
+    # precollected items itself); every request starts from a copy of it.
+    return _Built("ok", "", options_source, multiworld, prog_pool, CollectionState(multiworld))
+
+
 def _remaining_pool(prog_pool, inventory) -> list:
     """Progression items not already covered by the inventory (matched by name)."""
     held = Counter({k: int(v) for k, v in inventory.items() if str(v).lstrip("-").isdigit()})
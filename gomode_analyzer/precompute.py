@@ -5,17 +5,167 @@ fallback, so the bot can later answer `/items_to_go_mode` and run the go-mode no
 without re-running the heavy analysis -- verified slots evaluate `satisfies(tree, inventory)`
 in pure Python; only fallback slots need a live oracle check.
 
+`--jobs N` analyses slots in N worker processes (each imports AP and decodes the seed once).
+Slots are independent, so the result doesn't depend on N: records are merged back in seed
+order. A slot that raises is recorded as an error; one that takes its worker process down
+is retried alone, so it can't take other slots with it.
+
+Each finished slot is appended to a checkpoint (`<out>.checkpoint.jsonl`, one JSON line per
+slot after a header naming the seed) as soon as it is done, so a run that dies partway loses
+nothing: `--resume` reuses the records of a checkpoint for the same seed zip and analyses only
+the rest. Slots recorded as errors (an exception, or a crashed worker -- often an OOM) are
+analysed again rather than reused. The checkpoint is removed once the cache is written. While it runs, progress goes to
+stdout as JSON lines ({"progress": "37/112 slots, ETA 4m", ...}); the LAST line is always
+the summary, which also counts how the slots' go-mode oracle queries were answered
+(memo / inferred / real `can_beat_game` calls, see requirements.oracle_stats).
+
 Output cache: {seed, version, slots: {slot_number: {name, game, status, requirements, ...}}}
 """
 from __future__ import annotations
 
 import argparse
 import contextlib
+import hashlib
 import io
 import json
 import logging
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+_seed = None  # the decoded seed, loaded once per process
+_ORACLE_COUNTERS = ("queries", "exact", "dominated", "calls")
+
+
+def _setup(ap_path: str, seed_zip: str) -> None:
+    """Put the analyzer + AP on sys.path and load the seed (once per process)."""
+    global _seed
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    ap_path = os.path.abspath(ap_path)
+    if ap_path not in sys.path:
+        sys.path.insert(0, ap_path)
+    logging.disable(logging.CRITICAL)
+    if _seed is None:
+        import seed_data
+        _seed = seed_data.load_seed(seed_zip)
+
+
+def _worker_init(ap_path: str, seed_zip: str) -> None:
+    # A pool worker's stdout is the parent's: mute AP world-loading chatter for good.
+    sys.stdout = open(os.devnull, "w")
+    _setup(ap_path, seed_zip)
+
+
+def _analyze(sid: int) -> tuple[dict, dict]:
+    """The cache record for one slot (an error record if the analysis raised), plus the
+    oracle queries its analysis made."""
+    import engine
+    import requirements
+
+    sd = _seed.slots[sid]
+    before = requirements.oracle_stats()
+    try:
+        res = engine.analyze_slot(sd.game, sd.options, {}, slot=sid, name=sd.name,
+                                  spoiler_settings=sd.spoiler_settings,
+                                  precollected=sd.precollected)
+        record = {
+            "name": sd.name,
+            "game": sd.game,
+            "status": res.status,
+            "reason": res.reason,
+            "options_source": res.options_source,
+            "requirements": res.requirements,   # verified tree OR conservative fallback
+        }
+    except Exception as exc:  # noqa: BLE001 -- never let one slot abort the precompute
+        record = {"name": sd.name, "game": sd.game, "status": "error",
+                  "reason": f"{type(exc).__name__}: {exc}", "options_source": "", "requirements": {}}
+    after = requirements.oracle_stats()
+    return record, {k: after[k] - before[k] for k in _ORACLE_COUNTERS}
+
+
+def _crashed(sid: int, exc: BaseException) -> dict:
+    sd = _seed.slots[sid]
+    return {"name": sd.name, "game": sd.game, "status": "error",
+            "reason": f"analysis crashed its worker process ({type(exc).__name__}: {exc})",
+            "options_source": "", "requirements": {}}
+
+
+def _run_serial(sids: list):
+    """Yield (sid, record, oracle counters) for `sids`, analysed in this process."""
+    for sid in sids:
+        yield (sid, *_analyze(sid))
+
+
+def _run_pool(sids: list, jobs: int, ap_path: str, seed_zip: str):
+    """Yield (sid, record, oracle counters) for `sids` as `jobs` worker processes finish them."""
+    broken = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_worker_init,
+                             initargs=(ap_path, seed_zip)) as pool:
+        futures = {pool.submit(_analyze, sid): sid for sid in sids}
+        for future in as_completed(futures):
+            sid = futures[future]
+            try:
+                record, oracle = future.result()
+            except BrokenProcessPool:
+                broken.append(sid)  # this slot, or another one in the pool, killed a worker
+                continue
+            yield sid, record, oracle
+    # A dead worker breaks the whole pool, failing every slot still in flight. Retry those one
+    # at a time in a pool of their own, so only the slot that really crashes is lost.
+    for sid in sorted(broken):
+        with ProcessPoolExecutor(max_workers=1, initializer=_worker_init,
+                                 initargs=(ap_path, seed_zip)) as pool:
+            try:
+                record, oracle = pool.submit(_analyze, sid).result()
+            except BrokenProcessPool as exc:
+                record, oracle = _crashed(sid, exc), {}
+        yield sid, record, oracle
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_checkpoint(path: str, header: dict) -> dict:
+    """{sid: record} from a checkpoint written for the same seed zip ({} if none or another).
+    Error records are left out, so a resume retries those slots."""
+    records = {}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            if json.loads(fh.readline() or "null") != header:
+                return {}
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # a line cut short by the crash that ended the last run
+                if entry["record"].get("status") != "error":
+                    records[int(entry["slot"])] = entry["record"]
+    except (FileNotFoundError, ValueError):
+        return {}
+    return records
+
+
+def _append_line(fh, obj: dict) -> None:
+    fh.write(json.dumps(obj) + "\n")
+    fh.flush()
+    os.fsync(fh.fileno())
+
+
+def _duration(seconds: float) -> str:
+    if seconds < 90:
+        return f"{max(1, round(seconds))}s"
+    if seconds < 5400:
+        return f"{round(seconds / 60)}m"
+    return f"{seconds / 3600:.1f}h"
 
 
 def main(argv=None) -> int:
@@ -24,42 +174,71 @@ def main(argv=None) -> int:
     p.add_argument("--seed-zip", required=True)
     p.add_argument("--out", required=True, help="cache JSON to write")
     p.add_argument("--slots", help="comma-separated slot numbers to limit (testing)")
+    p.add_argument("--jobs", type=int, default=1,
+                   help="worker processes to analyse slots in (0 = one per CPU core)")
+    p.add_argument("--resume", action="store_true",
+                   help="reuse the slots already in this --out's checkpoint (same seed zip only)")
     args = p.parse_args(argv)
 
-    here = os.path.dirname(os.path.abspath(__file__))
-    sys.path.insert(0, here)
-    sys.path.insert(0, os.path.abspath(args.ap_path))
-    logging.disable(logging.CRITICAL)
-
     only = {int(x) for x in args.slots.split(",")} if args.slots else None
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    checkpoint_path = args.out + ".checkpoint.jsonl"
 
     real_stdout = sys.stdout
-    cache = None
+
+    def progress(text: str, **fields) -> None:
+        real_stdout.write(json.dumps({"progress": text, **fields}) + "\n")
+        real_stdout.flush()
+
     with contextlib.redirect_stdout(io.StringIO()):  # mute AP world-loading chatter
-        import seed_data
-        import engine
+        _setup(args.ap_path, args.seed_zip)
+        seed = _seed
+        sids = [sid for sid in seed.slots if only is None or sid in only]
+        header = {"seed": seed.seed_name, "version": seed.version_str,
+                  "seed_zip_sha256": _file_sha256(args.seed_zip)}
 
-        seed = seed_data.load_seed(args.seed_zip)
-        slots = {}
-        for sid, sd in seed.slots.items():
-            if only is not None and sid not in only:
-                continue
-            res = engine.analyze_slot(sd.game, sd.options, {}, slot=sid, name=sd.name,
-                                      spoiler_settings=sd.spoiler_settings,
-                                      precollected=sd.precollected)
-            slots[str(sid)] = {
-                "name": sd.name,
-                "game": sd.game,
-                "status": res.status,
-                "reason": res.reason,
-                "options_source": res.options_source,
-                "requirements": res.requirements,   # verified tree OR conservative fallback
-            }
+        records = _load_checkpoint(checkpoint_path, header) if args.resume else {}
+        records = {sid: rec for sid, rec in records.items() if sid in sids}
+        todo = [sid for sid in sids if sid not in records]
+        total = len(sids)
+        if records:
+            progress(f"resuming: {len(records)}/{total} slots already analysed",
+                     done=len(records), total=total)
+
+        # Start the checkpoint over with what is being kept (atomically, so a crash right here
+        # can't lose it), then append each slot as it ends.
+        with open(checkpoint_path + ".tmp", "w", encoding="utf-8") as fh:
+            fh.write(json.dumps(header) + "\n")
+            for sid in sids:
+                if sid in records:
+                    fh.write(json.dumps({"slot": sid, "record": records[sid]}) + "\n")
+        os.replace(checkpoint_path + ".tmp", checkpoint_path)
+
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            if jobs > 1 and len(todo) > 1:
+                results = _run_pool(todo, min(jobs, len(todo)), args.ap_path, args.seed_zip)
+            else:
+                results = _run_serial(todo)
+            started, finished = time.monotonic(), 0
+            oracle = dict.fromkeys(_ORACLE_COUNTERS, 0)  # slots analysed this run only
+            for sid, record, slot_oracle in results:
+                records[sid] = record
+                for k, v in slot_oracle.items():
+                    oracle[k] += v
+                _append_line(checkpoint, {"slot": sid, "record": record})
+                finished += 1
+                remaining = len(todo) - finished
+                eta = (time.monotonic() - started) / finished * remaining
+                progress(f"{len(records)}/{total} slots" + (f", ETA {_duration(eta)}" if remaining else ""),
+                         done=len(records), total=total, eta_s=round(eta))
+
+        slots = {str(sid): records[sid] for sid in sids}  # seed order, whatever finished first
         cache = {"seed": seed.seed_name, "version": seed.version_str, "slots": slots}
 
     sys.stdout = real_stdout
     with open(args.out, "w", encoding="utf-8") as fh:
         json.dump(cache, fh, indent=2)
+    os.remove(checkpoint_path)  # the cache now holds everything it had
 
     summary = {
         "seed": cache["seed"],
@@ -68,6 +247,8 @@ def main(argv=None) -> int:
         "verified": sum(1 for s in cache["slots"].values()
                         if s["requirements"].get("verified")),
         "unsupported": sum(1 for s in cache["slots"].values() if s["status"] != "ok"),
+        "oracle": {**oracle, "hit_rate": round(1 - oracle["calls"] / oracle["queries"], 3)
+                   if oracle["queries"] else 0.0},
         "out": os.path.abspath(args.out),
     }
     print(json.dumps(summary))
@@ -14,6 +14,11 @@ Decomposition (threshold-first):
        * or a one-off CHOICE ("one of {...}", incl count-N like 2x Aero).
   3. route clause   -- alternate win routes (OR of bundles), discovered on a residual oracle.
 
+Every step asks the oracle through one memo (`_Oracle`): each distinct selection is tried at
+most once, and because the oracle is monotone, a selection holding everything some known
+winner holds wins (and one inside a known loser loses) without a real `can_beat_game` call.
+`oracle_stats()` reports how many queries were answered each way.
+
 Node shapes (JSON-serialisable):
   {"type": "item",    "name": str, "count": int}
   {"type": "atleast", "n": int, "options": [ {name: count, ...}, ... ]}   # each option is a bundle
@@ -28,6 +33,17 @@ import random
 MAX_ROUTES = 12
 VERIFY_SAMPLES = 160
 MAX_GROUP_OPTIONS = 60
+MAX_ORACLE_BOUNDS = 256   # known winners / losers kept per side for dominance checks
+
+# Running totals over every discover() in this process: queries asked, answered from the memo
+# ("exact"), inferred from a known winner/loser ("dominated"), and real can_beat_game calls.
+_oracle_stats = {"queries": 0, "exact": 0, "dominated": 0, "calls": 0}
+
+
+def oracle_stats() -> dict:
+    """Oracle-memo counters since start-up (hit_rate = share of queries not run for real)."""
+    q = _oracle_stats["queries"]
+    return {**_oracle_stats, "hit_rate": round(1 - _oracle_stats["calls"] / q, 3) if q else 0.0}
 
 
 # --------------------------------------------------------------------------- evaluation
@@ -120,6 +136,63 @@ def _bundle_node(bundle: dict) -> dict:
     return items[0] if len(items) == 1 else {"type": "all", "children": items}
 
 
+# --------------------------------------------------------------------------- oracle
+class _Oracle:
+    """`wins(sel)` for one discover() run: collect `sel` onto the base state and ask
+    `can_beat`, memoised on the selection's count vector (one count per remaining item name,
+    clamped to what's available, so {} and {"X": 0} are the same query).
+
+    The oracle is monotone, so besides the exact memo it keeps the minimal winners and
+    maximal losers seen so far: a selection covering a winner wins, one covered by a loser
+    loses. Only selections neither side decides reach `can_beat`."""
+
+    def __init__(self, can_beat, base_state, by_name: dict):
+        self.can_beat = can_beat
+        self.base_state = base_state
+        self.by_name = by_name
+        self.names = sorted(by_name)
+        self.avail = tuple(len(by_name[n]) for n in self.names)
+        self.memo: dict[tuple, bool] = {}
+        self.winners: list[tuple] = []   # antichain: no entry covers another
+        self.losers: list[tuple] = []
+        self.stats = {"queries": 0, "exact": 0, "dominated": 0, "calls": 0}
+
+    def _count(self, kind: str) -> None:
+        self.stats[kind] += 1
+        _oracle_stats[kind] += 1
+
+    def __call__(self, sel: dict) -> bool:
+        key = tuple(min(sel.get(n, 0), a) for n, a in zip(self.names, self.avail))
+        self._count("queries")
+        won = self.memo.get(key)
+        if won is not None:
+            self._count("exact")
+            return won
+        if any(all(w <= k for w, k in zip(win, key)) for win in self.winners):
+            won = True
+        elif any(all(k <= l for k, l in zip(key, lose)) for lose in self.losers):
+            won = False
+        if won is not None:
+            self._count("dominated")
+        else:
+            self._count("calls")
+            state = self.base_state.copy()
+            for name, count in zip(self.names, key):
+                for it in self.by_name[name][:count]:
+                    state.collect(it, prevent_sweep=True)
+            won = bool(self.can_beat(state))
+            # Keep each side an antichain: the new vector replaces any it now dominates. The
+            # oldest are dropped past MAX_ORACLE_BOUNDS to keep the scan cheap.
+            if won:
+                self.winners = [w for w in self.winners
+                                if not all(k <= x for k, x in zip(key, w))][-MAX_ORACLE_BOUNDS + 1:] + [key]
+            else:
+                self.losers = [l for l in self.losers
+                               if not all(x <= k for k, x in zip(key, l))][-MAX_ORACLE_BOUNDS + 1:] + [key]
+        self.memo[key] = won
+        return won
+
+
 # --------------------------------------------------------------------------- discovery
 def discover(can_beat, base_state, remaining, item_groups=None, log=None) -> tuple[dict | None, bool]:
     rng = random.Random(0)
@@ -127,13 +200,7 @@ def discover(can_beat, base_state, remaining, item_groups=None, log=None) -> tup
     for it in remaining:
         by_name.setdefault(it.name, []).append(it)
     avail = {n: len(v) for n, v in by_name.items()}
-
-    def wins(sel: dict) -> bool:
-        state = base_state.copy()
-        for name, count in sel.items():
-            for it in by_name[name][:count]:
-                state.collect(it, prevent_sweep=True)
-        return can_beat(state)
+    wins = _Oracle(can_beat, base_state, by_name)
 
     if wins({}):
         return {"type": "all", "children": []}, True
@@ -206,14 +273,15 @@ def discover(can_beat, base_state, remaining, item_groups=None, log=None) -> tup
         tree = build(bundle)
         if _verify(tree, avail, wins, minimal, rng):
             if log:
-                log("bundle-threshold verified")
+                log(f"bundle-threshold verified; oracle {wins.stats}")
             return tree, True
 
     # Otherwise enumerate distinct routes.
     tree = build(_build_routes(fill, avail, wins, rng))
     verified = _verify(tree, avail, wins, minimal, rng)
     if log:
-        log(f"strict={len(strict)} choices={len(choice_clauses)} verified={verified}")
+        log(f"strict={len(strict)} choices={len(choice_clauses)} verified={verified}; "
+            f"oracle {wins.stats}")
     return tree, verified
 
 
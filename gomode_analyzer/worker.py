@@ -0,0 +1,87 @@
+"""Long-lived go-mode oracle: cli.py as a process that stays up.
+
+Importing Archipelago, loading every apworld and decoding the seed zip cost seconds, which a
+one-shot `cli.py` pays on every request. The worker pays them once at start-up, then answers
+requests read from stdin, one JSON object per line, with one JSON line each on stdout:
+
+  -> {"id": 1, "cmd": "ping"}
+  <- {"id": 1, "ok": true, "result": {"seed": ..., "version": ..., "requests": 0, "world_cache": {...}, "oracle": {...}}}
+  -> {"id": 2, "cmd": "go_mode_batch", "slots": {"Alex_Crab": {"Katana": 1}}}
+  <- {"id": 2, "ok": true, "result": {"go_mode": {"Alex_Crab": {status, in_go_mode, reason}}}}
+  -> {"id": 3, "cmd": "analyze", "slot": "Alex_Crab", "inventory": {"Katana": 1}}
+  <- {"id": 3, "ok": true, "result": {... what `cli.py --slot` prints ...}}
+
+A failed request answers {"id": .., "ok": false, "error": "..."} and the worker carries on.
+Once the seed is loaded it prints {"ready": true, "seed": ..., "version": ...}. Everything AP
+prints goes to stderr, so stdout only ever carries protocol lines. It exits when stdin closes.
+
+Built worlds are kept between requests (engine's world cache), so a repeated check of the same
+slot skips the logic build; `ping` reports the cache's hit / eviction counters, and the
+requirement discovery's oracle-memo counters.
+
+  python worker.py --ap-path <AP> --seed-zip TEST-SEED.zip
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+import cli
+
+
+def _handle(seed, request: dict, served: int) -> dict:
+    import engine
+    import requirements
+
+    cmd = request.get("cmd")
+    if cmd == "ping":
+        return {"seed": seed.seed_name, "version": seed.version_str, "requests": served,
+                "world_cache": engine.world_cache_stats(), "oracle": requirements.oracle_stats()}
+    if cmd == "go_mode_batch":
+        return cli.go_mode_batch(seed, request.get("slots") or {}, use_cache=True)
+    if cmd == "analyze":
+        output, _ = cli.analyze_one(seed, str(request.get("slot")), request.get("inventory") or {},
+                                    use_cache=True)
+        return output
+    raise ValueError(f"unknown command {cmd!r}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Persistent go-mode oracle (JSON lines on stdin/stdout)")
+    parser.add_argument("--ap-path", required=True, help="Path to the version-matched AP source tree")
+    parser.add_argument("--seed-zip", required=True, help="Path to the generated AP_<seed>.zip")
+    args = parser.parse_args(argv)
+
+    # Keep the real stdout for the protocol; AP's chatter goes to stderr for good (the bot
+    # drains it and keeps the tail for error messages).
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    def reply(message: dict) -> None:
+        protocol.write(json.dumps(message) + "\n")
+        protocol.flush()
+
+    cli._bootstrap(args.ap_path)
+    import seed_data
+
+    seed = seed_data.load_seed(args.seed_zip)
+    reply({"ready": True, "seed": seed.seed_name, "version": seed.version_str})
+
+    served = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            reply({"id": request_id, "ok": True, "result": _handle(seed, request, served)})
+        except Exception as exc:  # noqa: BLE001 -- one bad request must not take the worker down
+            reply({"id": request_id, "ok": False, "error": f"{type(exc).__name__}: {exc}"})
+        served += 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
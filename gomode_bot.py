@@ -6,6 +6,8 @@ apworld is code execution). This module just:
 
   * provisions a version-pinned AP env for a registered seed (`gomode_analyzer/provision.py`),
   * precomputes every slot's go-mode requirements once (`gomode_analyzer/precompute.py`),
+  * keeps one oracle worker (`gomode_analyzer/worker.py`) running for the registered seed,
+    so live checks don't re-import AP and re-load the seed per request,
   * manages the small JSON registry the player-facing commands + notification loop read.
 
 Large, static apworlds are NOT uploaded through Discord -- the host places them on the bot
@@ -19,7 +21,11 @@ import datetime
 import json
 import os
 import sys
-import tempfile
+import time
+from collections import deque
+
+import state_service
+import state_store
 
 ANALYZER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gomode_analyzer")
 
@@ -37,6 +43,17 @@ AP_REPO = os.getenv("GOMODE_AP_REPO")
 # Where provisioned AP trees + the precomputed seed cache live.
 RUNTIME_DIR = os.getenv("GOMODE_RUNTIME_DIR", os.path.join(ANALYZER_DIR, "runtime"))
 
+# Worker processes the precompute analyses slots in (0 = one per CPU core).
+PRECOMPUTE_JOBS = int(os.getenv("GOMODE_PRECOMPUTE_JOBS", "0"))
+# The oracle worker: how long one request may take (a full analysis of a big world can take
+# minutes), and how long loading AP + the seed may take at start-up.
+ORACLE_TIMEOUT = float(os.getenv("GOMODE_ORACLE_TIMEOUT", "300"))
+ORACLE_START_TIMEOUT = float(os.getenv("GOMODE_ORACLE_START_TIMEOUT", "600"))
+ORACLE_PING_TIMEOUT = 10
+# Seconds between precompute progress updates passed on to register_seed's `progress`.
+PROGRESS_INTERVAL = 15
+ORACLE_HEALTH_INTERVAL = 60   # a worker idle longer than this is pinged before it is trusted
+
 DATA_DIR = "data"
 REGISTRY_PATH = os.path.join(DATA_DIR, "registered_seed.json")
 CACHE_PATH = os.path.join(RUNTIME_DIR, "seed_cache.json")
@@ -65,6 +82,25 @@ async def _run(cmd: list[str]) -> tuple[int, str, str]:
     return proc.returncode, out.decode("utf-8", "replace"), err.decode("utf-8", "replace")
 
 
+async def _run_streaming(cmd: list[str], on_line) -> tuple[int, str, str]:
+    """Like _run, but awaits `on_line(line)` for each stdout line as it is printed."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        limit=64 * 1024 * 1024)
+    err_task = asyncio.create_task(proc.stderr.read())
+    lines = []
+    while True:
+        raw = await proc.stdout.readline()
+        if not raw:
+            break
+        line = raw.decode("utf-8", "replace")
+        lines.append(line)
+        await on_line(line)
+    await proc.wait()
+    err = await err_task
+    return proc.returncode, "".join(lines), err.decode("utf-8", "replace")
+
+
 def _quiet_remove(path: str) -> None:
     try:
         os.remove(path)
@@ -110,10 +146,33 @@ async def register_seed(seed_zip: str, *, progress=None) -> dict:
     #    the AP env, so use the configured AP interpreter. Write to a TEMP cache and only
     #    swap it into place once the run is known-good, so a failed re-registration can't
     #    truncate the live cache and silently break the previously-registered seed.
+    #    Precompute checkpoints every slot next to the temp cache; --resume picks a failed or
+    #    interrupted run of the same seed up where it stopped.
     tmp_cache = CACHE_PATH + ".tmp"
     cmd = [AP_PYTHON, os.path.join(ANALYZER_DIR, "precompute.py"),
-           "--ap-path", ap_path, "--seed-zip", seed_zip, "--out", tmp_cache]
-    rc, out, err = await _run(cmd)
+           "--ap-path", ap_path, "--seed-zip", seed_zip, "--out", tmp_cache,
+           "--jobs", str(PRECOMPUTE_JOBS), "--resume"]
+    last_progress = 0.0
+
+    async def on_line(line: str) -> None:
+        # Progress lines ({"progress": "37/112 slots, ETA 4m", "done", "total"}) are passed on,
+        # at most one per PROGRESS_INTERVAL (plus the last one) to keep Discord edits down.
+        nonlocal last_progress
+        try:
+            update = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(update, dict) or "progress" not in update:
+            return
+        now = time.monotonic()
+        if now - last_progress >= PROGRESS_INTERVAL or update.get("done") == update.get("total"):
+            last_progress = now
+            try:
+                await say(f"Analyzing go-mode requirements: {update['progress']}")
+            except Exception as exc:  # a failed status edit must not stop reading the output
+                print(f"[gomode] progress update failed: {exc}")
+
+    rc, out, err = await _run_streaming(cmd, on_line)
     if rc != 0:
         _quiet_remove(tmp_cache)
         raise RuntimeError(f"Precompute failed:\n{(err or out)[-1500:]}")
@@ -140,6 +199,12 @@ async def register_seed(seed_zip: str, *, progress=None) -> dict:
     with open(tmp_reg, "w", encoding="utf-8") as fh:
         json.dump(registry, fh, indent=2)
     os.replace(tmp_reg, REGISTRY_PATH)
+    oracle.expect(registry["ap_path"], registry["seed_zip"])  # no await since the registry write
+
+    # 4. Replace any worker still holding the previous seed with one for this seed, in the
+    #    background: loading AP + the seed takes a while and the summary can go out first.
+    global _oracle_task
+    _oracle_task = asyncio.create_task(start_oracle(replace=True))
     return registry
 
 
@@ -174,45 +239,21 @@ def slot_for_name(cache: dict, slot_name: str) -> dict | None:
 
 # --- player-facing: go-mode status + on-demand analysis ---------------------
 
-def _load_items_received() -> dict:
-    try:
-        with open(os.path.join(DATA_DIR, "items_received.json"), encoding="utf-8") as fh:
-            return json.load(fh)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-
-def inventory_for_slot(items_received: dict, slot_name: str) -> dict:
-    """Aggregate {item_name: total_count} for a slot from items_received.json, whose shape is
-    {slot_num: {slot_name: {"Items": {key: {item_name, amount}}}}}."""
-    for slot_entry in (items_received or {}).values():
-        if slot_name in slot_entry:
-            inv: dict = {}
-            for info in slot_entry[slot_name].get("Items", {}).values():
-                name = info.get("item_name")
-                if not name:
-                    continue
-                try:
-                    amt = int(info.get("amount", 0))
-                except (TypeError, ValueError):
-                    amt = 0
-                inv[name] = inv.get(name, 0) + amt
-            return inv
-    return {}
+def inventory_for_slot(slot_name: str) -> dict:
+    """Aggregate {item_name: total_count} the web tracker reports for a slot."""
+    return dict(state_service.snapshot().inventory(slot_name))
 
 
 def current_inventory(slot_name: str) -> dict:
-    """The slot's current {item_name: count} from items_received.json on disk."""
-    return inventory_for_slot(_load_items_received(), slot_name)
+    """The slot's current {item_name: count} from the slot index."""
+    return inventory_for_slot(slot_name)
 
 
-def _tracker_game_for_slot(items_received: dict, slot_name: str):
+def _tracker_game_for_slot(slot_name: str):
     """The game the live tracker reports for a slot name (used to catch a registered seed that
     doesn't match what's being tracked)."""
-    for slot_entry in (items_received or {}).values():
-        if slot_name in slot_entry:
-            return slot_entry[slot_name].get("Game Name")
-    return None
+    record = state_service.snapshot().slot(slot_name)
+    return record.game if record else None
 
 
 _req_mod = None
@@ -229,39 +270,197 @@ def _satisfies(tree: dict, held: dict) -> bool:
     return _req_mod.satisfies(tree, held)
 
 
+# --- the oracle worker --------------------------------------------------------
+
+class _WorkerDied(Exception):
+    pass
+
+
+class OracleWorker:
+    """One `worker.py` process (in the AP env) for the registered seed, spoken to in JSON
+    lines. Requests are serialized (the worker is single-threaded). A worker that exited, or
+    that fails a health check after sitting idle, is restarted; one that blows the request
+    timeout is killed, and the next request starts a fresh one."""
+
+    def __init__(self):
+        self.proc = None
+        self.key = None             # (ap_path, seed_zip) the running worker was started for
+        self.seed = None            # (ap_path, seed_zip) of the registered seed once expect()
+                                    #   named it: requests for any other seed are refused
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+        self._last_ok = 0.0
+        self._stderr = deque(maxlen=40)
+        self._stderr_task = None
+
+    def _alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    def _stderr_tail(self) -> str:
+        return "\n".join(self._stderr)[-1500:]
+
+    async def _drain_stderr(self, proc) -> None:
+        # AP's chatter goes to the worker's stderr; it must be read or the pipe fills and the
+        # worker blocks. Only the tail is kept, for error messages.
+        while True:
+            line = await proc.stderr.readline()
+            if not line:
+                return
+            self._stderr.append(line.decode("utf-8", "replace").rstrip())
+
+    async def _start(self, ap_path: str, seed_zip: str) -> None:
+        self._stderr.clear()
+        self.proc = await asyncio.create_subprocess_exec(
+            AP_PYTHON, os.path.join(ANALYZER_DIR, "worker.py"),
+            "--ap-path", ap_path, "--seed-zip", seed_zip,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE, limit=64 * 1024 * 1024)
+        self.key = (ap_path, seed_zip)
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self.proc))
+        started = time.monotonic()
+        try:
+            line = await asyncio.wait_for(self.proc.stdout.readline(), ORACLE_START_TIMEOUT)
+            ready = json.loads(line) if line else {}
+        except (asyncio.TimeoutError, ValueError):
+            ready = {}
+        if not ready.get("ready"):
+            await self.stop()
+            raise RuntimeError(f"The go-mode oracle failed to start:\n{self._stderr_tail()}")
+        self._last_ok = time.monotonic()
+        print(f"[oracle] worker ready for seed {ready.get('seed')} "
+              f"in {self._last_ok - started:.1f}s (pid {self.proc.pid})")
+
+    async def stop(self) -> None:
+        proc, self.proc, self.key = self.proc, None, None
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        if self._stderr_task is not None:
+            self._stderr_task.cancel()
+            self._stderr_task = None
+
+    async def _exchange(self, request: dict, timeout: float) -> dict:
+        self._next_id += 1
+        request = {"id": self._next_id, **request}
+        try:
+            self.proc.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise _WorkerDied(f"worker stdin closed ({exc})")
+        line = await asyncio.wait_for(self.proc.stdout.readline(), timeout)
+        if not line:
+            raise _WorkerDied(f"worker exited:\n{self._stderr_tail()}")
+        response = json.loads(line)
+        if response.get("id") != request["id"]:
+            raise _WorkerDied(f"worker answered request {response.get('id')}, expected {request['id']}")
+        self._last_ok = time.monotonic()
+        return response
+
+    async def _ensure(self, ap_path: str, seed_zip: str) -> None:
+        if self._alive() and self.key == (ap_path, seed_zip):
+            if time.monotonic() - self._last_ok < ORACLE_HEALTH_INTERVAL:
+                return
+            try:
+                await self._exchange({"cmd": "ping"}, ORACLE_PING_TIMEOUT)
+                return
+            except (asyncio.TimeoutError, ValueError, _WorkerDied) as exc:
+                print(f"[oracle] health check failed, restarting the worker: {exc}")
+        await self.stop()
+        await self._start(ap_path, seed_zip)
+
+    async def request(self, ap_path: str, seed_zip: str, cmd: str, **fields):
+        """Send one request; returns its result. Raises RuntimeError if the worker can't be
+        started, times out, keeps dying, or reports the request failed."""
+        async with self._lock:
+            self._check_seed(ap_path, seed_zip)
+            died = None
+            for _ in range(2):  # a worker that died mid-request is restarted and asked once more
+                await self._ensure(ap_path, seed_zip)
+                try:
+                    response = await self._exchange({"cmd": cmd, **fields}, ORACLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    await self.stop()
+                    raise RuntimeError(f"The go-mode oracle did not answer within {ORACLE_TIMEOUT:.0f}s.")
+                except (ValueError, _WorkerDied) as exc:
+                    await self.stop()
+                    died = exc
+                    continue
+                if not response.get("ok"):
+                    raise RuntimeError(response.get("error") or "the oracle request failed")
+                return response.get("result")
+            raise RuntimeError(f"The go-mode oracle worker keeps exiting: {died}")
+
+    def _check_seed(self, ap_path: str, seed_zip: str) -> None:
+        # A request that was waiting on the lock while a new seed was registered must not
+        # bring a worker for the old seed back up.
+        if self.seed is not None and self.seed != (ap_path, seed_zip):
+            raise RuntimeError("A new seed was registered while this check was waiting; try again.")
+
+    async def warm(self, ap_path: str, seed_zip: str) -> None:
+        """Start (or health-check) the worker ahead of the first request."""
+        async with self._lock:
+            self._check_seed(ap_path, seed_zip)
+            await self._ensure(ap_path, seed_zip)
+
+    def expect(self, ap_path: str, seed_zip: str) -> None:
+        """Name the seed the worker serves from now on. Called in the same step as the registry
+        write, so a request that read the new registry is never refused, and one still holding
+        the previous seed always is."""
+        self.seed = (ap_path, seed_zip)
+
+    async def replace(self, ap_path: str, seed_zip: str) -> None:
+        """Swap the worker for one on a newly registered seed. Done under the request lock, so
+        an exchange already in flight finishes before its worker is killed."""
+        async with self._lock:
+            self.expect(ap_path, seed_zip)
+            await self.stop()
+            await self._start(ap_path, seed_zip)
+
+
+oracle = OracleWorker()
+_oracle_task = None  # the background (re)start register_seed kicked off; kept so it isn't collected
+
+
+async def start_oracle(replace: bool = False) -> None:
+    """Bring the oracle worker up for the registered seed (if any), so the first go-mode check
+    doesn't wait for AP to load; `replace` swaps out a worker for a previous seed. Failures are
+    logged; requests retry the start anyway."""
+    reg = load_registry()
+    if not reg or not is_configured()[0]:
+        return
+    try:
+        if replace:
+            await oracle.replace(reg["ap_path"], reg["seed_zip"])
+        else:
+            await oracle.warm(reg["ap_path"], reg["seed_zip"])
+    except Exception as exc:
+        print(f"[oracle] could not start the worker: {exc}")
+
+
 async def _oracle_go_mode(ap_path: str, seed_zip: str, slot_inv_map: dict) -> dict:
-    """One fast-path subprocess returning {slot: {status, in_go_mode}} for several slots at once
-    (used for fallback slots, which have no verified tree to evaluate in-process)."""
-    os.makedirs(RUNTIME_DIR, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(suffix=".json", dir=RUNTIME_DIR, prefix="gomode_batch_")
+    """One fast-path oracle request returning {slot: {status, in_go_mode}} for several slots at
+    once (used for fallback slots, which have no verified tree to evaluate in-process)."""
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as fh:
-            json.dump(slot_inv_map, fh)
-        cmd = [AP_PYTHON, os.path.join(ANALYZER_DIR, "cli.py"),
-               "--ap-path", ap_path, "--seed-zip", seed_zip, "--go-mode-batch", "@" + tmp]
-        rc, out, err = await _run(cmd)
-        if rc != 0:
-            return {}
-        try:
-            return json.loads(out).get("go_mode", {})
-        except ValueError:
-            return {}
-    finally:
-        _quiet_remove(tmp)
+        result = await oracle.request(ap_path, seed_zip, "go_mode_batch", slots=slot_inv_map)
+    except RuntimeError as exc:
+        print(f"[oracle] go-mode batch failed: {exc}")
+        return {}
+    return (result or {}).get("go_mode", {})
 
 
-async def go_mode_status(slot_names, *, items_received: dict | None = None) -> dict:
+async def go_mode_status(slot_names, *, inventories: dict | None = None) -> dict:
     """For each assigned slot name, return {status, in_go_mode, kind, game, reason?}.
 
     Verified slots are evaluated instantly in pure Python (satisfies on the cached tree);
     fallback slots share ONE fast oracle subprocess; unsupported/unregistered slots are
-    reported as such (in_go_mode = None).
+    reported as such (in_go_mode = None). `inventories` ({slot_name: {item: count}}) lets a
+    caller that already read the inventories pass them in; missing ones are read here.
     """
     cache, reg = load_cache(), load_registry()
     if not cache or not reg:
         return {name: {"status": "unregistered", "in_go_mode": None} for name in slot_names}
-    if items_received is None:
-        items_received = _load_items_received()
+    if inventories is None:
+        inventories = {}
 
     result: dict = {}
     fallback_batch: dict = {}
@@ -278,13 +477,13 @@ async def go_mode_status(slot_names, *, items_received: dict | None = None) -> d
         # Defensive: if the live tracker reports a DIFFERENT game for this slot name than the
         # registered seed, they're different multiworlds -- don't evaluate go-mode on foreign
         # inventory (a same-name/different-game collision could otherwise misfire).
-        tracker_game = _tracker_game_for_slot(items_received, name)
+        tracker_game = _tracker_game_for_slot(name)
         if tracker_game and game and tracker_game.lower() != str(game).lower():
             result[name] = {"status": "tracker_mismatch", "in_go_mode": None, "game": game,
                             "tracker_game": tracker_game}
             continue
 
-        inv = inventory_for_slot(items_received, name)
+        inv = inventories[name] if name in inventories else inventory_for_slot(name)
         req = rec.get("requirements", {})
         if req.get("verified") and req.get("tree"):
             try:
@@ -308,49 +507,26 @@ async def go_mode_status(slot_names, *, items_received: dict | None = None) -> d
 
 
 async def analyze_slot_live(slot_name: str, inventory: dict) -> dict | None:
-    """Full on-demand analysis of one slot for the player's current inventory (a subprocess in
-    the AP env). Returns cli.py's result dict (incl. `requirements_text`), or None if no seed
-    is registered."""
+    """Full on-demand analysis of one slot for the player's current inventory (by the oracle
+    worker in the AP env). Returns cli.py's result dict (incl. `requirements_text`), or None if
+    no seed is registered."""
     reg = load_registry()
     if not reg:
         return None
-    os.makedirs(RUNTIME_DIR, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(suffix=".json", dir=RUNTIME_DIR, prefix="gomode_inv_")
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as fh:
-            json.dump(inventory, fh)
-        cmd = [AP_PYTHON, os.path.join(ANALYZER_DIR, "cli.py"),
-               "--ap-path", reg["ap_path"], "--seed-zip", reg["seed_zip"],
-               "--slot", slot_name, "--inventory", "@" + tmp]
-        rc, out, err = await _run(cmd)
-        try:
-            return json.loads(out)
-        except ValueError:
-            return {"status": "error", "reason": (err or out)[-500:]}
-    finally:
-        _quiet_remove(tmp)
+        return await oracle.request(reg["ap_path"], reg["seed_zip"], "analyze",
+                                    slot=slot_name, inventory=inventory)
+    except RuntimeError as exc:
+        return {"status": "error", "reason": str(exc)[-500:]}
 
 
 # --- go-mode notification dedup state (per registered seed) ------------------
 
-NOTIFIED_PATH = os.path.join(DATA_DIR, "go_mode_notified.json")
-
-
 def load_notified(current_seed: str) -> set:
     """Slot names already DM'd for the CURRENT seed. Auto-resets when the seed changes."""
-    try:
-        with open(NOTIFIED_PATH, encoding="utf-8") as fh:
-            data = json.load(fh)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return set()
-    if data.get("seed") != current_seed:
-        return set()
-    return set(data.get("notified", []))
+    return state_store.load_notified(current_seed)
 
 
 def save_notified(current_seed: str, notified) -> None:
-    os.makedirs(DATA_DIR, exist_ok=True)
-    tmp = NOTIFIED_PATH + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as fh:
-        json.dump({"seed": current_seed, "notified": sorted(notified)}, fh, indent=2)
-    os.replace(tmp, NOTIFIED_PATH)
+    """Record delivered notifications for the current seed (drops any older seed's)."""
+    state_store.add_notified(current_seed, notified)
@@ -9,10 +9,11 @@ import os
 import datetime
 import fnmatch
 import ap_connector
-import json
 import traceback
 import tracker_download
 import gomode_bot
+import state_service
+import search_index
 
 dotenv.load_dotenv()
 discord_token = os.getenv("DISCORD_TOKEN")
@@ -40,9 +41,20 @@ def is_owner(ctx) -> bool:
     guild = getattr(ctx, "guild", None)
     return bool(guild and ctx.author.id == guild.owner_id)
 
+class Bot(commands.Bot):
+    async def close(self):
+        # State writes are buffered for up to STATE_FLUSH_DELAY seconds; write them out
+        # before going down (bot.run() calls this on Ctrl-C / SIGTERM too).
+        try:
+            await state_service.flush()
+        except Exception as e:
+            print(f"[state] could not flush state on shutdown: {e}")
+        await super().close()
+
+
 # This enables users to interact with our bot as soon as it connects to the server.
 intents = discord.Intents.default()
-bot = commands.Bot(command_prefix='/', intents=intents)
+bot = Bot(command_prefix='/', intents=intents)
 bot.auto_sync_commands = True
 
 
@@ -56,14 +68,17 @@ async def on_connect():
     # on_connect fires on EVERY gateway (re)connect; start the background loops exactly once.
     # Otherwise each reconnect spawns another copy of each loop -> duplicate DMs / channel
     # posts, overlapping tracker scrapes piling up on the thread pool, and racing writes to
-    # the JSON data files.
+    # the state store.
     global background_tasks_started
     if background_tasks_started:
         return
     background_tasks_started = True
 
-    print("Starting user item tracker loop.")
-    bot.loop.create_task(check_tracked_items_loop())
+    # Load the in-memory state (the first store open imports any legacy data/*.json files) and
+    # start its writer task before any loop or command reads a snapshot.
+    await state_service.start()
+    # Load AP + the registered seed (if any) into the go-mode oracle worker in the background.
+    bot.loop.create_task(gomode_bot.start_oracle())
 
     print("Starting system item tracker loop.")
     channel = bot.get_channel(int(discord_channel_id))
@@ -103,34 +118,8 @@ async def on_application_command_error(ctx, error):
     traceback.print_exception(type(error), error, error.__traceback__)
 
 
-# data_package.json is large (~1.5 MB) and the two autocompletes below fire on every
-# keystroke, so parse it at most once per change (cached by mtime) instead of re-reading +
-# re-parsing on the event loop each time. Returns the last good value on a read/parse error
-# (e.g. the file being mid-rewrite by ap_connector), so a keystroke can never crash the
-# autocomplete on a partial file.
-_data_package_cache = {"mtime": None, "data": []}
-
-
-def _load_data_package():
-    path = os.path.join("data", "data_package.json")
-    try:
-        mtime = os.path.getmtime(path)
-    except OSError:
-        return _data_package_cache["data"]
-    if _data_package_cache["mtime"] != mtime:
-        try:
-            with open(path, "r") as f:
-                _data_package_cache["data"] = json.load(f)
-            _data_package_cache["mtime"] = mtime
-        except (OSError, json.JSONDecodeError):
-            return _data_package_cache["data"]  # keep serving the last good parse
-    return _data_package_cache["data"]
-
-
 async def game_name_autocomplete(ctx: discord.AutocompleteContext):
-    data_package = _load_data_package()
-    game_names = [entry.get("game") for entry in data_package if entry.get("game")]
-    return [game_name for game_name in sorted(game_names) if game_name.lower().startswith(ctx.value.lower())]
+    return search_index.game_index().prefix(ctx.value)
 
 
 async def items_autocomplete(ctx: discord.AutocompleteContext):
@@ -138,105 +127,42 @@ async def items_autocomplete(ctx: discord.AutocompleteContext):
     if not selected_game:
         return []  # No game selected yet, so no suggestions.
 
-    # Find the game data matching the selected game.
-    game_data = None
-    for entry in _load_data_package():
-        if entry.get("game", "") == selected_game:
-            game_data = entry
-            break
-
-    if not game_data:
-        return []  # No matching game found.
-
-    # Get the list of item names from the game data
-    item_names = sorted(list(game_data.get("item_name_to_id", {}).keys()))
-    return [name for name in item_names if name.lower().startswith(ctx.value.lower())]
+    # Ranked prefix / word / substring matches over the game's item names, indexed once per
+    # data-package change (empty if it has none).
+    return search_index.item_index(selected_game).search(ctx.value)
 
 
 async def slot_name_autocomplete(ctx: discord.AutocompleteContext):
-
-    os.makedirs("data", exist_ok=True)
-    slot_info_json = os.path.join("data", "slot_info.json")
-    with open(slot_info_json, "r") as f:
-        slot_info = json.load(f)
-    slot_names = sorted([info.get("slot_name") for info in slot_info.values()])
-    return [name for name in slot_names if name.lower().startswith(ctx.value.lower())]
+    return search_index.slot_index(state_service.snapshot()).prefix(ctx.value)
 
 
 async def slot_name_for_assigned_slot_autocomplete(ctx: discord.AutocompleteContext):
     author_id = str(ctx.interaction.user.id)
-    os.makedirs("data", exist_ok=True)
-    listeners_file_json = os.path.join("data", "listeners.json")
-    with open(listeners_file_json, "r") as f:
-        try:
-            listeners_data = json.load(f)
-        except json.JSONDecodeError:
-            listeners_data = {}
-
-    if author_id not in listeners_data:
-        return []  # No assignments for this user
-
-    assignments = listeners_data[author_id]
-    slot_names = sorted([assignment.get("slot_name") for assignment in assignments])
-    return [name for name in slot_names if name.lower().startswith(ctx.value.lower())]
+    return search_index.user_slot_index(state_service.snapshot(), author_id).prefix(ctx.value)
 
 
 async def slot_name_for_game_autocomplete(ctx: discord.AutocompleteContext):
     game_name = ctx.options.get("game_name")
-
-    os.makedirs("data", exist_ok=True)
-    slot_info_json = os.path.join("data", "slot_info.json")
-    with open(slot_info_json, "r") as f:
-        slot_info = json.load(f)
-
-    slot_names = [info.get("slot_name") for info in slot_info.values() if info.get("game") == game_name]
-    return [name for name in slot_names if name.startswith(ctx.value)]
+    return search_index.game_slot_index(state_service.snapshot(), game_name).prefix(ctx.value)
 
 
 async def slot_name_for_assigned_game_autocomplete(ctx: discord.AutocompleteContext):
-    # Get the user's ID
+    # Only the user's own slots for the game picked in the command's game_name option
+    # (case-insensitive); the options must be declared on the slash command.
     author_id = str(ctx.interaction.user.id)
-    # Ensure the data directory exists
-    os.makedirs("data", exist_ok=True)
-    listeners_file_json = os.path.join("data", "listeners.json")
-
-    # Load the listeners file
-    try:
-        with open(listeners_file_json, "r") as f:
-            listeners_data = json.load(f)
-    except json.JSONDecodeError:
-        listeners_data = {}
-
-    # If the user has no assignments, return an empty list
-    if author_id not in listeners_data:
-        return []
-
-    # Get all assignments for the user
-    assignments = listeners_data[author_id]
-    # Get the game name from the command options; it must be provided on your slash command.
-    game_name = ctx.options.get("game_name")
-
-    # Filter assignments to only those matching the specified game (case-insensitive)
-    filtered_assignments = [
-        assignment for assignment in assignments
-        if assignment.get("game", "").lower() == game_name.lower()
-    ]
-
-    # Extract slot names from the filtered assignments (ignoring missing names)
-    slot_names = sorted([assignment.get("slot_name") for assignment in filtered_assignments if assignment.get("slot_name")])
-
-    # Filter suggestions based on the current autocomplete input (case-insensitive prefix match)
-    current_input = ctx.value or ""
-    suggestions = [name for name in slot_names if name.lower().startswith(current_input.lower())]
-    return suggestions
+    game_name = ctx.options.get("game_name") or ""
+    return search_index.user_slot_index(state_service.snapshot(), author_id, game_name).prefix(ctx.value)
 
 
 @bot.slash_command(description="Enter the server address, the bot's slot name, and the password to connect to a server.")
 @option("server_address", description="Enter the server address and port.", required = True)
 @option("slot_name", description="Enter the bot's slot name.", required = True)
 @option("password", description="Enter the server password.", required = False)
-async def get_server_data(ctx, server_address: str, slot_name: str, password: str = None):
+@option("live", description="Stay connected and announce items as they are sent, instead of polling the tracker.", required = False)
+async def get_server_data(ctx, server_address: str, slot_name: str, password: str = None, live: bool = False):
     initial_response = await ctx.respond("Connecting to server...")
+    ap_connector.on_live_items = _on_live_items
+    ap_connector.on_live_connected = _on_live_connected
 
     # ap_connector.main runs the websocket session, which stays open while connected.
     # Launch it in the background instead of awaiting it here -- awaiting would block
@@ -244,7 +170,7 @@ async def get_server_data(ctx, server_address: str, slot_name: str, password: st
     # report "Connected to the server" or any error.
     async def run_connection():
         try:
-            await ap_connector.main(initial_response, server_address, slot_name, password)
+            await ap_connector.main(initial_response, server_address, slot_name, password, live=live)
         except Exception as e:
             try:
                 await initial_response.edit_original_response(content=f"Failed to connect: {e}")
@@ -335,14 +261,6 @@ async def register_seed(ctx, seed_file: discord.Attachment = None, server_path:
     bot.loop.create_task(run())
 
 
-def _load_listeners() -> dict:
-    try:
-        with open(os.path.join("data", "listeners.json"), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-
 def _go_mode_overview_line(name: str, st: dict) -> str:
     game = st.get("game") or ""
     tag = f" ({game})" if game else ""
@@ -420,7 +338,7 @@ async def items_to_go_mode(ctx, slot_name: str = None):
         return
 
     author_id = str(ctx.author.id)
-    assignments = _load_listeners().get(author_id, [])
+    assignments = state_service.snapshot().assignments_for(author_id)
     my_slots = [a.get("slot_name") for a in assignments if a.get("slot_name")]
     if not my_slots:
         await initial_response.edit_original_response(
@@ -471,12 +389,8 @@ async def assign_slot(ctx, slot_name: str):
 
     pattern = slot_name.strip()
 
-    os.makedirs("data", exist_ok=True)
-    slot_info_json = os.path.join("data", "slot_info.json")
-    try:
-        with open(slot_info_json, "r") as f:
-            slot_info = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    slot_info = state_service.snapshot().slot_info
+    if not slot_info:
         await initial_response.edit_original_response(
             content="No server data found yet. Run /get_server_data first."
         )
@@ -505,43 +419,13 @@ async def assign_slot(ctx, slot_name: str):
 
     author_id = str(ctx.author.id)
 
-    listeners_file_json = os.path.join("data", "listeners.json")
-
-    # Load existing listeners data or initialize an empty dictionary
-    if os.path.exists(listeners_file_json):
-        with open(listeners_file_json, "r") as f:
-            try:
-                listeners_data = json.load(f)
-            except json.JSONDecodeError:
-                listeners_data = {}
-    else:
-        listeners_data = {}
-
-    # Each author maps to a list of assignment dictionaries.
-    assignments = listeners_data.setdefault(author_id, [])
-    existing_names = {a.get("slot_name", "").lower() for a in assignments}
-
-    newly_assigned = []
-    skipped = []
-    for slot_number, info in matched_slots:
-        name = info.get("slot_name")
-        game_name = info.get("game", "Unknown")
-        if name.lower() in existing_names:
-            skipped.append(name)
-            continue
-        assignments.append({
-            "slot_number": slot_number,
-            "slot_name": name,
-            "game": game_name,
-            "items": [],  # list to hold the items the user is tracking
-            "tracked_items": []
-        })
-        existing_names.add(name.lower())
-        newly_assigned.append(name)
-
-    # Save the updated listeners data back to listeners.json
-    with open(listeners_file_json, "w") as outfile:
-        json.dump(listeners_data, outfile, indent=4)
+    # The state writer skips slots the author already holds (case-insensitive) and reports
+    # which ones it actually added.
+    newly_assigned = await state_service.add_assignments(author_id, [
+        (slot_number, info.get("slot_name"), info.get("game", "Unknown")) for slot_number, info in matched_slots
+    ])
+    added = set(newly_assigned)
+    skipped = [info.get("slot_name") for _, info in matched_slots if info.get("slot_name") not in added]
 
     # Build a result message.
     lines = []
@@ -606,66 +490,24 @@ async def get_items_for_slot(ctx, slot_name: str):
 
 @bot.slash_command(description="Get a DM with only the new items received for your assigned games.")
 async def get_all_new_items(ctx):
-    listeners_file = os.path.join("data", "listeners.json")
-    items_received_file = os.path.join("data", "items_received.json")
-
-    # Load listeners data.
-    if not os.path.exists(listeners_file):
-        await ctx.respond("You have no assignments.", ephemeral=True)
-        return
-    with open(listeners_file, "r") as f:
-        try:
-            listeners_data = json.load(f)
-        except json.JSONDecodeError:
-            await ctx.respond("Error reading listeners file.", ephemeral=True)
-            return
-
     author_id = str(ctx.author.id)
-    if author_id not in listeners_data:
+    snap = state_service.snapshot()
+    assignments = snap.assignments_for(author_id)
+    if not assignments:
         await ctx.respond("You have no assignments.", ephemeral=True)
         return
 
-    # Load items_received data.
-    if not os.path.exists(items_received_file):
-        await ctx.respond("No items received data available.", ephemeral=True)
-        return
-    with open(items_received_file, "r") as f:
-        try:
-            items_received = json.load(f)
-        except json.JSONDecodeError:
-            await ctx.respond("Error reading items received file.", ephemeral=True)
-            return
-
     diff_message_lines = []
-    updated = False
-    assignments = listeners_data[author_id]
 
     for assignment in assignments:
         slot_name = assignment.get("slot_name", "Unknown")
-        # Locate the corresponding slot data in items_received.
-        slot_data = None
-        for slot_num, slot_entry in items_received.items():
-            if slot_name in slot_entry:
-                slot_data = slot_entry[slot_name]
-                break
-        if slot_data is None:
+        # Aggregated totals the tracker reports for the slot (empty if it isn't on the tracker yet).
+        agg_new = snap.inventory(slot_name)
+        if not agg_new:
             continue
 
-        items_dict = slot_data.get("Items", {})
-        agg_new = {}
-        if isinstance(items_dict, dict):
-            for key, item_info in items_dict.items():
-                name = item_info.get("item_name", "Unknown")
-                try:
-                    count = int(item_info.get("amount", 0))
-                except Exception:
-                    count = 0
-                agg_new[name] = agg_new.get(name, 0) + count
-
-        # "seen" items are stored under the "items" key in the assignment.
-        seen_items = assignment.get("items", {})
-        if not isinstance(seen_items, dict):
-            seen_items = {}
+        # "seen" items are what this user was last shown for the slot.
+        seen_items = snap.seen_for(author_id, slot_name)
 
         diff_items = {}
         for item_name, new_total in agg_new.items():
@@ -675,8 +517,8 @@ async def get_all_new_items(ctx):
 
         if diff_items:
             # Underline the slot name using ANSI escape sequences
-            underline_start = "[4;2m"
-            underline_end = "[0m"
+            underline_start = "[4;2m"
+            underline_end = "[0m"
 
             header = f"{underline_start}Items received for {slot_name}:{underline_end}"
 
@@ -685,14 +527,7 @@ async def get_all_new_items(ctx):
                 diff_message_lines.append(f"{item_name} +{diff_amount}")
             diff_message_lines.append("")  # blank line for separation
             # Update seen items to the current aggregated totals.
-            for item_name, new_total in agg_new.items():
-                seen_items[item_name] = new_total
-            assignment["items"] = seen_items
-            updated = True
-
-    if updated:
-        with open(listeners_file, "w") as f:
-            json.dump(listeners_data, f, indent=4)
+            await state_service.set_seen_items(author_id, slot_name, agg_new)
 
     if not diff_message_lines:
         diff_message = "No new items received."
@@ -715,67 +550,24 @@ async def get_all_new_items(ctx):
 @bot.slash_command(description="Get a DM with new items received for a specified slot.")
 @option("slot_name", description="Enter your slot name.", autocomplete = slot_name_for_assigned_slot_autocomplete, required=True)
 async def get_new_items_for_slot(ctx, slot_name: str):
-    listeners_file = os.path.join("data", "listeners.json")
-    items_received_file = os.path.join("data", "items_received.json")
-
-    # Load listeners data.
-    if not os.path.exists(listeners_file):
-        await ctx.respond("You have no assignments.", ephemeral=True)
-        return
-    with open(listeners_file, "r") as f:
-        try:
-            listeners_data = json.load(f)
-        except json.JSONDecodeError:
-            await ctx.respond("Error reading listeners file.", ephemeral=True)
-            return
-
     author_id = str(ctx.author.id)
-    if author_id not in listeners_data:
+    snap = state_service.snapshot()
+    assignments = snap.assignments_for(author_id)
+    if not assignments:
         await ctx.respond("You have no assignments.", ephemeral=True)
         return
 
-    # Load items_received data.
-    if not os.path.exists(items_received_file):
-        await ctx.respond("No items received data available.", ephemeral=True)
-        return
-    with open(items_received_file, "r") as f:
-        try:
-            items_received = json.load(f)
-        except json.JSONDecodeError:
-            await ctx.respond("Error reading items received file.", ephemeral=True)
-            return
-
     diff_message_lines = []
-    updated = False
-    assignments = listeners_data[author_id]
     for assignment in assignments:
         assigned_slot = assignment.get("slot_name", "")
         if assigned_slot.lower() != slot_name.lower():
             continue
 
-        # Locate the corresponding slot data in items_received.
-        slot_data = None
-        for slot_num, slot_entry in items_received.items():
-            if assigned_slot in slot_entry:
-                slot_data = slot_entry[assigned_slot]
-                break
-        if slot_data is None:
+        agg_new = snap.inventory(assigned_slot)
+        if not agg_new:
             continue
 
-        items_dict = slot_data.get("Items", {})
-        agg_new = {}
-        if isinstance(items_dict, dict):
-            for key, item_info in items_dict.items():
-                name = item_info.get("item_name", "Unknown")
-                try:
-                    count = int(item_info.get("amount", 0))
-                except Exception:
-                    count = 0
-                agg_new[name] = agg_new.get(name, 0) + count
-
-        seen_items = assignment.get("items", {})
-        if not isinstance(seen_items, dict):
-            seen_items = {}
+        seen_items = snap.seen_for(author_id, assigned_slot)
 
         diff_items = {}
         for item_name, new_total in agg_new.items():
@@ -786,8 +578,8 @@ async def get_new_items_for_slot(ctx, slot_name: str):
         if diff_items:
 
             # Underline the slot name using ANSI escape sequences
-            underline_start = "[4;2m"
-            underline_end = "[0m"
+            underline_start = "[4;2m"
+            underline_end = "[0m"
 
             header = f"{underline_start}Items received for {slot_name}:{underline_end}"
 
@@ -795,14 +587,7 @@ async def get_new_items_for_slot(ctx, slot_name: str):
             for item_name, diff_amount in diff_items.items():
                 diff_message_lines.append(f"{item_name} +{diff_amount}")
             diff_message_lines.append("")
-            for item_name, new_total in agg_new.items():
-                seen_items[item_name] = new_total
-            assignment["items"] = seen_items
-            updated = True
-
-    if updated:
-        with open(listeners_file, "w") as f:
-            json.dump(listeners_data, f, indent=4)
+            await state_service.set_seen_items(author_id, assigned_slot, agg_new)
 
     if not diff_message_lines:
         diff_message = f"No new items received for {slot_name}."
@@ -844,48 +629,29 @@ def chunk_text_by_line(content, max_length):
     return chunks
 
 
-# Updated send_items: searches for the assignment's slot in the new items_received.json format,
-# and builds a plain-text message listing the items and their amounts.
+# send_items: looks up the assignment's slot in the slot index and builds a plain-text
+# message listing the items and their amounts.
 async def send_items(ctx, assignment, initial_response):
     # Extract the slot name and game from the assignment dictionary
     slot_name = assignment.get("slot_name", "Unknown")
     game_name = assignment.get("game", "Unknown")
 
-    # Load the items_received.json file
-    try:
-        os.makedirs("data", exist_ok=True)
-        items_received_json = os.path.join("data", "items_received.json")
-        with open(items_received_json, "r") as f:
-            items_received = json.load(f)
-
-    except Exception as e:
-        await ctx.author.send(content=f"Error reading items file: {e}. Talk to the server admin for help.")
-        return f"Error reading items file: {e}"
-
-    # Look for the slot data by searching each slot number's entry for the matching slot name
-    slot_data = None
-    for slot_num, slot_entry in items_received.items():
-        if slot_name in slot_entry:
-            slot_data = slot_entry[slot_name]
-            break
-
-    if slot_data is None:
+    record = state_service.snapshot().slot(slot_name)
+    if record is None:
         message = f"No items found for slot: {slot_name}"
         return message
 
-    items_dict = slot_data.get("Items", {})
-
     # Underline the slot name using ANSI escape sequences
-    underline_start = "[4;2m"
-    underline_end = "[0m"
+    underline_start = "[4;2m"
+    underline_end = "[0m"
 
     header = f"{underline_start}Items received for {slot_name}:{underline_end}"
     lines = [header]
+    if record.completed:
+        lines.append("Game Completed!")
 
     # Build a line for each received item
-    for key, item_info in items_dict.items():
-        item_name = item_info.get("item_name", "Unknown")
-        amount = item_info.get("amount", "Unknown")
+    for item_name, amount in record.inventory.items():
         if amount == 1:
             line = f"{item_name}"
         else:
@@ -923,16 +689,184 @@ def format_diff_message(diff):
     return "\n".join(lines)
 
 
+async def _apply_tracker_diff(diff):
+    # The scrape has already stored its results; re-index every slot whose stored entry it
+    # added, changed or removed (not just those with new items: a status change or a slot that
+    # left the room must reach the index too), then evaluate only the tracked items the new
+    # items could have moved. A cycle that changed nothing costs nothing here. Returns the
+    # re-indexed slot names.
+    reindexed = tracker_download.take_changed_slot_names()
+    await state_service.reload_tracker_slots(reindexed)
+    if diff:
+        # Kept separate so a DM failure never stops the channel post for the same diff.
+        try:
+            await _run_tracked_items_check(diff)
+        except Exception as e:
+            print(f"[tracked-items] check failed: {e}")
+    return reindexed
+
+
+async def _post_diff(channel, diff):
+    message = format_diff_message(diff)
+    # Prepare to send the message in a code block.
+    # Adjust the maximum content length to account for the code block wrappers.
+    wrapper_length = len("```\n") + len("\n```")
+    max_content_length = 1950 - wrapper_length
+    chunks = chunk_text_by_line(message, max_content_length)
+    for chunk in chunks:
+        await channel.send(f"```ansi\n{chunk}\n```")
+
+
+async def _on_live_items(diff, room):
+    # Items / goals streamed by a live AP connection (get_server_data live:True), batched by the
+    # connector into the same diff shape a tracker scrape produces. The slot index, the tracked
+    # items and the scrape's accounting all describe the tracked room, keyed by slot name alone,
+    # so only its items go there: another room's "Alex" is a different player. Every room's
+    # items are still announced.
+    if _is_tracked_room(room):
+        _note_live_announced(diff)
+        await state_service.add_live_items(diff)
+        try:
+            await _run_tracked_items_check(diff)
+        except Exception as e:
+            print(f"[tracked-items] check failed: {e}")
+    channel = _tracker_channel()
+    if channel is not None:
+        await _post_diff(channel, diff)
+
+
+async def _on_live_connected(room):
+    # A live connection came up (or back up after a drop): catch up through the tracker on
+    # anything sent since the last scrape or while the socket was down. The live feed only
+    # carries what happens while it is connected.
+    if not _is_tracked_room(room):
+        return  # the tracker scrape keeps running for the tracked room; nothing to catch up
+    try:
+        await _scrape_tracker(_tracker_channel())
+        print(f"[live] caught up with the tracker for {room.address}")
+    except Exception as e:
+        print(f"[live] tracker catch-up for {room.address} failed: {e}")
+
+
+def _tracker_channel():
+    return bot.get_channel(int(discord_channel_id)) if discord_channel_id else None
+
+
+# What the live feed has announced that the stored tracker result doesn't have yet:
+# {slot_name: {"slot": slot_number, "items": {item_name: count}, "goal": bool}}. A tracker diff
+# reports everything since the last scrape, so these are subtracted from it before it is
+# announced -- each item is announced once, by whichever path saw it first. Whatever a scrape
+# doesn't show yet stays here for the next one.
+_live_announced = {}
+
+# One scrape at a time: the loops and a live catch-up share tracker_download's diff state.
+_scrape_lock = asyncio.Lock()
+# While the tracked room's live feed stands in for the scrape, the loops still scrape every
+# LIVE_TRACKER_SWEEP seconds. The live feed only updates memory, so this keeps the stored tracker
+# result (the baseline after a restart) current, and picks up what the feed never sees, like an
+# admin /send. What the feed already announced is subtracted as usual.
+LIVE_TRACKER_SWEEP = int(os.getenv("LIVE_TRACKER_SWEEP", "300"))
+_last_scrape = None  # time.monotonic() of the last completed scrape
+
+
+def _note_live_announced(diff):
+    for slot, slot_entry in diff.items():
+        for slot_name, details in slot_entry.items():
+            seen = _live_announced.setdefault(slot_name, {"slot": slot, "items": {}, "goal": False})
+            for item_name, count in details.get("New Items", {}).items():
+                seen["items"][item_name] = seen["items"].get(item_name, 0) + count
+            if "Goal Completed" in details:
+                seen["goal"] = True
+
+
+def _take_unannounced(diff):
+    """The part of a tracker diff the live feed hasn't announced. Consumes the live counts the
+    diff covers."""
+    unannounced = {}
+    for slot, slot_entry in diff.items():
+        for slot_name, details in slot_entry.items():
+            seen = _live_announced.get(slot_name)
+            if seen is None:
+                unannounced.setdefault(slot, {})[slot_name] = details
+                continue
+            entry = {}
+            for item_name, count in details.get("New Items", {}).items():
+                covered = min(count, seen["items"].get(item_name, 0))
+                if covered:
+                    seen["items"][item_name] -= covered
+                    if not seen["items"][item_name]:
+                        del seen["items"][item_name]
+                if count > covered:
+                    entry.setdefault("New Items", {})[item_name] = count - covered
+            if "Goal Completed" in details:
+                if seen["goal"]:
+                    seen["goal"] = False
+                else:
+                    entry["Goal Completed"] = details["Goal Completed"]
+            if entry:
+                unannounced.setdefault(slot, {})[slot_name] = entry
+            if not seen["items"] and not seen["goal"]:
+                del _live_announced[slot_name]
+    return unannounced
+
+
+async def _scrape_tracker(channel):
+    """Run one tracker cycle: store and re-index it, then announce (to `channel`, if any)
+    whatever the live feed hasn't. Returns what was announced."""
+    global _last_scrape
+    async with _scrape_lock:
+        diff = await tracker_download.async_get_all_tracker_received_items(tracker_url, auth)
+        _last_scrape = time.monotonic()
+        unannounced = _take_unannounced(diff)
+        # The re-index replaces the changed slots with the tracker's view; put back the live
+        # items it doesn't show yet.
+        reindexed = await _apply_tracker_diff(diff)
+        pending = {}
+        for slot_name, seen in _live_announced.items():
+            if slot_name in reindexed and seen["items"]:
+                pending.setdefault(seen["slot"], {})[slot_name] = {"New Items": dict(seen["items"])}
+        if pending:
+            await state_service.add_live_items(pending)
+        if unannounced and channel is not None:
+            await _post_diff(channel, unannounced)
+        return unannounced
+
+
+def _is_tracked_room(room) -> bool:
+    """Whether `room` is the room TRACKER_URL tracks. An AP address doesn't name its web
+    tracker, so the rooms are matched by their slots: every slot in the last scrape must have
+    the same number and name in the room's Connected slot info."""
+    tracked = tracker_download.tracked_slots()
+    if not tracked or not room.slot_mapping:
+        return False
+    return all(room.slot_mapping.get(str(slot), {}).get("slot_name") == slot_name
+               for slot, slot_name in tracked.items())
+
+
+def _live_feed_active() -> bool:
+    """Whether a live AP connection to the tracked room is streaming items, so the tracker
+    scrape can skip a cycle. A live feed from any other room leaves the scrape running."""
+    return any(_is_tracked_room(room) for room in ap_connector.manager.live_rooms())
+
+
+def _scrape_due() -> bool:
+    """Whether the tracker loops scrape this cycle: always, except while the tracked room's live
+    feed is up -- then only once LIVE_TRACKER_SWEEP has passed since the last scrape."""
+    if not _live_feed_active():
+        return True
+    return _last_scrape is None or time.monotonic() - _last_scrape >= LIVE_TRACKER_SWEEP
+
+
 async def no_dm_tracker(tracker_url, auth):
     while True:
-        # get_all_tracker_received_items is BLOCKING (synchronous requests, one HTTP call per
-        # slot). Run it in a thread so it can't stall the event loop and make the bot miss
-        # Discord's 3s interaction-ack window (error 10062 "Unknown interaction").
+        # The async scraper fetches every slot page on the event loop without blocking it (or
+        # holding an executor thread for the whole cycle), so the bot never misses Discord's 3s
+        # interaction-ack window (error 10062 "Unknown interaction").
         # Wrapped so a transient error (e.g. the tracker host timing out) is logged and retried
         # next cycle instead of killing the loop permanently.
         try:
-            await asyncio.get_running_loop().run_in_executor(
-                None, tracker_download.get_all_tracker_received_items, tracker_url, auth)
+            if _scrape_due():
+                await _scrape_tracker(None)
         except Exception as e:
             print(f"[tracker] scrape failed (will retry next cycle): {e}")
         await asyncio.sleep(60)
@@ -947,29 +881,21 @@ async def check_for_item_changes(tracker_url, auth, channel_id):
         return
 
     while not bot.is_closed():
-        # Get the new diff from tracker data. This is BLOCKING (synchronous requests, one HTTP
-        # call per slot -- ~8s for a large seed), so run it in a thread; otherwise it stalls the
-        # event loop and the bot misses Discord's 3s interaction-ack window (error 10062, seen as
-        # "Application didn't respond" on commands AND autocompletes).
+        # Get the new diff from tracker data. The scrape is async-native (pooled aiohttp
+        # session, per-request timeouts), so it is awaited directly: no executor thread is held
+        # for the cycle and the event loop stays free for Discord's 3s interaction-ack window
+        # (error 10062, seen as "Application didn't respond" on commands AND autocompletes).
         # Wrapped so a transient failure (e.g. the tracker host timing out) is logged and retried
         # next cycle instead of killing the loop permanently (it is started once and never
         # restarted, so an unhandled exception would stop tracking until a full bot restart).
         try:
-            diff = await asyncio.get_running_loop().run_in_executor(
-                None, tracker_download.get_all_tracker_received_items, tracker_url, auth)
-            current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-            if diff:
-                print(f"Changes found at {current_time}")
-                message = format_diff_message(diff)
-                # Prepare to send the message in a code block.
-                # Adjust the maximum content length to account for the code block wrappers.
-                wrapper_length = len("```\n") + len("\n```")
-                max_content_length = 1950 - wrapper_length
-                chunks = chunk_text_by_line(message, max_content_length)
-                for chunk in chunks:
-                    await channel.send(f"```ansi\n{chunk}\n```")
-            else:
-                print(f"No changes found at {current_time}")
+            if _scrape_due():
+                announced = await _scrape_tracker(channel)
+                current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                if announced:
+                    print(f"Changes found at {current_time}")
+                else:
+                    print(f"No changes found at {current_time}")
         except Exception as e:
             print(f"[tracker] item-change check failed (will retry next cycle): {e}")
 
@@ -984,32 +910,13 @@ async def get_all_tracked_items(ctx):
     initial_response = await ctx.respond("Getting items...", ephemeral=True)
     author_id = str(ctx.author.id)
 
-    os.makedirs("data", exist_ok=True)
-    listeners_data_json = os.path.join("data", "listeners.json")
-
-    if not os.path.exists(listeners_data_json):
+    tracked_assignments = state_service.snapshot().assignments_for(author_id)
+    if not tracked_assignments:
         await initial_response.edit_original_response(
             content="Sorry, you aren't tracking any slots. Run '/assign_slot' to track a slot."
         )
         return
 
-    # Load listeners.json data.
-    with open(listeners_data_json, "r") as f:
-        try:
-            listeners_data = json.load(f)
-        except json.JSONDecodeError:
-            await initial_response.edit_original_response(
-                content="Error reading listeners file."
-            )
-            return
-
-    if author_id not in listeners_data:
-        await initial_response.edit_original_response(
-            content="Sorry, you aren't tracking any slots. Run '/assign_slot' to track a slot."
-        )
-        return
-
-    tracked_assignments = listeners_data[author_id]
     combined_message = ""
     for assignment in tracked_assignments:
         message = await send_items(ctx, assignment, initial_response)
@@ -1042,30 +949,18 @@ async def get_all_tracked_items(ctx):
 async def track_item(ctx, game_name: str, item_name: str, slot_name: str, target_amount: int):
     initial_response = await ctx.respond("tracking item...", ephemeral=True)
 
-    os.makedirs("data", exist_ok=True)
-    listeners_data_json = os.path.join("data", "listeners.json")
-
-    # Load existing listeners data (or initialize if not present)
-    if os.path.exists(listeners_data_json):
-        with open(listeners_data_json, "r") as f:
-            try:
-                listeners_data = json.load(f)
-            except json.JSONDecodeError:
-                listeners_data = {}
-    else:
-        listeners_data = {}
-
     author_id = str(ctx.author.id)
 
     # Check if the user has any assignments
-    if author_id not in listeners_data:
+    snap = state_service.snapshot()
+    user_assignments = snap.assignments_for(author_id)
+    if not user_assignments:
         await initial_response.edit_original_response(
             content="You haven't assigned any slots yet. Use the assign_slot command first."
         )
         return
 
     # Look for an assignment that matches the given game and slot (case-insensitive)
-    user_assignments = listeners_data[author_id]
     matching_assignment = None
     for assignment in user_assignments:
         if assignment.get("game", "").lower() == game_name.lower() and assignment.get("slot_name", "").lower() == slot_name.lower():
@@ -1078,130 +973,81 @@ async def track_item(ctx, game_name: str, item_name: str, slot_name: str, target
         )
         return
 
-    # Ensure the assignment has a "tracked_items" dictionary to store tracked items
-    if "tracked_items" not in matching_assignment:
-        matching_assignment["tracked_items"] = {}
+    assigned_slot = matching_assignment["slot_name"]
+    tracked_items = snap.tracked_for(author_id, assigned_slot)
 
     # Check if the item is already being tracked
-    if item_name in matching_assignment["tracked_items"]:
-        if "target" in matching_assignment["tracked_items"][item_name] == target_amount:
+    if item_name in tracked_items:
+        current = tracked_items[item_name]["current"]
+        if tracked_items[item_name]["target"] == target_amount:
             await initial_response.edit_original_response(
-                content=f"**{item_name}** is already being tracked for **{game_name}** under slot **{slot_name}**.  Current amount: {matching_assignment['tracked_items'][item_name]['current']}."
+                content=f"**{item_name}** is already being tracked for **{game_name}** under slot **{slot_name}**.  Current amount: {current}."
             )
             return
-        elif "target" in matching_assignment["tracked_items"][item_name] != target_amount:
-            await initial_response.edit_original_response(
-                content=f"Now tracking **{item_name}** (target: {target_amount}) for **{game_name}** under slot **{slot_name}**.  Current amount: {matching_assignment['tracked_items'][item_name]['current']}."
-            )
-            matching_assignment["tracked_items"][item_name] = {"target": target_amount, "current": {matching_assignment['tracked_items'][item_name]['current']}}
+        # New target for an item already tracked: keep the count received so far.
+        await state_service.set_tracked_item(author_id, assigned_slot, item_name, target_amount, current)
+        await initial_response.edit_original_response(
+            content=f"Now tracking **{item_name}** (target: {target_amount}) for **{game_name}** under slot **{slot_name}**.  Current amount: {current}."
+        )
     else:
         # Add the new item to track with its target amount and initial count of 0
-        matching_assignment["tracked_items"][item_name] = {"target": target_amount, "current": 0}
-
-        # Save the updated listeners data back to file
-        with open(listeners_data_json, "w") as f:
-            json.dump(listeners_data, f, indent=4)
+        await state_service.set_tracked_item(author_id, assigned_slot, item_name, target_amount, 0)
 
         await initial_response.edit_original_response(
             content=f"Now tracking **{item_name}** (target: {target_amount}) for **{game_name}** under slot **{slot_name}**."
         )
 
+    # Checks otherwise only run when the tracker reports new items, so catch up on copies the
+    # slot already holds right away.
+    await _evaluate_tracked_items(state_service.snapshot(), [(author_id, assigned_slot, item_name)])
+
+
+async def _run_tracked_items_check(diff):
+    # Look up who watches each (slot, item) the diff reports new copies of, through the state's
+    # (slot, lowercased item) -> watchers index; nobody else's tracked items are touched.
+    snap = state_service.snapshot()
+    hits = set()
+    for slot_entry in diff.values():
+        for slot_name, details in slot_entry.items():
+            for item_name in details.get("New Items", {}):
+                for user_id, tracked_item in snap.watchers.get((slot_name, item_name.lower()), ()):
+                    hits.add((user_id, slot_name, tracked_item))
+    await _evaluate_tracked_items(snap, hits)
+
+
+async def _evaluate_tracked_items(snap, hits):
+    """Check each (user_id, slot_name, tracked_item) in `hits` against the slot index, update
+    its progress and DM each user once with everything that moved."""
+    # Group by user so each user gets one DM per check.
+    by_user = {}
+    for user_id, slot_name, tracked_item in hits:
+        info = snap.tracked_for(user_id, slot_name).get(tracked_item)
+        if info is None:
+            continue
+        game = next((a.get("game") for a in snap.assignments_for(user_id) if a["slot_name"] == slot_name), None)
+        by_user.setdefault(user_id, []).append((slot_name, game, tracked_item, info["target"], info["current"]))
 
-async def check_tracked_items_loop():
-    await bot.wait_until_ready()  # Ensure the bot is ready before starting the loop
-    while not bot.is_closed():
-        # Wrapped so a transient error never kills the loop (it is started once and never
-        # restarted, so an unhandled exception would stop per-user item tracking until a full
-        # bot restart).
-        try:
-            await _run_tracked_items_check()
-        except Exception as e:
-            print(f"[tracked-items] check failed (will retry next cycle): {e}")
-        await asyncio.sleep(10)
-
-
-async def _run_tracked_items_check():
-    os.makedirs("data", exist_ok=True)
-    listeners_data_json = os.path.join("data", "listeners.json")
-    items_received_json = os.path.join("data", "items_received.json")
-
-    # Load items_received.json
-    try:
-        with open(items_received_json, "r") as f:
-            items_received = json.load(f)
-    except Exception as e:
-        print(f"Error loading {items_received_json}: {e}")
-        return
-
-    # Load listeners.json (the tracking assignments)
-    if os.path.exists(listeners_data_json):
-        with open(listeners_data_json, "r") as f:
-            try:
-                listeners_data = json.load(f)
-            except json.JSONDecodeError:
-                listeners_data = {}
-    else:
-        listeners_data = {}
-
-    any_update = False  # Flag to determine if we need to update the file
-
-    # Iterate over each user (by author ID) in listeners_data
-    for user_id, assignments in listeners_data.items():
+    for user_id, tracked in by_user.items():
         user_messages = []  # Collect messages for the user across assignments
-        for assignment in assignments:
-            slot_name = assignment.get("slot_name")
-            tracked_items = assignment.get("tracked_items", {})
-
-            # If tracked_items is a list (from an older structure), convert it to a dictionary.
-            if isinstance(tracked_items, list):
-                new_tracked = {}
-                for item in tracked_items:
-                    # Set a default target amount of 1 (or adjust as needed)
-                    new_tracked[item] = {"target": 1, "current": 0}
-                assignment["tracked_items"] = new_tracked
-                tracked_items = new_tracked
-
-            # Find the corresponding slot in items_received.json.
-            slot_items_data = None
-            for slot_num, slot_data in items_received.items():
-                if slot_name in slot_data:
-                    slot_items_data = slot_data[slot_name]
-                    break
-
-            if slot_items_data:
-                items_dict = slot_items_data.get("Items", {})
-                # For each tracked item, calculate the total received amount.
-                items_to_remove = []
-                for tracked_item, tracking_info in tracked_items.items():
-                    target = tracking_info.get("target", 0)
-                    current = tracking_info.get("current", 0)
-                    total_received = 0
-
-                    # Sum amounts for matching tracked_item in the received items
-                    for key, item_info in items_dict.items():
-                        if item_info.get("item_name", "").lower() == tracked_item.lower():
-                            try:
-                                amt = int(item_info.get("amount", 0))
-                            except ValueError:
-                                amt = 0
-                            total_received += amt
-
-                    if total_received > current:
-                        new_count = total_received - current
-                        tracking_info["current"] = total_received
-                        if total_received >= target:
-                            user_messages.append(
-                                f"Your tracked item **{tracked_item}** has reached the target ({total_received}/{target}) for slot **{slot_name}** in game **{assignment.get('game', 'Unknown')}**. Tracking for this item is now complete."
-                            )
-                            items_to_remove.append(tracked_item)
-                        else:
-                            user_messages.append(
-                                f"You received **{new_count}** new **{tracked_item}** (total: {total_received}/{target}) for slot **{slot_name}** in game **{assignment.get('game', 'Unknown')}**."
-                            )
-                # Remove items that have reached or exceeded the target from tracking
-                for item in items_to_remove:
-                    tracked_items.pop(item, None)
-                any_update = True
+        for slot_name, game, tracked_item, target, current in tracked:
+            # The slot index keeps each slot's totals keyed lowercase, matching how tracked names
+            # are compared.
+            record = snap.slot(slot_name)
+            total_received = record.inventory_lower.get(tracked_item.lower(), 0) if record else 0
+
+            if total_received > current:
+                new_count = total_received - current
+                if total_received >= target:
+                    user_messages.append(
+                        f"Your tracked item **{tracked_item}** has reached the target ({total_received}/{target}) for slot **{slot_name}** in game **{game or 'Unknown'}**. Tracking for this item is now complete."
+                    )
+                    # Remove items that have reached or exceeded the target from tracking
+                    await state_service.remove_tracked_item(user_id, slot_name, tracked_item)
+                else:
+                    user_messages.append(
+                        f"You received **{new_count}** new **{tracked_item}** (total: {total_received}/{target}) for slot **{slot_name}** in game **{game or 'Unknown'}**."
+                    )
+                    await state_service.set_tracked_item(user_id, slot_name, tracked_item, target, total_received)
 
         # DM the user if there are any messages
         if user_messages:
@@ -1214,11 +1060,6 @@ async def _run_tracked_items_check():
             except Exception as e:
                 print(f"[tracked-items] could not DM user {user_id}: {e}")
 
-    # If any updates were made, save the updated listeners data back to file
-    if any_update:
-        with open(listeners_data_json, "w") as f:
-            json.dump(listeners_data, f, indent=4)
-
 
 async def check_go_mode_loop():
     """Edge-triggered go-mode notifications: DM the player who holds a slot the moment it
@@ -1252,7 +1093,7 @@ async def _run_go_mode_notifications():
 
     # slot_name -> set of Discord user ids assigned to it (usually exactly one)
     slot_to_authors = {}
-    for author_id, assignments in _load_listeners().items():
+    for author_id, assignments in state_service.snapshot().assignments.items():
         for a in assignments:
             sn = a.get("slot_name")
             if sn:
@@ -1275,7 +1116,9 @@ async def _run_go_mode_notifications():
     if not candidate_slots:
         return
 
-    items_received = gomode_bot._load_items_received()
+    # Each candidate slot's inventory is read once and shared by the throttle and the check.
+    snap = state_service.snapshot()
+    inventories = {sn: dict(snap.inventory(sn)) for sn in candidate_slots}
     cache = gomode_bot.load_cache()
 
     def is_fallback(sn):
@@ -1289,14 +1132,14 @@ async def _run_go_mode_notifications():
     to_check = []
     for sn in candidate_slots:
         if is_fallback(sn):
-            sig = (seed, _inventory_sig(gomode_bot.inventory_for_slot(items_received, sn)))
+            sig = (seed, _inventory_sig(inventories[sn]))
             if _go_mode_fallback_sig.get(sn) == sig:
                 continue
         to_check.append(sn)
     if not to_check:
         return
 
-    status = await gomode_bot.go_mode_status(to_check, items_received=items_received)
+    status = await gomode_bot.go_mode_status(to_check, inventories=inventories)
 
     changed = False
     for sn in to_check:
@@ -1305,7 +1148,7 @@ async def _run_go_mode_notifications():
         # Remember a definitive "not yet" for fallback slots so we don't rebuild next cycle.
         if is_fallback(sn) and st.get("status") == "ok" and igm is False:
             _go_mode_fallback_sig[sn] = (
-                seed, _inventory_sig(gomode_bot.inventory_for_slot(items_received, sn)))
+                seed, _inventory_sig(inventories[sn]))
         if not (st.get("status") == "ok" and igm is True):
             continue
         game = st.get("game") or ""
@@ -0,0 +1,236 @@
+"""Precomputed search indexes behind the slash-command autocompletes.
+
+Autocompletes run on every keystroke, on the event loop. Instead of lower-casing, sorting
+and filtering every name each time, each name list is turned once into a sorted array of
+lower-cased keys; a prefix query is then a bisect plus a walk over at most MAX_CHOICES
+matches. Game and item indexes are rebuilt only when the data package changes
+(state_store.data_package_revision()); slot indexes only when the room's slot list or the
+assignments change.
+"""
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+
+import state_store
+
+# Discord shows (and accepts) at most 25 autocomplete choices.
+MAX_CHOICES = 25
+
+
+class PrefixIndex:
+    """Names sorted by their lower-cased form, for case-insensitive prefix lookups."""
+
+    __slots__ = ("keys", "names")
+
+    def __init__(self, names):
+        pairs = sorted((name.lower(), name) for name in set(names) if name)
+        self.keys = [key for key, _ in pairs]
+        self.names = [name for _, name in pairs]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def prefix(self, text: str, limit: int = MAX_CHOICES) -> list:
+        """Up to `limit` names starting with `text` (case-insensitive), in sorted order."""
+        text = (text or "").lower()
+        keys = self.keys
+        i = bisect_left(keys, text)
+        end = min(len(keys), i + limit)
+        out = []
+        while i < end and keys[i].startswith(text):
+            out.append(self.names[i])
+            i += 1
+        return out
+
+
+_SEPARATORS = str.maketrans({c: " " for c in "-_()[]:,./'"})
+
+
+def _tokens(key: str) -> list:
+    return key.translate(_SEPARATORS).split()
+
+
+def _word_edit_distance(words: list, tokens: list) -> int:
+    """Edit distance between a query and a name, computed word by word: keeping a name word
+    the query word is a prefix of costs the extra letters, and dropping or adding a whole word
+    costs its letters. Word order counts, like a character edit distance, but the table is
+    only (query words x name words), so it is cheap enough to run per candidate."""
+    previous = [0]
+    for token in tokens:
+        previous.append(previous[-1] + len(token) + 1)
+    for word in words:
+        current = [previous[0] + len(word) + 1]
+        for j, token in enumerate(tokens, 1):
+            keep = len(token) - len(word) if token.startswith(word) else len(token) + len(word)
+            current.append(min(previous[j] + len(word) + 1, current[j - 1] + len(token) + 1,
+                               previous[j - 1] + keep))
+        previous = current
+    return previous[-1]
+
+
+class SearchIndex(PrefixIndex):
+    """A PrefixIndex that also ranks looser matches, for long names like "Progressive Sword":
+
+      0. the name starts with the query,
+      1. the query starts a word of the name ("sword"), or every query word starts some
+         word of the name, in any order ("prog sw"),
+      2. the query appears anywhere in the name.
+
+    Within a tier, names closer to the query (fewest extra characters; word-level edit
+    distance for multi-word queries) come first, then alphabetical. A lower tier is only searched when the
+    ones above it left room, so a short query that matches thousands of names stays cheap.
+    """
+
+    __slots__ = ("rank", "tokens", "token_keys", "token_ids", "haystack", "offsets")
+
+    def __init__(self, names):
+        super().__init__(names)
+        # Shorter names first, then alphabetical: one precomputed int per name so ranking a
+        # tier is a C-level key lookup.
+        count = len(self.keys)
+        self.rank = [len(key) * count + i for i, key in enumerate(self.keys)]
+        # Sorted (word, name position) pairs: a bisect finds every name with a word starting
+        # with a given prefix without scanning the names.
+        self.tokens = [_tokens(key) for key in self.keys]
+        pairs = sorted({(token, i) for i, tokens in enumerate(self.tokens) for token in tokens})
+        self.token_keys = [token for token, _ in pairs]
+        self.token_ids = [i for _, i in pairs]
+        # Every key in one string, so a substring search is str.find (C) instead of a loop.
+        self.haystack = "\n".join(self.keys)
+        self.offsets = []
+        offset = 0
+        for key in self.keys:
+            self.offsets.append(offset)
+            offset += len(key) + 1
+
+    def _word_prefix_ids(self, word: str) -> set:
+        lo = bisect_left(self.token_keys, word)
+        hi = bisect_left(self.token_keys, word + "\uffff", lo)
+        return set(self.token_ids[lo:hi])
+
+    def _substring_ids(self, query: str, wanted: int) -> list:
+        """The first `wanted` names (alphabetically) containing `query`."""
+        found = []
+        start = self.haystack.find(query)
+        while start != -1 and len(found) < wanted:
+            i = bisect_right(self.offsets, start) - 1
+            found.append(i)
+            start = self.haystack.find(query, self.offsets[i] + len(self.keys[i]) + 1)
+        return found
+
+    def search(self, text: str, limit: int = MAX_CHOICES) -> list:
+        """Up to `limit` names matching `text`, best first."""
+        query = (text or "").lower().strip()
+        if not query:
+            return self.names[:limit]
+        words = _tokens(query)
+        rank = self.rank.__getitem__
+
+        lo = bisect_left(self.keys, query)
+        hi = bisect_left(self.keys, query + "\uffff", lo)
+        result = heapq.nsmallest(limit, range(lo, hi), key=rank)
+        if len(result) < limit and words:
+            ids = self._word_prefix_ids(words[0])
+            for word in words[1:]:
+                if not ids:
+                    break
+                ids &= self._word_prefix_ids(word)
+            ids.difference_update(range(lo, hi))
+            best = heapq.nsmallest(limit * 2, ids, key=rank)
+            if len(words) > 1:
+                # Words matched out of order or with gaps: the extra-character count no longer
+                # says how close a name is, so break ties with the (word-level) edit distance.
+                best.sort(key=lambda i: (_word_edit_distance(words, self.tokens[i]), i))
+            result += best[:limit - len(result)]
+        if len(result) < limit:
+            seen = set(result)
+            extra = [i for i in self._substring_ids(query, limit * 4) if i not in seen]
+            result += heapq.nsmallest(limit - len(result), extra, key=rank)
+        return [self.names[i] for i in result]
+
+
+# --- data-package indexes (games and per-game items) ---------------------------
+_revision = None
+_game_index: PrefixIndex | None = None
+_item_indexes: dict = {}  # {game: SearchIndex}, built on first use per game
+
+
+def _check_revision() -> None:
+    global _revision, _game_index
+    revision = state_store.data_package_revision()
+    if revision != _revision:
+        _revision = revision
+        _game_index = None
+        _item_indexes.clear()
+
+
+def game_index() -> PrefixIndex:
+    global _game_index
+    _check_revision()
+    if _game_index is None:
+        _game_index = PrefixIndex(state_store.data_package_games())
+    return _game_index
+
+
+def item_index(game: str) -> SearchIndex:
+    _check_revision()
+    index = _item_indexes.get(game)
+    if index is None:
+        index = _item_indexes[game] = SearchIndex(state_store.get_item_names(game))
+    return index
+
+
+# --- slot indexes (from the state_service snapshot) ------------------------------
+# Keyed by the identity of the snapshot tables they were built from: the state writer copies
+# a table only when it changes, so an unchanged `slot_info` / `assignments` mapping means the
+# indexes are still current.
+_slot_source = None
+_slot_index: PrefixIndex | None = None
+_slots_by_game: dict = {}  # {game.lower(): PrefixIndex}
+_assignment_source = None
+_user_indexes: dict = {}   # {user_id: (PrefixIndex of all their slots, {game.lower(): PrefixIndex})}
+
+
+def _check_slots(snap) -> None:
+    global _slot_source, _slot_index, _slots_by_game
+    if snap.slot_info is _slot_source:
+        return
+    by_game: dict = {}
+    for info in snap.slot_info.values():
+        by_game.setdefault((info.get("game") or "").lower(), []).append(info.get("slot_name"))
+    _slot_index = PrefixIndex(name for names in by_game.values() for name in names)
+    _slots_by_game = {game: PrefixIndex(names) for game, names in by_game.items()}
+    _slot_source = snap.slot_info
+
+
+def slot_index(snap) -> PrefixIndex:
+    """Every slot in the room."""
+    _check_slots(snap)
+    return _slot_index
+
+
+def game_slot_index(snap, game: str) -> PrefixIndex:
+    """The room's slots playing `game` (case-insensitive)."""
+    _check_slots(snap)
+    return _slots_by_game.get((game or "").lower()) or PrefixIndex(())
+
+
+def user_slot_index(snap, user_id, game: str | None = None) -> PrefixIndex:
+    """The slots assigned to `user_id`, optionally only those playing `game` (case-insensitive)."""
+    global _assignment_source
+    if snap.assignments is not _assignment_source:
+        _user_indexes.clear()
+        _assignment_source = snap.assignments
+    user_id = str(user_id)
+    entry = _user_indexes.get(user_id)
+    if entry is None:
+        by_game: dict = {}
+        for a in snap.assignments_for(user_id):
+            by_game.setdefault((a.get("game") or "").lower(), []).append(a.get("slot_name"))
+        entry = _user_indexes[user_id] = (
+            PrefixIndex(name for names in by_game.values() for name in names),
+            {game: PrefixIndex(names) for game, names in by_game.items()})
+    if game is None:
+        return entry[0]
+    return entry[1].get(game.lower()) or PrefixIndex(())
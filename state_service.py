@@ -0,0 +1,390 @@
+"""In-memory bot state owned by one asyncio task.
+
+Commands and background loops used to re-read the same rows (assignments, slot info,
+tracker slots, seen/tracked items) from the state store many times a minute, and the 10s
+tracked-items loop could interleave its read-modify-write with a slash command's. Now:
+
+  * readers call `snapshot()` and get an immutable `Snapshot` tagged with a version number;
+    it never changes under them, so a command can read several fields consistently without
+    awaiting or locking,
+  * every write is a small mutation queued to the single writer task. It applies a burst of
+    queued mutations in order, publishes ONE new snapshot for the burst (copy-on-write: only
+    the tables a mutation touched are copied), then resolves each caller's future,
+  * the matching store writes are buffered (write-behind) and flushed in one transaction at
+    most STATE_FLUSH_DELAY seconds after the first unflushed change. Repeated writes to the
+    same row inside that window collapse to the last one.
+
+The tracker scrape and the AP connector still write their own tables directly; the bot
+calls `reload_tracker_slots()` / `reload_slot_info()` after they run.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import state_store
+
+# Upper bound (seconds) on how long a change may sit in memory before it reaches the store.
+FLUSH_DELAY = float(os.getenv("STATE_FLUSH_DELAY", "2"))
+
+_EMPTY = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class SlotRecord:
+    """One tracker slot, derived once per tracker change so lookups by slot name are O(1)."""
+    slot_number: str
+    game: str
+    status: str
+    checks: str
+    completed: bool
+    inventory: MappingProxyType        # {item_name: total_count}, in tracker order
+    inventory_lower: MappingProxyType  # the same totals keyed by lowercased item name
+
+
+def _slot_record(row) -> SlotRecord:
+    slot_number, game, status, checks, completed, inventory = row
+    lower: dict = {}
+    for name, count in inventory.items():
+        lower[name.lower()] = lower.get(name.lower(), 0) + count
+    return SlotRecord(slot_number, game, status, checks, completed,
+                      MappingProxyType(inventory), MappingProxyType(lower))
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    slot_info: MappingProxyType     # {slot_number: {"slot_name", "game"}}
+    assignments: MappingProxyType   # {user_id: ({"slot_number", "slot_name", "game"}, ...)}
+    seen_items: MappingProxyType    # {(user_id, slot_name): {item_name: count}}
+    tracked_items: MappingProxyType  # {(user_id, slot_name): {item_name: {"target", "current"}}}
+    slots: MappingProxyType         # {slot_name: SlotRecord} from the tracker
+    watchers: MappingProxyType      # {(slot_name, item_name.lower()): ((user_id, item_name), ...)}
+
+    def assignments_for(self, user_id) -> tuple:
+        return self.assignments.get(str(user_id), ())
+
+    def seen_for(self, user_id, slot_name: str):
+        return self.seen_items.get((str(user_id), slot_name), _EMPTY)
+
+    def tracked_for(self, user_id, slot_name: str):
+        return self.tracked_items.get((str(user_id), slot_name), _EMPTY)
+
+    def slot(self, slot_name: str):
+        """The tracker's SlotRecord for a slot name, or None."""
+        return self.slots.get(slot_name)
+
+    def inventory(self, slot_name: str):
+        record = self.slots.get(slot_name)
+        return record.inventory if record else _EMPTY
+
+
+_snapshot = Snapshot(0, _EMPTY, _EMPTY, _EMPTY, _EMPTY, _EMPTY, _EMPTY)
+_queue: asyncio.Queue | None = None
+_writer_task: asyncio.Task | None = None
+# Buffered store writes, keyed by the row they touch so a later write replaces an earlier one:
+# {key: (state_store function, args)}. Insertion order is the order they are flushed in.
+_pending: dict = {}
+_flush_due: float | None = None
+
+
+def snapshot() -> Snapshot:
+    """The current state. Cheap; never blocks; the returned object is never mutated."""
+    return _snapshot
+
+
+def _freeze_assignments(rows) -> tuple:
+    return tuple(MappingProxyType(dict(row)) for row in rows)
+
+
+def _freeze_tracked(tracked: dict):
+    return MappingProxyType({name: MappingProxyType(dict(info)) for name, info in tracked.items()})
+
+
+def _load_all() -> Snapshot:
+    """Build the first snapshot from the store (runs in a worker thread)."""
+    tracked: dict = {}
+    watchers: dict = {}
+    for user_id, slot_name, _game, item_name, target, current in state_store.all_tracked_items():
+        tracked.setdefault((user_id, slot_name), {})[item_name] = {"target": target, "current": current}
+        watchers.setdefault((slot_name, item_name.lower()), []).append((user_id, item_name))
+    return Snapshot(
+        version=1,
+        slot_info=MappingProxyType({num: MappingProxyType(info)
+                                    for num, info in state_store.get_slot_info().items()}),
+        assignments=MappingProxyType({user_id: _freeze_assignments(rows)
+                                      for user_id, rows in state_store.all_assignments().items()}),
+        seen_items=MappingProxyType({key: MappingProxyType(counts)
+                                     for key, counts in state_store.all_seen_items().items()}),
+        tracked_items=MappingProxyType({key: _freeze_tracked(items) for key, items in tracked.items()}),
+        slots=MappingProxyType({name: _slot_record(row)
+                                for name, row in state_store.load_tracker_slots().items()}),
+        watchers=MappingProxyType({key: tuple(users) for key, users in watchers.items()}),
+    )
+
+
+async def start() -> None:
+    """Load the state and start the writer task (idempotent)."""
+    global _snapshot, _queue, _writer_task
+    if _writer_task is not None:
+        return
+    _snapshot = await asyncio.to_thread(_load_all)
+    _queue = asyncio.Queue()
+    _writer_task = asyncio.create_task(_writer())
+
+
+class _Draft:
+    """The writer's working copy for one burst of mutations. A table is copied the first time
+    a mutation writes to it; untouched tables are shared with the previous snapshot."""
+
+    def __init__(self, base: Snapshot):
+        self.base = base
+        self.tables = {}
+
+    def read(self, name: str):
+        return self.tables.get(name, getattr(self.base, name))
+
+    def write(self, name: str) -> dict:
+        if name not in self.tables:
+            self.tables[name] = dict(getattr(self.base, name))
+        return self.tables[name]
+
+    def publish(self) -> Snapshot:
+        if not self.tables:
+            return self.base
+        fields = {name: MappingProxyType(table) for name, table in self.tables.items()}
+        return Snapshot(**{**self.base.__dict__, **fields, "version": self.base.version + 1})
+
+
+def _queue_write(key, fn, *args) -> None:
+    _pending.pop(key, None)  # re-insert so the flush order follows the latest write
+    _pending[key] = (fn, args)
+
+
+async def _submit(mutate, *args):
+    """Queue `mutate(draft, *args)` for the writer and wait for its result."""
+    if _queue is None:
+        await start()
+    future = asyncio.get_running_loop().create_future()
+    await _queue.put((mutate, args, future))
+    return await future
+
+
+async def _writer() -> None:
+    global _pending
+    try:
+        await _write_loop()
+    finally:
+        # Cancelled at shutdown (the event loop's clean-up cancels every task): write what is
+        # still buffered right here, since nothing will run the flush timer again.
+        batch, _pending = _pending, {}
+        if batch:
+            try:
+                _write_batch(batch)
+            except Exception as e:
+                print(f"[state] final flush failed: {e}")
+
+
+async def _write_loop() -> None:
+    global _snapshot, _flush_due
+    loop = asyncio.get_running_loop()
+    while True:
+        timeout = None if _flush_due is None else max(0.0, _flush_due - loop.time())
+        try:
+            job = await asyncio.wait_for(_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            await _flush()
+            continue
+
+        # Apply everything already queued as one burst -> one new snapshot.
+        jobs = [job]
+        while not _queue.empty():
+            jobs.append(_queue.get_nowait())
+        draft = _Draft(_snapshot)
+        results = []
+        for mutate, args, future in jobs:
+            try:
+                results.append((future, mutate(draft, *args), None))
+            except Exception as e:  # a bad mutation fails its own caller, not the writer
+                results.append((future, None, e))
+        _snapshot = draft.publish()
+        for future, result, error in results:
+            if future.cancelled():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        if _pending and _flush_due is None:
+            _flush_due = loop.time() + FLUSH_DELAY
+
+
+def _write_batch(batch: dict) -> None:
+    with state_store.transaction():
+        for fn, args in batch.values():
+            fn(*args)
+
+
+async def _flush() -> None:
+    """Write every buffered change to the store in one transaction."""
+    global _pending, _flush_due
+    batch, _pending, _flush_due = _pending, {}, None
+    if not batch:
+        return
+    try:
+        await asyncio.to_thread(_write_batch, batch)
+    except Exception as e:
+        # Keep the batch (newer writes to the same rows win) and retry after the next delay.
+        print(f"[state] flush failed (will retry): {e}")
+        _pending = {**batch, **_pending}
+        _flush_due = asyncio.get_running_loop().time() + FLUSH_DELAY
+
+
+async def flush() -> None:
+    """Push buffered changes to the store now (e.g. before shutdown)."""
+    if _writer_task is not None and not _writer_task.done():
+        # Wait for earlier mutations to be applied -- unless the writer is being torn down
+        # meanwhile (shutdown cancels it too), in which case it writes its buffer itself.
+        barrier = asyncio.ensure_future(_submit(lambda draft: None))
+        await asyncio.wait({barrier, _writer_task}, return_when=asyncio.FIRST_COMPLETED)
+        barrier.cancel()
+    await _flush()
+
+
+# --- mutations -----------------------------------------------------------------
+
+def _add_assignments(draft: _Draft, user_id: str, slots) -> list:
+    current = draft.read("assignments").get(user_id, ())
+    held = {a["slot_name"].lower() for a in current}
+    added = []
+    for slot_number, slot_name, game in slots:
+        if slot_name.lower() in held:
+            continue
+        held.add(slot_name.lower())
+        added.append({"slot_number": str(slot_number), "slot_name": slot_name, "game": game})
+    if added:
+        draft.write("assignments")[user_id] = current + _freeze_assignments(added)
+        for a in added:
+            _queue_write(("assign", user_id, a["slot_name"]), state_store.add_assignments,
+                         user_id, [(a["slot_number"], a["slot_name"], a["game"])])
+    return [a["slot_name"] for a in added]
+
+
+async def add_assignments(user_id, slots) -> list:
+    """Assign [(slot_number, slot_name, game), ...] to the user. Slots the user already holds
+    (case-insensitive) are skipped; returns the names actually added."""
+    return await _submit(_add_assignments, str(user_id), list(slots))
+
+
+def _set_seen_items(draft: _Draft, user_id: str, slot_name: str, counts: dict) -> None:
+    key = (user_id, slot_name)
+    merged = {**draft.read("seen_items").get(key, {}), **counts}
+    draft.write("seen_items")[key] = MappingProxyType(merged)
+    _queue_write(("seen", user_id, slot_name), state_store.set_seen_items, user_id, slot_name, merged)
+
+
+async def set_seen_items(user_id, slot_name: str, counts: dict) -> None:
+    """Record {item_name: count} as what the user has now been shown for the slot."""
+    await _submit(_set_seen_items, str(user_id), slot_name, dict(counts))
+
+
+def _watch(draft: _Draft, slot_name: str, user_id: str, item_name: str, watching: bool) -> None:
+    """Add or drop (user_id, item_name) in the (slot, lowercased item) -> watchers index."""
+    key = (slot_name, item_name.lower())
+    current = draft.read("watchers").get(key, ())
+    updated = tuple(w for w in current if w != (user_id, item_name))
+    if watching:
+        updated += ((user_id, item_name),)
+    if updated == current:
+        return
+    watchers = draft.write("watchers")
+    if updated:
+        watchers[key] = updated
+    else:
+        del watchers[key]
+
+
+def _set_tracked_item(draft: _Draft, user_id: str, slot_name: str, item_name: str,
+                      target: int, current: int) -> None:
+    key = (user_id, slot_name)
+    items = dict(draft.read("tracked_items").get(key, {}))
+    if item_name not in items:
+        _watch(draft, slot_name, user_id, item_name, True)
+    items[item_name] = {"target": int(target), "current": int(current)}
+    draft.write("tracked_items")[key] = _freeze_tracked(items)
+    _queue_write(("tracked", user_id, slot_name, item_name), state_store.set_tracked_item,
+                 user_id, slot_name, item_name, int(target), int(current))
+
+
+async def set_tracked_item(user_id, slot_name: str, item_name: str, target: int, current: int) -> None:
+    await _submit(_set_tracked_item, str(user_id), slot_name, item_name, target, current)
+
+
+def _remove_tracked_item(draft: _Draft, user_id: str, slot_name: str, item_name: str) -> None:
+    key = (user_id, slot_name)
+    items = dict(draft.read("tracked_items").get(key, {}))
+    if items.pop(item_name, None) is None:
+        return
+    _watch(draft, slot_name, user_id, item_name, False)
+    tracked = draft.write("tracked_items")
+    if items:
+        tracked[key] = _freeze_tracked(items)
+    else:
+        del tracked[key]
+    _queue_write(("tracked", user_id, slot_name, item_name), state_store.remove_tracked_item,
+                 user_id, slot_name, item_name)
+
+
+async def remove_tracked_item(user_id, slot_name: str, item_name: str) -> None:
+    await _submit(_remove_tracked_item, str(user_id), slot_name, item_name)
+
+
+def _replace(draft: _Draft, table: str, updates: dict, removed=()) -> None:
+    target = draft.write(table)
+    if removed is None:
+        target.clear()
+    else:
+        for key in removed:
+            target.pop(key, None)
+    target.update(updates)
+
+
+async def reload_slot_info() -> None:
+    """Pick up the slot list ap_connector just stored."""
+    info = await asyncio.to_thread(state_store.get_slot_info)
+    await _submit(_replace, "slot_info", {num: MappingProxyType(v) for num, v in info.items()}, None)
+
+
+async def reload_tracker_slots(slot_names=None) -> None:
+    """Re-derive the slot index from what the tracker just stored: the named slots only, or
+    every slot. A named slot the tracker no longer reports is dropped."""
+    names = None if slot_names is None else set(slot_names)
+    if names is not None and not names:
+        return
+    rows = await asyncio.to_thread(state_store.load_tracker_slots, names)
+    records = {name: _slot_record(row) for name, row in rows.items()}
+    await _submit(_replace, "slots", records, None if names is None else names - records.keys())
+
+
+def _apply_live_items(draft: _Draft, diff: dict) -> None:
+    slots = draft.write("slots")
+    for slot_number, slot_entry in diff.items():
+        for slot_name, details in slot_entry.items():
+            record = slots.get(slot_name) or SlotRecord(str(slot_number), details.get("Game Name", ""),
+                                                        "", "", False, _EMPTY, _EMPTY)
+            inventory = dict(record.inventory)
+            for item_name, count in details.get("New Items", {}).items():
+                inventory[item_name] = inventory.get(item_name, 0) + count
+            status = "Goal Completed" if "Goal Completed" in details else record.status
+            slots[slot_name] = _slot_record((record.slot_number, record.game, status, record.checks,
+                                             record.completed, inventory))
+
+
+async def add_live_items(diff: dict) -> None:
+    """Apply items / goals streamed by ap_connector's live mode (same shape as a tracker diff)
+    to the slot index in memory. The tracker tables are left alone: the next scrape of the web
+    tracker, which reports the same items, is the durable record."""
+    await _submit(_apply_live_items, diff)
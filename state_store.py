@@ -0,0 +1,572 @@
+"""SQLite-backed state for the bot (data/state.db).
+
+Replaces the data/*.json files (listeners, items_received, slot_info, data_package and
+go_mode_notified), which were each fully loaded and fully rewritten by several loops and
+commands and could clobber each other's updates. Every caller now reads and writes only the
+rows it touches, inside short transactions, against one WAL-mode database: readers never
+block the writer and a crash mid-write can't leave a half-written file behind.
+
+Tables:
+  slots            slot_info from the AP server:      slot_number -> slot_name, game
+  assignments      which Discord user holds which slot (by user, and by slot)
+  seen_items       per (user, slot, item): the count the user was last shown
+  tracked_items    per (user, slot, item): the /track_item target + progress
+  tracker_slots    the web tracker's room table:      slot_number -> name, game, status, checks
+  received_items   per (slot, item): the amount the web tracker reports received
+  dp_games / dp_items / dp_locations   data packages: per game, name <-> id
+  go_mode_notified per (seed, "author:slot") token: go-mode DMs already delivered
+  item_log         ItemSend events ap_connector saw while connected
+
+`migrate_from_json()` imports the legacy JSON files once (it runs automatically the first
+time the database is opened; `python state_store.py --migrate --force` re-runs it).
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+DATA_DIR = "data"
+DB_PATH = os.path.join(DATA_DIR, "state.db")
+# How many games' id -> name tables are kept in memory at once (least recently used dropped).
+DATA_PACKAGE_CACHE_GAMES = int(os.getenv("DATA_PACKAGE_CACHE_GAMES", "32"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS slots (
+    slot_number TEXT PRIMARY KEY,
+    slot_name   TEXT NOT NULL,
+    game        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS slots_by_name ON slots (slot_name);
+CREATE TABLE IF NOT EXISTS assignments (
+    user_id     TEXT NOT NULL,
+    slot_name   TEXT NOT NULL,
+    slot_number TEXT,
+    game        TEXT NOT NULL DEFAULT 'Unknown',
+    PRIMARY KEY (user_id, slot_name)
+);
+CREATE INDEX IF NOT EXISTS assignments_by_slot ON assignments (slot_name);
+CREATE TABLE IF NOT EXISTS seen_items (
+    user_id   TEXT NOT NULL,
+    slot_name TEXT NOT NULL,
+    item_name TEXT NOT NULL,
+    count     INTEGER NOT NULL,
+    PRIMARY KEY (user_id, slot_name, item_name)
+);
+CREATE TABLE IF NOT EXISTS tracked_items (
+    user_id   TEXT NOT NULL,
+    slot_name TEXT NOT NULL,
+    item_name TEXT NOT NULL,
+    target    INTEGER NOT NULL,
+    current   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, slot_name, item_name)
+);
+CREATE INDEX IF NOT EXISTS tracked_by_slot ON tracked_items (slot_name, item_name);
+CREATE TABLE IF NOT EXISTS tracker_slots (
+    slot_number   TEXT PRIMARY KEY,
+    slot_name     TEXT NOT NULL,
+    game_name     TEXT NOT NULL,
+    game_status   TEXT NOT NULL,
+    checks_status TEXT NOT NULL,
+    completed     INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tracker_slots_by_name ON tracker_slots (slot_name);
+CREATE TABLE IF NOT EXISTS received_items (
+    slot_number TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    item_name   TEXT NOT NULL,
+    amount,
+    PRIMARY KEY (slot_number, position)
+);
+CREATE INDEX IF NOT EXISTS received_by_item ON received_items (slot_number, item_name);
+CREATE TABLE IF NOT EXISTS dp_games (
+    game     TEXT PRIMARY KEY,
+    checksum TEXT
+);
+CREATE TABLE IF NOT EXISTS dp_items (
+    game TEXT NOT NULL,
+    name TEXT NOT NULL,
+    id   INTEGER NOT NULL,
+    PRIMARY KEY (game, name)
+);
+CREATE INDEX IF NOT EXISTS dp_items_by_id ON dp_items (game, id);
+CREATE TABLE IF NOT EXISTS dp_locations (
+    game TEXT NOT NULL,
+    name TEXT NOT NULL,
+    id   INTEGER NOT NULL,
+    PRIMARY KEY (game, name)
+);
+CREATE INDEX IF NOT EXISTS dp_locations_by_id ON dp_locations (game, id);
+CREATE TABLE IF NOT EXISTS go_mode_notified (
+    seed  TEXT NOT NULL,
+    token TEXT NOT NULL,
+    PRIMARY KEY (seed, token)
+);
+CREATE TABLE IF NOT EXISTS item_log (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    receiver       TEXT NOT NULL,
+    item           TEXT NOT NULL,
+    flag           TEXT,
+    location       TEXT,
+    sending_player TEXT
+);
+"""
+
+# One connection per process, shared by the event loop and the tracker's worker threads, so
+# every use goes through this lock. Transactions are short (a handful of rows), so the lock
+# is never held for long.
+_conn = None
+_lock = threading.RLock()
+
+
+def connect(path: str | None = None) -> sqlite3.Connection:
+    """Open (once) and return the shared connection, creating the schema and importing any
+    legacy JSON files on first use."""
+    global _conn
+    with _lock:
+        if _conn is not None:
+            return _conn
+        path = path or DB_PATH
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _conn = conn
+        if _get_meta("json_migrated") is None:
+            migrate_from_json(os.path.dirname(path) or ".")
+        return _conn
+
+
+def close() -> None:
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+@contextlib.contextmanager
+def transaction():
+    """Group several writes into one atomic transaction (nested uses join the outer one)."""
+    with _lock:
+        conn = connect()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _query(sql: str, params=()) -> list:
+    with _lock:
+        return connect().execute(sql, params).fetchall()
+
+
+def _get_meta(key: str):
+    rows = _conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchall()
+    return rows[0][0] if rows else None
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+# --- slot info (from the AP server's Connected packet) ----------------------
+
+def replace_slot_info(slot_mapping: dict) -> None:
+    """Store {slot_number: {"slot_name", "game"}} as the room's slot list."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM slots")
+        conn.executemany(
+            "INSERT INTO slots (slot_number, slot_name, game) VALUES (?, ?, ?)",
+            [(str(num), info.get("slot_name", "Unknown"), info.get("game", "Unknown"))
+             for num, info in slot_mapping.items()])
+
+
+def get_slot_info() -> dict:
+    """{slot_number: {"slot_name", "game"}}, the old slot_info.json shape."""
+    return {num: {"slot_name": name, "game": game}
+            for num, name, game in _query("SELECT slot_number, slot_name, game FROM slots")}
+
+
+# --- assignments, seen items and tracked items -------------------------------
+
+def _assignment_rows(where: str, params) -> list:
+    return _query(f"SELECT user_id, slot_number, slot_name, game FROM assignments {where} ORDER BY rowid",
+                  params)
+
+
+def get_assignments(user_id: str) -> list:
+    """The user's assignments as [{"slot_number", "slot_name", "game"}] (assignment order)."""
+    return [{"slot_number": num, "slot_name": name, "game": game}
+            for _, num, name, game in _assignment_rows("WHERE user_id = ?", (str(user_id),))]
+
+
+def all_assignments() -> dict:
+    """{user_id: [assignment, ...]} for every user."""
+    result: dict = {}
+    for user_id, num, name, game in _assignment_rows("", ()):
+        result.setdefault(user_id, []).append({"slot_number": num, "slot_name": name, "game": game})
+    return result
+
+
+def add_assignments(user_id: str, slots) -> None:
+    """Assign [(slot_number, slot_name, game), ...] to the user (existing ones are kept)."""
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO assignments (user_id, slot_number, slot_name, game) VALUES (?, ?, ?, ?)",
+            [(str(user_id), str(num), name, game) for num, name, game in slots])
+
+
+def get_seen_items(user_id: str, slot_name: str) -> dict:
+    return dict(_query("SELECT item_name, count FROM seen_items WHERE user_id = ? AND slot_name = ?",
+                       (str(user_id), slot_name)))
+
+
+def all_seen_items() -> dict:
+    """{(user_id, slot_name): {item_name: count}} for every user and slot."""
+    result: dict = {}
+    for user_id, slot_name, name, count in _query("SELECT user_id, slot_name, item_name, count FROM seen_items"):
+        result.setdefault((user_id, slot_name), {})[name] = count
+    return result
+
+
+def set_seen_items(user_id: str, slot_name: str, counts: dict) -> None:
+    """Record {item_name: count} as what the user has now been shown for the slot."""
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO seen_items (user_id, slot_name, item_name, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (user_id, slot_name, item_name) DO UPDATE SET count = excluded.count",
+            [(str(user_id), slot_name, name, int(count)) for name, count in counts.items()])
+
+
+def get_tracked_items(user_id: str, slot_name: str) -> dict:
+    """{item_name: {"target", "current"}} the user tracks for the slot."""
+    return {name: {"target": target, "current": current}
+            for name, target, current in _query(
+                "SELECT item_name, target, current FROM tracked_items WHERE user_id = ? AND slot_name = ?",
+                (str(user_id), slot_name))}
+
+
+def all_tracked_items() -> list:
+    """Every tracked item as (user_id, slot_name, game, item_name, target, current)."""
+    return _query(
+        "SELECT t.user_id, t.slot_name, COALESCE(a.game, 'Unknown'), t.item_name, t.target, t.current "
+        "FROM tracked_items t LEFT JOIN assignments a "
+        "ON a.user_id = t.user_id AND a.slot_name = t.slot_name ORDER BY t.rowid")
+
+
+def set_tracked_item(user_id: str, slot_name: str, item_name: str, target: int, current: int) -> None:
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO tracked_items (user_id, slot_name, item_name, target, current) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (user_id, slot_name, item_name) "
+            "DO UPDATE SET target = excluded.target, current = excluded.current",
+            (str(user_id), slot_name, item_name, int(target), int(current)))
+
+
+def remove_tracked_item(user_id: str, slot_name: str, item_name: str) -> None:
+    with transaction() as conn:
+        conn.execute("DELETE FROM tracked_items WHERE user_id = ? AND slot_name = ? AND item_name = ?",
+                     (str(user_id), slot_name, item_name))
+
+
+# --- web-tracker state (received items) -------------------------------------
+
+def load_received() -> dict:
+    """Everything the web tracker last reported, in the old items_received.json shape:
+    {slot_num: {slot_name: {"Game Name", "Game Status", "Checks Status", "Items"}}}."""
+    items_by_slot: dict = {}
+    for num, name, amount in _query(
+            "SELECT slot_number, item_name, amount FROM received_items ORDER BY slot_number, position"):
+        bucket = items_by_slot.setdefault(num, {})
+        bucket[str(len(bucket) + 1)] = {"item_name": name, "amount": amount}
+    result = {}
+    for num, name, game, status, checks, completed in _query(
+            "SELECT slot_number, slot_name, game_name, game_status, checks_status, completed FROM tracker_slots"):
+        result[num] = {name: {
+            "Game Name": game,
+            "Game Status": status,
+            "Checks Status": checks,
+            "Items": "Game Completed!" if completed else items_by_slot.get(num, {}),
+        }}
+    return result
+
+
+def save_tracker_slot(slot_number: str, slot_name: str, details: dict, items_changed: bool = True) -> None:
+    """Store one slot's tracker entry. Its received-item rows are rewritten only when
+    `items_changed`; a status/checks-only change touches just the slot's row."""
+    items = details.get("Items")
+    completed = not isinstance(items, dict)
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO tracker_slots (slot_number, slot_name, game_name, game_status, checks_status, completed) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (slot_number) DO UPDATE SET "
+            "slot_name = excluded.slot_name, game_name = excluded.game_name, game_status = excluded.game_status, "
+            "checks_status = excluded.checks_status, completed = excluded.completed",
+            (slot_number, slot_name, details.get("Game Name", ""), details.get("Game Status", ""),
+             details.get("Checks Status", ""), int(completed)))
+        if items_changed:
+            conn.execute("DELETE FROM received_items WHERE slot_number = ?", (slot_number,))
+            if not completed:
+                conn.executemany(
+                    "INSERT INTO received_items (slot_number, position, item_name, amount) VALUES (?, ?, ?, ?)",
+                    [(slot_number, pos, item.get("item_name", "Unknown"), item.get("amount", 0))
+                     for pos, item in enumerate(items.values())])
+
+
+def delete_tracker_slot(slot_number: str) -> None:
+    with transaction() as conn:
+        conn.execute("DELETE FROM tracker_slots WHERE slot_number = ?", (slot_number,))
+        conn.execute("DELETE FROM received_items WHERE slot_number = ?", (slot_number,))
+
+
+def load_tracker_slots(slot_names=None) -> dict:
+    """{slot_name: (slot_number, game, status, checks, completed, {item_name: total_count})} for
+    every slot on the tracker, or just the named ones. Inventories keep the tracker's order."""
+    where, params = "", ()
+    if slot_names is not None:
+        slot_names = list(slot_names)
+        if not slot_names:
+            return {}
+        where, params = f"WHERE t.slot_name IN ({', '.join('?' * len(slot_names))})", tuple(slot_names)
+    result: dict = {}
+    for num, slot_name, game, status, checks, completed, name, amount in _query(
+            "SELECT t.slot_number, t.slot_name, t.game_name, t.game_status, t.checks_status, t.completed, "
+            "r.item_name, r.amount FROM tracker_slots t "
+            f"LEFT JOIN received_items r ON t.slot_number = r.slot_number {where} "
+            "ORDER BY t.slot_number, r.position", params):
+        if slot_name not in result:
+            result[slot_name] = (num, game, status, checks, bool(completed), {})
+        if name is not None:
+            inv = result[slot_name][5]
+            inv[name] = inv.get(name, 0) + _to_int(amount)
+    return result
+
+
+# --- data packages ------------------------------------------------------------
+
+def data_package_games() -> list:
+    """Every game with a stored data package, sorted."""
+    return [game for (game,) in _query("SELECT game FROM dp_games ORDER BY game")]
+
+
+def has_data_package(game: str) -> bool:
+    return bool(_query("SELECT 1 FROM dp_games WHERE game = ?", (game,)))
+
+
+def data_package_checksums() -> dict:
+    """{game: checksum} for every stored data package (None if the server sent no checksum)."""
+    return dict(_query("SELECT game, checksum FROM dp_games"))
+
+
+# Bumped on every data-package write so in-memory indexes built from these tables (the
+# autocomplete search indexes) know to rebuild without re-reading anything to find out.
+_data_package_revision = 0
+
+
+def data_package_revision() -> int:
+    return _data_package_revision
+
+
+def save_data_package_game(game: str, item_name_to_id: dict, location_name_to_id: dict,
+                           checksum: str | None = None) -> None:
+    """Store (or replace) one game's data package."""
+    global _data_package_revision
+    with transaction() as conn:
+        conn.execute("INSERT INTO dp_games (game, checksum) VALUES (?, ?) "
+                     "ON CONFLICT (game) DO UPDATE SET checksum = excluded.checksum", (game, checksum))
+        conn.execute("DELETE FROM dp_items WHERE game = ?", (game,))
+        conn.execute("DELETE FROM dp_locations WHERE game = ?", (game,))
+        conn.executemany("INSERT INTO dp_items (game, name, id) VALUES (?, ?, ?)",
+                         [(game, name, int(i)) for name, i in item_name_to_id.items()])
+        conn.executemany("INSERT INTO dp_locations (game, name, id) VALUES (?, ?, ?)",
+                         [(game, name, int(i)) for name, i in location_name_to_id.items()])
+    _data_package_revision += 1
+    # Refresh the game's cached id -> name tables from what was just written, replacing any
+    # (possibly empty) tables cached before this package arrived.
+    _cache_names(game, ({int(i): name for name, i in item_name_to_id.items()},
+                        {int(i): name for name, i in location_name_to_id.items()}))
+
+
+def get_item_names(game: str) -> list:
+    """One game's item names, sorted."""
+    return [name for (name,) in _query("SELECT name FROM dp_items WHERE game = ? ORDER BY name", (game,))]
+
+
+# {game: ({item_id: name}, {location_id: name})}, in least-recently-used order. A game's
+# tables are read (two indexed queries) the first time one of its ids is looked up, so memory
+# follows the games actually being played rather than every package ever stored.
+_names_cache: OrderedDict = OrderedDict()
+
+
+def _cache_names(game: str, names: tuple) -> None:
+    with _lock:
+        _names_cache[game] = names
+        _names_cache.move_to_end(game)
+        while len(_names_cache) > DATA_PACKAGE_CACHE_GAMES:
+            _names_cache.popitem(last=False)
+
+
+def data_package_names(game: str) -> tuple:
+    """({item_id: name}, {location_id: name}) for one game (empty dicts if it isn't stored)."""
+    with _lock:
+        names = _names_cache.get(game)
+        if names is not None:
+            _names_cache.move_to_end(game)
+            return names
+        names = (
+            {i: name for name, i in _query("SELECT name, id FROM dp_items WHERE game = ?", (game,))},
+            {i: name for name, i in _query("SELECT name, id FROM dp_locations WHERE game = ?", (game,))},
+        )
+        _cache_names(game, names)
+        return names
+
+
+def item_name(game: str, item_id: int):
+    return data_package_names(game)[0].get(item_id)
+
+
+def location_name(game: str, location_id: int):
+    return data_package_names(game)[1].get(location_id)
+
+
+# --- go-mode notifications ----------------------------------------------------
+
+def load_notified(seed: str) -> set:
+    return {token for (token,) in _query("SELECT token FROM go_mode_notified WHERE seed = ?", (seed,))}
+
+
+def add_notified(seed: str, tokens) -> None:
+    """Record delivered tokens for `seed`; rows for any other (older) seed are dropped."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM go_mode_notified WHERE seed != ?", (seed,))
+        conn.executemany("INSERT OR IGNORE INTO go_mode_notified (seed, token) VALUES (?, ?)",
+                         [(seed, token) for token in tokens])
+
+
+# --- ItemSend log (ap_connector) ---------------------------------------------
+
+def append_item_log(receiver: str, item: str, flag: str, location: str, sending_player: str) -> None:
+    append_item_logs([(receiver, item, flag, location, sending_player)])
+
+
+def append_item_logs(rows) -> None:
+    """Append many (receiver, item, flag, location, sending_player) rows in one transaction."""
+    with transaction() as conn:
+        conn.executemany("INSERT INTO item_log (receiver, item, flag, location, sending_player) VALUES (?, ?, ?, ?, ?)",
+                         rows)
+
+
+# --- one-shot import of the legacy JSON files ---------------------------------
+
+def _read_json(path: str):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def migrate_from_json(data_dir: str = DATA_DIR) -> dict:
+    """Import listeners.json, items_received.json, slot_info.json, data_package.json and
+    go_mode_notified.json from `data_dir`. Missing/unreadable files are skipped; the JSON
+    files themselves are left in place. Returns {file: rows imported}."""
+    imported = {}
+    with transaction() as conn:
+        slot_info = _read_json(os.path.join(data_dir, "slot_info.json"))
+        if isinstance(slot_info, dict):
+            replace_slot_info(slot_info)
+            imported["slot_info.json"] = len(slot_info)
+
+        listeners = _read_json(os.path.join(data_dir, "listeners.json"))
+        if isinstance(listeners, dict):
+            count = 0
+            for user_id, assignments in listeners.items():
+                for a in assignments or []:
+                    name = a.get("slot_name")
+                    if not name:
+                        continue
+                    add_assignments(user_id, [(a.get("slot_number", ""), name, a.get("game", "Unknown"))])
+                    seen = a.get("items")
+                    if isinstance(seen, dict):
+                        set_seen_items(user_id, name, {k: _to_int(v) for k, v in seen.items()})
+                    tracked = a.get("tracked_items") or {}
+                    if isinstance(tracked, list):  # oldest format: a bare list of item names
+                        tracked = {item: {"target": 1, "current": 0} for item in tracked}
+                    for item, info in tracked.items():
+                        set_tracked_item(user_id, name, item, _to_int(info.get("target", 1)),
+                                         _to_int(info.get("current", 0)))
+                    count += 1
+            imported["listeners.json"] = count
+
+        received = _read_json(os.path.join(data_dir, "items_received.json"))
+        if isinstance(received, dict):
+            count = 0
+            for slot_number, slot_data in received.items():
+                for key, value in (slot_data or {}).items():
+                    if isinstance(value, dict) and "Game Name" in value:
+                        save_tracker_slot(slot_number, key, value)
+                    elif isinstance(value, dict) and "item" in value:
+                        # ap_connector's ItemSend log shared this file: {receiver: {idx: entry}}.
+                        append_item_log(slot_number, value.get("item", "Unknown"), value.get("flag"),
+                                        value.get("location"), value.get("sending_player"))
+                    count += 1
+            imported["items_received.json"] = count
+
+        data_package = _read_json(os.path.join(data_dir, "data_package.json"))
+        if isinstance(data_package, list):
+            for entry in data_package:
+                if entry.get("game"):
+                    save_data_package_game(entry["game"], entry.get("item_name_to_id", {}),
+                                           entry.get("location_name_to_id", {}))
+            imported["data_package.json"] = len(data_package)
+
+        notified = _read_json(os.path.join(data_dir, "go_mode_notified.json"))
+        if isinstance(notified, dict) and notified.get("seed"):
+            add_notified(notified["seed"], notified.get("notified", []))
+            imported["go_mode_notified.json"] = len(notified.get("notified", []))
+
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?) "
+                     "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (json.dumps(imported),))
+    if imported:
+        print(f"[state] imported legacy JSON state: {imported}")
+    return imported
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Inspect or migrate the bot's SQLite state store")
+    p.add_argument("--db", default=DB_PATH, help="database path (default: data/state.db)")
+    p.add_argument("--migrate", action="store_true", help="import the legacy data/*.json files")
+    p.add_argument("--force", action="store_true", help="with --migrate: import again even if already done")
+    p.add_argument("--data-dir", help="where the JSON files are (default: the database's directory)")
+    args = p.parse_args(argv)
+
+    connect(args.db)  # a first open migrates automatically
+    if args.migrate and args.force:
+        migrate_from_json(args.data_dir or os.path.dirname(args.db) or ".")
+    for table in ("slots", "assignments", "tracked_items", "tracker_slots", "received_items",
+                  "dp_games", "dp_items", "go_mode_notified", "item_log"):
+        print(f"{table:>16}: {_query(f'SELECT COUNT(*) FROM {table}')[0][0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
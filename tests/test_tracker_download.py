@@ -0,0 +1,111 @@
+"""Regression tests for the tracker diff: a bad room page between two good cycles must not
+reset the diff baseline (which re-announced every item ever received).
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import state_store  # noqa: E402
+import tracker_download  # noqa: E402
+
+ROOM_PAGE = ('<table id="checks-table"><tbody>' + "".join(
+    f'<tr><td><a href="/tracker/R/0/{i}">{i}</a></td><td>P{i}</td><td>Game</td>'
+    f'<td>Connected</td><td>1/9</td></tr>' for i in (1, 2)) + "</tbody></table>")
+SLOT_PAGE = '<table id="received-table"><tbody><tr><td>Key</td><td>2</td></tr></tbody></table>'
+
+
+class BadRoomPageTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        state_store.close()
+        state_store.DB_PATH = os.path.join(self.tmp.name, "state.db")
+        tracker_download._result = None
+        for table in (tracker_download._aggs, tracker_download._sources, tracker_download._gone,
+                      tracker_download._page_cache, tracker_download._slot_state):
+            table.clear()
+        tracker_download._last_room = None
+        tracker_download._changed_names.clear()
+
+        self.room_response = lambda: web.Response(text=ROOM_PAGE, content_type="text/html")
+
+        async def room(request):
+            return self.room_response()
+
+        async def slot(request):
+            return web.Response(text=SLOT_PAGE, content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/tracker/R", room)
+        app.router.add_get("/generic_tracker/R/0/{slot}", slot)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/tracker/R"
+
+    async def asyncTearDown(self):
+        await tracker_download.close_async_session()
+        await self.runner.cleanup()
+        state_store.close()
+        self.tmp.cleanup()
+
+    async def cycle(self):
+        tracker_download._last_full_sweep = None  # every cycle is a full sweep
+        return await tracker_download.async_get_all_tracker_received_items(self.url, None)
+
+    async def assert_no_reannouncement_after(self, bad_response):
+        first = await self.cycle()
+        self.assertEqual(first, {"1": {"P1": {"New Items": {"Key": 2}}},
+                                 "2": {"P2": {"New Items": {"Key": 2}}}})
+
+        self.room_response = bad_response
+        with self.assertRaises(Exception):
+            await self.cycle()
+
+        self.room_response = lambda: web.Response(text=ROOM_PAGE, content_type="text/html")
+        self.assertEqual(await self.cycle(), {})
+        self.assertEqual(set(state_store.load_received()), {"1", "2"})
+
+    async def test_error_status_then_good_page(self):
+        await self.assert_no_reannouncement_after(lambda: web.Response(status=502, text="Bad gateway"))
+
+    async def test_page_without_slots_then_good_page(self):
+        await self.assert_no_reannouncement_after(
+            lambda: web.Response(text="<html>down for maintenance</html>", content_type="text/html"))
+
+    async def test_room_table_dropping_every_slot_is_not_applied(self):
+        await self.cycle()
+        with self.assertRaises(ValueError):
+            tracker_download._apply_cycle(([], [], [], [], [], []), [])
+        self.assertEqual(set(state_store.load_received()), {"1", "2"})
+        self.assertEqual(await self.cycle(), {})
+
+    async def test_slot_that_returns_is_not_reannounced(self):
+        await self.cycle()
+        # A table that briefly lost slot 2, then has it again.
+        tracker_download._apply_cycle((["1"], ["/R/0/1"], ["P1"], ["Game"], ["Goal Incomplete"],
+                                       ["1/9"]), [[{"item_name": "Key", "amount": 2}]])
+        self.assertEqual(await self.cycle(), {})
+
+    async def test_changed_slot_names_cover_more_than_the_diff(self):
+        await self.cycle()
+        self.assertEqual(tracker_download.take_changed_slot_names(), {"P1", "P2"})
+        # P1's goal status moves (no new items); P2 leaves the room table.
+        diff = tracker_download._apply_cycle(
+            (["1"], ["/R/0/1"], ["P1"], ["Game"], ["Goal Completed"], ["9/9"]),
+            [[{"item_name": "Key", "amount": 2}]])
+        self.assertEqual(diff, {"1": {"P1": {"Goal Completed": "Goal Completed"}}})
+        self.assertEqual(tracker_download.take_changed_slot_names(), {"P1", "P2"})
+        self.assertEqual(tracker_download.take_changed_slot_names(), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
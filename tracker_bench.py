@@ -0,0 +1,123 @@
+"""Micro-benchmark for the tracker table extractors in tracker_download.
+
+Times every available backend (lxml / stream / bs4) on saved tracker pages and prints the
+mean per-page parse cost and the speed-up over the original BeautifulSoup path. It also
+checks that every backend extracts the same rows, so a faster parser can't silently
+change what the bot reads.
+
+Examples:
+  # save the room page plus every slot page of a live tracker, then benchmark them
+  python tracker_bench.py --fetch https://your-host/tracker/<room-id> --out pages/
+  python tracker_bench.py pages/*.html
+
+  # no pages at hand: benchmark synthetic pages shaped like the real ones
+  python tracker_bench.py --synthetic-slots 200 --synthetic-items 400
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+import tracker_download
+
+TABLE_IDS = ("checks-table", "received-table")
+
+
+def _synthetic_pages(slots: int, items: int) -> dict:
+    padding = "<div class='nav'>" + ("<span>menu</span>" * 200) + "</div>"
+    rows = "".join(
+        f'<tr><td>\n<a href="/tracker/ROOM/0/{i}">{i}</a></td><td>Player{i}</td><td>Game {i % 17}</td>'
+        f"<td>Goal Incomplete</td><td>{i}/250</td><td>12.5</td><td>None</td></tr>"
+        for i in range(1, slots + 1))
+    room = (f"<html><head><title>Room</title></head><body>{padding}"
+            f'<table id="checks-table"><thead><tr><th>#</th></tr></thead><tbody>{rows}</tbody></table>'
+            f"{padding}</body></html>")
+    inventory = "".join(f"<tr><td>Item {i}</td><td>1</td></tr>" for i in range(items))
+    received = "".join(f"<tr><td>Item {i}</td><td>{1 + i % 3}</td><td>{i}</td></tr>" for i in range(items))
+    slot = (f"<html><body>{padding}"
+            f'<table id="inventory-table"><tbody>{inventory}</tbody></table>'
+            f'<table id="received-table"><thead><tr><th>Item</th></tr></thead><tbody>{received}</tbody></table>'
+            f'<table id="locations-table"><tbody>{inventory}</tbody></table>'
+            f"</body></html>")
+    return {"synthetic-room.html": room.encode(), "synthetic-slot.html": slot.encode()}
+
+
+def _fetch_pages(tracker_url: str, out_dir: str, auth) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    room = requests.get(tracker_url, auth=auth, timeout=tracker_download.TRACKER_TIMEOUT)
+    with open(os.path.join(out_dir, "room.html"), "wb") as fh:
+        fh.write(room.content)
+    slot_numbers, urls = tracker_download._parse_tracker_page(room.content)[:2]
+    for slot_number, url in zip(slot_numbers, urls):
+        page = requests.get(tracker_download._slot_page_url(tracker_url, url), auth=auth,
+                            timeout=tracker_download.TRACKER_TIMEOUT)
+        with open(os.path.join(out_dir, f"slot-{int(slot_number):03d}.html"), "wb") as fh:
+            fh.write(page.content)
+    print(f"Saved {len(urls) + 1} pages to {out_dir}")
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark the tracker table extractors")
+    p.add_argument("pages", nargs="*", help="saved tracker pages (.html)")
+    p.add_argument("--repeat", type=int, default=20, help="parses per timing run")
+    p.add_argument("--fetch", metavar="TRACKER_URL", help="download a live room + slot pages first")
+    p.add_argument("--out", default="tracker_pages", help="where --fetch saves pages")
+    p.add_argument("--synthetic-slots", type=int, default=100)
+    p.add_argument("--synthetic-items", type=int, default=300)
+    args = p.parse_args(argv)
+
+    if args.fetch:
+        user, password = os.getenv("URL_AUTH_USERNAME"), os.getenv("URL_AUTH_PASSWORD")
+        _fetch_pages(args.fetch, args.out, (user, password) if user and password else None)
+        return 0
+
+    if args.pages:
+        pages = {}
+        for path in args.pages:
+            with open(path, "rb") as fh:
+                pages[os.path.basename(path)] = fh.read()
+    else:
+        pages = _synthetic_pages(args.synthetic_slots, args.synthetic_items)
+
+    backends = [b for b in ("lxml", "stream", "bs4") if b != "lxml" or tracker_download.lxml is not None]
+    totals = dict.fromkeys(backends, 0.0)
+    print(f"{'page':<28} {'KiB':>7}  " + "  ".join(f"{b + ' ms':>10}" for b in backends))
+    for name, content in pages.items():
+        table_id = next((t for t in TABLE_IDS if t.encode() in content), None)
+        if table_id is None:
+            print(f"{name:<28} (no tracker table, skipped)")
+            continue
+        expected = tracker_download.extract_table(content, table_id, "bs4")
+        timings = []
+        for backend in backends:
+            if tracker_download.extract_table(content, table_id, backend) != expected:
+                print(f"!! {backend} rows differ from bs4 on {name}", file=sys.stderr)
+            cost = _time(lambda: tracker_download.extract_table(content, table_id, backend), args.repeat)
+            totals[backend] += cost
+            timings.append(cost)
+        print(f"{name:<28} {len(content) / 1024:>7.1f}  " + "  ".join(f"{t * 1000:>10.2f}" for t in timings))
+
+    if totals.get("bs4"):
+        print()
+        for backend in backends:
+            print(f"{backend:>6}: {totals[backend] * 1000:8.2f} ms total, "
+                  f"{totals['bs4'] / totals[backend]:5.1f}x vs bs4")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,281 @@
-import json
+import asyncio
+import hashlib
 import os
+import time
+from html.parser import HTMLParser
 
+import aiohttp
 from bs4 import BeautifulSoup
-import requests
-
-
-def get_tracker_urls(tracker_url, auth):
-    # Always pass a timeout: without one a stalled connection hangs indefinitely (the default
-    # connect timeout is None), tying up the worker thread. On failure this raises, which the
-    # caller's loop catches, logs, and retries next cycle (last-good data is preserved).
-    page = requests.get(url=tracker_url, auth=auth, timeout=15)
-    soup = BeautifulSoup(page.content, "html.parser")
 
+import state_store
+
+# How many slot pages are fetched at once. Each slot's /generic_tracker page is an
+# independent request, so a full scrape takes roughly the time of the slowest few pages
+# instead of the sum of all of them. Kept modest so a large room can't hammer the host.
+TRACKER_CONCURRENCY = max(1, int(os.getenv("TRACKER_CONCURRENCY", "8")))
+# Per-request timeout (seconds) for every tracker page.
+TRACKER_TIMEOUT = 15
+# Incremental refresh: only refetch the slot pages whose "Checks Status" or game status moved
+# in the room table since that slot was last fetched. Opt-in, because a slot's own counters
+# don't move when ANOTHER player sends it an item; those receipts are picked up by the next
+# full sweep instead, so TRACKER_FULL_SWEEP bounds their announcement delay.
+TRACKER_INCREMENTAL = os.getenv("TRACKER_INCREMENTAL", "").strip().lower() in ("1", "true", "yes", "on")
+# Seconds between full sweeps that refetch every slot page regardless of the room table.
+# Also the safety net for the unchanged-room short-circuit (e.g. an admin /send).
+TRACKER_FULL_SWEEP = int(os.getenv("TRACKER_FULL_SWEEP", "600"))
+
+# Change detection. Most slot pages are unchanged from one cycle to the next, so each page's
+# validators are remembered by URL: ETag / Last-Modified when the host sends them (so the
+# next fetch is a conditional GET that can come back as an empty 304), and always a digest of
+# the body, so a host without validators still lets us skip the BeautifulSoup parse when the
+# bytes are identical. {url: {"etag", "last_modified", "digest", "parsed"}}
+_page_cache = {}
+
+# The room table (slot, name, game, status, checks) as of the last completed cycle. A slot
+# only receives items when some slot checks a location, which moves the checks column, so an
+# unchanged room table means no slot page can have changed and the cycle can stop after the
+# single room request.
+_last_room = None
+# Per slot URL, the (checks status, game status) the slot had when its page was last fetched,
+# and when the last full sweep completed.
+_slot_state = {}
+_last_full_sweep = None
+
+
+def _conditional_headers(url):
+    entry = _page_cache.get(url)
+    headers = {}
+    if entry:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _parse_cached(url, status, content, headers, parse):
+    """Parse a fetched page, reusing the previous parse when the host answered 304 or the body
+    is byte-for-byte unchanged."""
+    entry = _page_cache.get(url)
+    if status == 304 and entry is not None:
+        return entry["parsed"]
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    if entry is not None and entry["digest"] == digest:
+        parsed = entry["parsed"]
+    else:
+        parsed = parse(content)
+    _page_cache[url] = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "digest": digest,
+        "parsed": parsed,
+    }
+    return parsed
+
+
+# --- table extraction ----------------------------------------------------------
+# Both pages we scrape only need ONE table (checks-table on the room page, received-table on
+# a slot page), so building a full BeautifulSoup tree for every page is wasted work. The
+# extractor returns that table's body rows as [[(cell_text, first_href), ...], ...] using one
+# of three backends, chosen with TRACKER_PARSER (or set_parser() at runtime):
+#   "lxml"   -- libxml2's C parser (when lxml is installed); fastest.
+#   "stream" -- the stdlib tokenizer, started at the target table and stopped right after it.
+#   "bs4"    -- the original BeautifulSoup(..., "html.parser") walk.
+#   "auto"   -- lxml if installed, else stream (the default).
+# Any backend error falls back to bs4, so a page the fast paths choke on still parses.
+
+try:
+    import lxml.html
+except ImportError:  # optional: the stream/bs4 backends need nothing beyond the stdlib + bs4
+    lxml = None
+
+PARSERS = ("auto", "lxml", "stream", "bs4")
+_parser = os.getenv("TRACKER_PARSER", "auto").strip().lower()
+
+
+def set_parser(name):
+    """Select the table-extraction backend (one of PARSERS)."""
+    global _parser
+    name = name.strip().lower()
+    if name not in PARSERS:
+        raise ValueError(f"Unknown tracker parser {name!r}; expected one of {', '.join(PARSERS)}")
+    if name == "lxml" and lxml is None:
+        raise ValueError("The lxml tracker parser was requested but lxml is not installed")
+    _parser = name
+
+
+def get_parser():
+    """The backend actually in use ("auto" resolved)."""
+    if _parser == "auto" or (_parser == "lxml" and lxml is None):
+        return "lxml" if lxml is not None else "stream"
+    return _parser if _parser in PARSERS else "bs4"
+
+
+def _cell_text(strings):
+    # Same as BeautifulSoup's get_text(strip=True): strip every text node, join with "".
+    return "".join(t.strip() for t in strings)
+
+
+def _extract_table_bs4(content, table_id):
+    soup = BeautifulSoup(content, "html.parser")
+    table = soup.find("table", id=table_id)
+    if not table:
+        return None
+    tbody = table.find("tbody")
+    if not tbody:
+        return None
+    rows = []
+    for row in tbody.find_all("tr"):
+        cells = []
+        for td in row.find_all("td"):
+            link = td.find("a", href=True)
+            cells.append((td.get_text(strip=True), link["href"] if link else None))
+        rows.append(cells)
+    return rows
+
+
+def _extract_table_lxml(content, table_id):
+    doc = lxml.html.fromstring(content)
+    tables = doc.xpath("//table[@id=$id]", id=table_id)
+    if not tables:
+        return None
+    tbody = tables[0].find("tbody")
+    if tbody is None:
+        return None
+    rows = []
+    for row in tbody.iter("tr"):
+        cells = []
+        for td in row.iter("td"):
+            links = td.xpath(".//a[@href]")
+            cells.append((_cell_text(td.itertext()), links[0].get("href") if links else None))
+        rows.append(cells)
+    return rows
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _TableExtractor(HTMLParser):
+    """Collects the body rows of one table and stops the parse as soon as that table ends."""
+
+    def __init__(self, table_id):
+        super().__init__(convert_charrefs=True)
+        self.table_id = table_id
+        self.depth = 0        # <table> nesting depth, counted from the target table
+        self.in_tbody = False
+        self.found = False
+        self.rows = None      # stays None unless the target table has a <tbody>
+        self.row = None
+        self.cell = None
+        self.href = None
+
+    def _close_cell(self):
+        if self.cell is not None and self.row is not None:
+            self.row.append((_cell_text(self.cell), self.href))
+        self.cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self.row is not None:
+            self.rows.append(self.row)
+        self.row = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.depth == 0:
+            if tag == "table" and dict(attrs).get("id") == self.table_id:
+                self.depth = 1
+                self.found = True
+            return
+        if tag == "table":
+            self.depth += 1
+        elif self.depth != 1:
+            return  # inside a nested table: only its text counts (toward the enclosing cell)
+        elif tag == "tbody":
+            self.in_tbody = True
+            if self.rows is None:
+                self.rows = []
+        elif not self.in_tbody:
+            return
+        elif tag == "tr":
+            self._close_row()
+            self.row = []
+        elif tag == "td" and self.row is not None:
+            self._close_cell()
+            self.cell = []
+            self.href = None
+        elif tag == "a" and self.cell is not None and self.href is None:
+            self.href = dict(attrs).get("href")
+
+    def handle_endtag(self, tag):
+        if self.depth == 0:
+            return
+        if tag == "table":
+            self.depth -= 1
+            if self.depth == 0:
+                if self.in_tbody:
+                    self._close_row()
+                raise _StopParsing
+        elif self.in_tbody and self.depth == 1:
+            if tag == "td":
+                self._close_cell()
+            elif tag == "tr":
+                self._close_row()
+            elif tag == "tbody":
+                self._close_row()
+                self.in_tbody = False
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def _extract_table_stream(content, table_id):
+    text = content.decode("utf-8", "replace") if isinstance(content, bytes) else content
+    # Skip straight to the target table when its id attribute is easy to find; otherwise
+    # tokenize from the top. Either way the parse stops at the table's closing tag.
+    marker = text.find(f'id="{table_id}"')
+    if marker != -1:
+        start = text.rfind("<table", 0, marker)
+        if start != -1:
+            text = text[start:]
+    parser = _TableExtractor(table_id)
+    try:
+        parser.feed(text)
+        parser.close()
+    except _StopParsing:
+        pass
+    if not parser.found:
+        return None
+    if parser.in_tbody:  # unterminated document: keep what was read
+        parser._close_row()
+    return parser.rows
+
+
+_EXTRACTORS = {
+    "lxml": _extract_table_lxml,
+    "stream": _extract_table_stream,
+    "bs4": _extract_table_bs4,
+}
+
+
+def extract_table(content, table_id, parser=None):
+    """Body rows of the table with `table_id` as [[(text, href), ...], ...], or None when the
+    page has no such table (or it has no <tbody>)."""
+    name = parser or get_parser()
+    if name == "bs4":
+        return _extract_table_bs4(content, table_id)
+    try:
+        return _EXTRACTORS[name](content, table_id)
+    except Exception as e:
+        print(f"[tracker] {name} parser failed ({e}); falling back to html.parser")
+        return _extract_table_bs4(content, table_id)
+
+
+def _parse_tracker_page(content):
+    """Parse the room tracker page into parallel lists, one entry per slot row. Raises
+    ValueError for a page without slot rows (an error or maintenance page served with a 200):
+    a room always has slots, so that is never a room that emptied out."""
     urls = []
     slot_names = []
     slot_numbers = []
@@ -19,71 +283,58 @@ def get_tracker_urls(tracker_url, auth):
     games_statuses = []
     checks_statuses = []
 
-    table = soup.find("table", id="checks-table")
-    if not table:
-        return slot_numbers, urls, slot_names, game_names
-    tbody = table.find("tbody")
-    if not tbody:
-        return slot_numbers, urls, slot_names, game_names
-    rows = tbody.find_all("tr")
+    rows = extract_table(content, "checks-table")
+    if not rows:
+        raise ValueError("the room tracker page has no checks table")
 
-    for idx, row in enumerate(rows):
-        tds = row.find_all("td")
-        # Ensure there are at least three cells: link, slot name, and game name.
-        if len(tds) < 3:
+    for idx, tds in enumerate(rows):
+        # Ensure there are at least five cells: link, slot name, game name, status and checks.
+        if len(tds) < 5:
+            continue
+        # The first cell links to the slot's tracker page.
+        link = tds[0][1]
+        if not link or "/tracker" not in link:
             continue
 
         # Use the row order (starting at 1) as the slot number.
         slot_number = str(idx + 1)
         slot_numbers.append(slot_number)
 
-        # Extract URL from the first cell (assumes the link is the second element in the cell's contents)
-        slot_link = tds[0].contents[1]
-        link = slot_link['href']
-        link = link.split("/tracker")[1]
-        urls.append(link)
+        urls.append(link.split("/tracker")[1])
 
         # Get slot name from the second cell.
-        slot_name = tds[1].get_text(strip=True)
-        slot_names.append(slot_name)
+        slot_names.append(tds[1][0])
 
         # Get game name from the third cell.
-        game_name = tds[2].get_text(strip=True)
-        game_names.append(game_name)
+        game_names.append(tds[2][0])
 
         # Get game status from the fourth cell.
-        game_status = tds[3].get_text(strip=True)
+        game_status = tds[3][0]
         if game_status != "Goal Completed":
             game_status = "Goal Incomplete"
         games_statuses.append(game_status)
 
         # Get checks status from the fifth cell.
-        checks_status = tds[4].get_text(strip=True)
-        checks_statuses.append(checks_status)
+        checks_statuses.append(tds[4][0])
 
+    if not slot_numbers:
+        raise ValueError("the room tracker page's checks table has no slot rows")
     return slot_numbers, urls, slot_names, game_names, games_statuses, checks_statuses
 
 
-def track_items_from_slot(tracker_url, url, auth):
-    tracker_slot_url = tracker_url.split("/tracker")[0] + "/generic_tracker" + url
-    page = requests.get(tracker_slot_url, auth=auth, timeout=15)
-    soup = BeautifulSoup(page.content, "html.parser")
-
-    items = []
-    table = soup.find("table", id="received-table")
-    if table is None:
+def _parse_slot_page(content):
+    """Parse a slot's /generic_tracker page into its received items, or None if the page has
+    no received table (the tracker drops it once the slot's goal is completed)."""
+    rows = extract_table(content, "received-table")
+    if rows is None:
         return None
-    tbody = table.find("tbody")
-    if not tbody:
-        return None
-    rows = tbody.find_all("tr")
 
-    for row in rows:
-        tds = row.find_all("td")
+    items = []
+    for tds in rows:
         if len(tds) < 2:
             continue
-        item_name = tds[0].get_text(strip=True)
-        item_amount_text = tds[1].get_text(strip=True)
+        item_name = tds[0][0]
+        item_amount_text = tds[1][0]
         try:
             amount = int(item_amount_text)
         except ValueError:
@@ -99,111 +350,266 @@ def track_items_from_slot(tracker_url, url, auth):
     return items
 
 
-def get_all_tracker_received_items(tracker_url, auth):
-    # Build the new result from tracker data
-    result = {}
-    slot_numbers, urls, slot_names, game_names, games_statuses, checks_statuses = get_tracker_urls(tracker_url, auth)
-    for idx, url in enumerate(urls):
-        slot_number = slot_numbers[idx]
-        slot_name = slot_names[idx]
-        game_name = game_names[idx]
-        game_status = games_statuses[idx]
-        checks_status = checks_statuses[idx]
-        items = track_items_from_slot(tracker_url, url, auth)
-        if items is not None:
-            # Create a dictionary with numbered items (starting at 1)
-            item_dict = {str(i + 1): item for i, item in enumerate(items)}
-        else:
-            item_dict = "Game Completed!"
-
-        result[slot_number] = {
-            slot_name: {
-                "Game Name": game_name,
-                "Game Status": game_status,
-                "Checks Status": checks_status,
-                "Items": item_dict
-            }
-        }
+def _slot_page_url(tracker_url, url):
+    return tracker_url.split("/tracker")[0] + "/generic_tracker" + url
 
-    # Ensure the data subdirectory exists.
-    os.makedirs("data", exist_ok=True)
-    items_received_json = os.path.join("data", "items_received.json")
 
-    # Load previous results, if they exist.
-    old_result = {}
-    if os.path.exists(items_received_json):
-        try:
-            with open(items_received_json, "r") as infile:
-                old_result = json.load(infile)
-        except Exception as e:
-            print(f"Error loading old items_received file: {e}")
-            old_result = {}
-
-    # Compute diff: aggregate amounts by item name for new and old results,
-    # then record the positive differences. Also, check for changes in game status (completed).
+def _plan_cycle(tracker_url, room):
+    """Which slot pages this cycle must fetch, given the freshly parsed room table. Returns
+    (indices, full_sweep), or (None, False) when nothing can have changed."""
+    full_sweep = _last_full_sweep is None or time.monotonic() - _last_full_sweep >= TRACKER_FULL_SWEEP
+    if room == _last_room and not full_sweep:
+        return None, False  # nobody checked anything since the last cycle
+    urls, games_statuses, checks_statuses = room[1], room[4], room[5]
+    if full_sweep or not TRACKER_INCREMENTAL:
+        return list(range(len(urls))), full_sweep
+    return [idx for idx, url in enumerate(urls)
+            if _slot_state.get(url) != (checks_statuses[idx], games_statuses[idx])
+            or _slot_page_url(tracker_url, url) not in _page_cache], False
+
+
+def _cached_slot_items(tracker_url, url):
+    return _page_cache[_slot_page_url(tracker_url, url)]["parsed"]
+
+
+def _finish_cycle(room, fetched, full_sweep):
+    """Record what this (completed) cycle saw. Only called once the diff is saved, so a
+    failed cycle is retried in full."""
+    global _last_room, _last_full_sweep
+    urls, games_statuses, checks_statuses = room[1], room[4], room[5]
+    for idx in fetched:
+        _slot_state[urls[idx]] = (checks_statuses[idx], games_statuses[idx])
+    _last_room = room
+    if full_sweep:
+        _last_full_sweep = time.monotonic()
+
+
+# --- asyncio client ----------------------------------------------------------
+# The bot's loops await this directly instead of pushing the blocking scrape onto the default
+# executor, where each cycle held a thread for many seconds. One pooled aiohttp session per
+# event loop; its connector caps the number of in-flight requests at the concurrency limit,
+# and every request carries its own timeout so a slow tracker host can't stall a cycle
+# forever. Cancelling the awaiting task cancels every in-flight page fetch with it.
+
+_async_session = None
+_async_session_size = 0
+
+
+def _get_async_session(concurrency):
+    global _async_session, _async_session_size
+    if _async_session is None or _async_session.closed or _async_session_size != concurrency:
+        if _async_session is not None and not _async_session.closed:
+            # Rebuilt for a new concurrency limit; let the old one close in the background.
+            asyncio.get_running_loop().create_task(_async_session.close())
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+        _async_session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=TRACKER_TIMEOUT))
+        _async_session_size = concurrency
+    return _async_session
+
+
+async def close_async_session():
+    global _async_session
+    if _async_session is not None and not _async_session.closed:
+        await _async_session.close()
+    _async_session = None
+
+
+def _basic_auth(auth):
+    return aiohttp.BasicAuth(*auth) if auth else None
+
+
+async def _async_fetch_parsed(session, url, auth, parse):
+    """Fetch and parse one page. Anything but a 200 (or a 304 for a page we have) raises, so
+    an error page is never parsed as tracker data and the cycle is retried."""
+    headers = _conditional_headers(url)
+    while True:
+        async with session.get(url, auth=_basic_auth(auth), headers=headers) as response:
+            if response.status == 304 and url not in _page_cache and headers:
+                headers = {}  # nothing cached to reuse: ask again for the full page
+                continue
+            if response.status not in (200, 304) or (response.status == 304 and url not in _page_cache):
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status,
+                    message=f"unexpected tracker response {response.status} {response.reason}")
+            content = await response.read()
+            return _parse_cached(url, response.status, content, response.headers, parse)
+
+
+async def async_get_tracker_urls(tracker_url, auth, session=None):
+    session = session or _get_async_session(TRACKER_CONCURRENCY)
+    return await _async_fetch_parsed(session, tracker_url, auth, _parse_tracker_page)
+
+
+async def async_track_items_from_slot(tracker_url, url, auth, session=None):
+    session = session or _get_async_session(TRACKER_CONCURRENCY)
+    return await _async_fetch_parsed(session, _slot_page_url(tracker_url, url), auth, _parse_slot_page)
+
+
+async def async_get_all_tracker_received_items(tracker_url, auth, concurrency=None):
+    """One tracker cycle: fetch the room table and the slot pages that may have changed, fold
+    them into the stored result and return the diff (see _apply_cycle)."""
+    session = _get_async_session(concurrency or TRACKER_CONCURRENCY)
+
+    room = await async_get_tracker_urls(tracker_url, auth, session)
+    fetch, full_sweep = _plan_cycle(tracker_url, room)
+    if fetch is None:
+        return {}
+    slot_numbers, urls, slot_names, game_names, games_statuses, checks_statuses = room
+    # gather() keeps order; the first failure cancels the rest and raises to the caller.
+    fetched = await asyncio.gather(
+        *(async_track_items_from_slot(tracker_url, urls[idx], auth, session) for idx in fetch))
+    slot_items = [_cached_slot_items(tracker_url, url) for url in urls]
+    for idx, items in zip(fetch, fetched):
+        slot_items[idx] = items
+
+    diff = _apply_cycle(room, slot_items)
+    _finish_cycle(room, fetch, full_sweep)
+    return diff
+
+
+# --- diff state ----------------------------------------------------------------
+# The last stored result ({slot_num: {slot_name: {...}}}) is kept in memory between cycles
+# together with each slot's aggregated {item: count}, so a cycle never re-reads the store or
+# re-aggregates slots that didn't change. A slot whose page was unchanged hands back the very
+# same parsed list (see _parse_cached), which is how an unchanged slot is recognised without
+# looking at its items. Only the slots whose entry actually changed are written back.
+_result = None
+_aggs = {}      # {slot_num: (slot_name, {item_name: total})}
+_sources = {}   # {slot_num: the parsed item list the slot's entry was built from}
+# {slot_num: {slot_name: details}} of slots that dropped out of the room table. A slot that comes
+# back is diffed against what it had (with _aggs, which keeps its totals), not against nothing,
+# so a table that briefly lost rows can't re-announce every item those slots ever received.
+_gone = {}
+# Names of the slots whose stored entry the cycles since the last take_changed_slot_names() call
+# added, changed (items, status or checks) or removed -- what an index built on the store must
+# re-read. Wider than the diff, which only holds new items and goals.
+_changed_names = set()
+# _sources' default for a slot not seen since start-up. A completed slot's page parses to None,
+# so a plain .get() would make a slot that finished while the bot was down look unchanged.
+_MISSING = object()
+
+
+def _aggregate(item_dict):
+    agg = {}
+    if isinstance(item_dict, dict):
+        for item in item_dict.values():
+            name = item.get("item_name", "Unknown")
+            try:
+                amount = int(item.get("amount", 0))
+            except (TypeError, ValueError):
+                amount = 0
+            agg[name] = agg.get(name, 0) + amount
+    return agg
+
+
+def _load_result():
+    """Load the previous result from the store once per process (so the first cycle after a
+    restart still diffs against what was last announced)."""
+    global _result
+    if _result is not None:
+        return _result
+    try:
+        _result = state_store.load_received()
+    except Exception as e:
+        print(f"Error loading previously received items: {e}")
+        _result = {}
+    for slot, slot_data in _result.items():
+        for slot_name, details in slot_data.items():
+            _aggs[slot] = (slot_name, _aggregate(details.get("Items", {})))
+    return _result
+
+
+def take_changed_slot_names():
+    """The slot names stored or dropped since the last call (see _changed_names)."""
+    names = set(_changed_names)
+    _changed_names.clear()
+    return names
+
+
+def tracked_slots():
+    """{slot_number: slot_name} of the tracked room, as of the last stored scrape."""
+    return {slot: next(iter(slot_data)) for slot, slot_data in _load_result().items() if slot_data}
+
+
+def _apply_cycle(room, slot_items):
+    """Fold one cycle's scrape into the in-memory state and return the diff: for each slot, the
+    positive per-item changes ("New Items") and a newly completed goal ("Goal Completed")."""
+    result = _load_result()
+    slot_numbers, _, slot_names, game_names, games_statuses, checks_statuses = room
+    # A room never loses every slot at once; a table that says so is a bad page, not news.
+    if not slot_numbers or (result and not set(result) & set(slot_numbers)):
+        raise ValueError(f"room table with {len(slot_numbers)} slot(s) would drop every stored "
+                         f"slot; not applied")
+
     diff = {}
-    for slot, new_slot_data in result.items():
-        # new_slot_data is a dict with a single key: the slot name.
-        for slot_name_key, new_details in new_slot_data.items():
-            new_items = new_details.get("Items", {})
-            # Aggregate new items by item name.
-            new_agg = {}
-            if isinstance(new_items, dict):
-                for key, item in new_items.items():
-                    name = item.get("item_name", "Unknown")
-                    try:
-                        amount = int(item.get("amount", 0))
-                    except:
-                        amount = 0
-                    new_agg[name] = new_agg.get(name, 0) + amount
-
-            # Aggregate old items for the same slot.
-            old_agg = {}
-            if slot in old_result:
-                old_slot_data = old_result[slot]
-                if slot_name_key in old_slot_data:
-                    old_details = old_slot_data[slot_name_key]
-                    old_items = old_details.get("Items", {})
-                    if isinstance(old_items, dict):
-                        for key, item in old_items.items():
-                            name = item.get("item_name", "Unknown")
-                            try:
-                                amount = int(item.get("amount", 0))
-                            except:
-                                amount = 0
-                            old_agg[name] = old_agg.get(name, 0) + amount
-
-            # Compare aggregated values.
+    dirty = {}      # {slot_num: whether its items changed (vs. only its status/checks)}
+    for idx, slot in enumerate(slot_numbers):
+        slot_name = slot_names[idx]
+        items = slot_items[idx]
+        old_details = result.get(slot, {}).get(slot_name) or _gone.get(slot, {}).get(slot_name)
+        _gone.pop(slot, None)
+
+        diff_entry = {}
+        items_changed = False
+        if old_details is not None and items is _sources.get(slot, _MISSING):
+            # Same page as last cycle: the items (and their totals) can't have moved.
+            item_dict = old_details["Items"]
+        else:
+            if items is not None:
+                # Create a dictionary with numbered items (starting at 1)
+                item_dict = {str(i + 1): item for i, item in enumerate(items)}
+            else:
+                item_dict = "Game Completed!"
+            new_agg = _aggregate(item_dict)
+            old_name, old_agg = _aggs.get(slot, (None, {}))
+            if old_name != slot_name:
+                old_agg = {}
+            # Compare aggregated values; only increases are announced.
             diff_items = {}
             for name, new_total in new_agg.items():
                 old_total = old_agg.get(name, 0)
                 if new_total > old_total:
                     diff_items[name] = new_total - old_total
-
-            # Check game status for completion.
-            new_game_status = new_details.get("Game Status", "").strip()
-            old_game_status = ""
-            if slot in old_result:
-                old_slot_data = old_result[slot]
-                if slot_name_key in old_slot_data:
-                    old_game_status = old_slot_data[slot_name_key].get("Game Status", "").strip()
-
-            # We consider the game completed if the new status equals "Game Completed!" or "Completed" (case-insensitive).
-            is_completed = new_game_status.lower() in ["goal completed", "completed"]
-
-            diff_entry = {}
             if diff_items:
                 diff_entry["New Items"] = diff_items
-            if is_completed and (new_game_status != old_game_status):
-                diff_entry["Goal Completed"] = new_game_status
-
-            if diff_entry:
-                diff.setdefault(slot, {})[slot_name_key] = diff_entry
-
-    # Write the new results to the JSON file.
-    with open(items_received_json, "w") as outfile:
-        json.dump(result, outfile, indent=4)
-
+            items_changed = old_details is None or item_dict != old_details.get("Items")
+            _aggs[slot] = (slot_name, new_agg)
+            _sources[slot] = items
+
+        # We consider the game completed if the new status equals "Goal Completed" or "Completed" (case-insensitive).
+        new_game_status = games_statuses[idx].strip()
+        old_game_status = old_details.get("Game Status", "").strip() if old_details else ""
+        if new_game_status.lower() in ["goal completed", "completed"] and new_game_status != old_game_status:
+            diff_entry["Goal Completed"] = new_game_status
+        if diff_entry:
+            diff.setdefault(slot, {})[slot_name] = diff_entry
+
+        details = {
+            "Game Name": game_names[idx],
+            "Game Status": games_statuses[idx],
+            "Checks Status": checks_statuses[idx],
+            "Items": item_dict
+        }
+        if details != old_details or len(result.get(slot, {})) != 1:
+            _changed_names.update(result.get(slot, {}))  # a renamed slot drops its old name
+            _changed_names.add(slot_name)
+            result[slot] = {slot_name: details}
+            dirty[slot] = items_changed
+
+    # Slots that are no longer in the room table drop out, as they did when the result was
+    # rebuilt from scratch every cycle.
+    removed = set(result) - set(slot_numbers)
+    for slot in removed:
+        _gone[slot] = result.pop(slot)
+        _changed_names.update(_gone[slot])
+        _sources.pop(slot, None)
+
+    if dirty or removed:
+        with state_store.transaction():
+            for slot, items_changed in dirty.items():
+                slot_name, details = next(iter(result[slot].items()))
+                state_store.save_tracker_slot(slot, slot_name, details, items_changed)
+            for slot in removed:
+                state_store.delete_tracker_slot(slot)
     return diff
-
-